@@ -1,8 +1,42 @@
 from tracker_models import JobApplication
+from tracker_store import ApplicationStore
+from tracker_events import EventLog
+from search_index import SearchIndex
+import tracker_import
 import datetime
+import os
 
-# In-memory storage for job applications
-job_applications = []
+# Persistent storage for job applications (shared with the Astro frontend's database)
+store = None
+# Status-change/note history for the applications in `store`
+events = None
+# Full-text index over applications, companies and scraped postings
+search_index = None
+COMPANIES_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'HiringTechCompanies - TheList.csv')
+
+def get_store():
+    """Opens the application store on first use."""
+    global store
+    if store is None:
+        store = ApplicationStore()
+    return store
+
+def get_search_index():
+    """Opens the full-text index on first use (companies are only re-indexed when the CSV changes)."""
+    global search_index
+    if search_index is None:
+        search_index = SearchIndex(get_store())
+        if os.path.exists(COMPANIES_CSV):
+            search_index.index_companies(COMPANIES_CSV)
+    return search_index
+
+def get_events():
+    """Opens the event log on first use, logging any changes to the applications it hasn't seen yet."""
+    global events
+    if events is None:
+        events = EventLog(get_store())
+        events.sync_with_store()
+    return events
 
 def add_new_application():
     """Prompts the user for job application details and adds it to the list."""
@@ -59,42 +93,56 @@ def add_new_application():
         status=status,
         notes=notes
     )
-    job_applications.append(new_app)
-    print(f"\nApplication for '{job_title}' at '{company_name}' added successfully!")
+    event_log = get_events() # Opened (and synced) before the write, or the sync would log the new row too
+    with get_store().batch():
+        get_store().add(new_app)
+        event_log.record_created(new_app)
+    print(f"\nApplication #{new_app.app_id} for '{job_title}' at '{company_name}' added successfully!")
 
 def list_all_applications():
     """Displays all tracked job applications."""
     print("\n--- All Tracked Job Applications ---")
-    if not job_applications:
+    found_any = False
+    for app in get_store().iter_all():
+        found_any = True
+        print(f"\n--- Application #{app.app_id} ---")
+        print(app)
+    if not found_any:
         print("No job applications tracked yet.")
-        return
 
-    for i, app in enumerate(job_applications):
-        print(f"\n--- Application #{i+1} ---")
-        print(app)
+def select_application(action):
+    """
+    Asks for an application id, or a company/title search, and returns the chosen application.
+    Returns None if the user cancels.
+    """
+    while True:
+        query = input(f"Enter the id of the application to {action}, or text to search for (or 0 to cancel): ").strip()
+        if query == '0' or not query:
+            return None
+        if query.isdigit():
+            selected_app = get_store().get(int(query))
+            if selected_app:
+                return selected_app
+            print("No application with that id.")
+            continue
+        matches = get_store().search(query)
+        if not matches:
+            print(f"No applications match '{query}'.")
+        elif len(matches) == 1:
+            return matches[0]
+        else:
+            list_applications_summary(matches)
 
 def update_application_status():
     """Allows updating the status of an existing application."""
-    if not job_applications:
+    if not get_store().count():
         print("No applications to update.")
         return
 
     print("\n--- Update Application Status ---")
-    list_all_applications_summary() # Show a summary to pick from
-
-    while True:
-        try:
-            app_index_str = input("Enter the number of the application to update (or 0 to cancel): ")
-            app_index = int(app_index_str) -1
-            if app_index == -1: # User entered 0 to cancel
-                return
-            if 0 <= app_index < len(job_applications):
-                selected_app = job_applications[app_index]
-                break
-            else:
-                print("Invalid application number.")
-        except ValueError:
-            print("Please enter a valid number.")
+    selected_app = select_application("update")
+    if selected_app is None:
+        return
     
     print("\nAvailable Statuses:")
     for i, status_option in enumerate(JobApplication.PREDEFINED_STATUSES):
@@ -105,7 +153,12 @@ def update_application_status():
             status_choice_idx = int(input(f"New Status for '{selected_app.job_title}' (select 1-{len(JobApplication.PREDEFINED_STATUSES)}): ")) - 1
             if 0 <= status_choice_idx < len(JobApplication.PREDEFINED_STATUSES):
                 new_status = JobApplication.PREDEFINED_STATUSES[status_choice_idx]
+                old_status = selected_app.status
                 selected_app.update_status(new_status)
+                event_log = get_events() # Before the write, see add_new_application()
+                with get_store().batch():
+                    get_store().update(selected_app)
+                    event_log.record_status_change(selected_app, old_status)
                 break
             else:
                 print("Invalid choice. Please select a number from the list.")
@@ -114,40 +167,76 @@ def update_application_status():
 
 def add_note_to_application():
     """Adds a note to an existing application."""
-    if not job_applications:
+    if not get_store().count():
         print("No applications to add notes to.")
         return
 
     print("\n--- Add Note to Application ---")
-    list_all_applications_summary()
-
-    while True:
-        try:
-            app_index_str = input("Enter the number of the application to add a note to (or 0 to cancel): ")
-            app_index = int(app_index_str) -1
-            if app_index == -1: # User entered 0 to cancel
-                return
-            if 0 <= app_index < len(job_applications):
-                selected_app = job_applications[app_index]
-                break
-            else:
-                print("Invalid application number.")
-        except ValueError:
-            print("Please enter a valid number.")
+    selected_app = select_application("add a note to")
+    if selected_app is None:
+        return
     
     note_text = input(f"Enter note for '{selected_app.job_title}': ")
     selected_app.add_note(note_text)
+    event_log = get_events() # Before the write, see add_new_application()
+    with get_store().batch():
+        get_store().update(selected_app)
+        event_log.record_note(selected_app, note_text)
     print("Note added successfully.")
 
 
-def list_all_applications_summary():
+def list_applications_summary(applications):
     """Displays a summarized list of applications for selection."""
-    if not job_applications:
-        # This case should be handled by the calling function
+    print("\n--- Matching Applications ---")
+    for app in applications:
+        print(f"{app.app_id}. {app.job_title} at {app.company_name} (Status: {app.status})")
+
+
+def show_pipeline_analytics():
+    """Shows funnel conversion, time-in-stage and response rates over all applications."""
+    import tracker_analytics # Imported here so the rest of the tracker starts without numpy
+
+    frame = tracker_analytics.ApplicationFrame.from_store(get_store())
+    if not len(frame):
+        print("No job applications tracked yet.")
         return
-    print("\n--- Current Applications ---")
-    for i, app in enumerate(job_applications):
-        print(f"{i+1}. {app.job_title} at {app.company_name} (Status: {app.status})")
+    tracker_analytics.print_pipeline_report(frame)
+
+
+def search_everything():
+    """Full-text search over applications, companies and scraped postings."""
+    query = input("Search (prefixes work, e.g. 'mach lear seattle'): ").strip()
+    started = datetime.datetime.now()
+    results = get_search_index().search(query)
+    elapsed_ms = (datetime.datetime.now() - started).total_seconds() * 1000
+    if not results:
+        print(f"No matches for '{query}'.")
+        return
+    print(f"\n--- {len(results)} results ({elapsed_ms:.1f} ms) ---")
+    for result in results:
+        key = f"#{result['key']}" if result['kind'] == 'application' else result['key']
+        print(f"[{result['kind']}] {result['title']} ({key})")
+        print(f"    {result['snippet']}")
+
+
+def import_applications():
+    """Bulk-imports applications from Companies - Sheet1.csv or a crawl results (.jsonl) file."""
+    path = input("Path to a Companies sheet (.csv) or crawl results (.jsonl): ").strip()
+    if not os.path.exists(path):
+        print(f"File '{path}' not found.")
+        return
+    if path.endswith('.jsonl'):
+        apps = tracker_import.applications_from_crawl_results(tracker_import.read_crawl_results(path))
+    else:
+        apps = tracker_import.applications_from_sheet(path)
+    stats = tracker_import.import_applications(get_store(), apps, get_events())
+    print(f"Imported {stats['added']} of {stats['read']} applications ({stats['duplicates']} already tracked).")
+
+
+def export_applications():
+    path = input("Export to (default: applications_export.csv): ").strip() or "applications_export.csv"
+    count = tracker_import.export_applications(get_store(), path)
+    print(f"Exported {count} applications to '{path}'.")
 
 
 def main_menu():
@@ -158,8 +247,14 @@ def main_menu():
         print("2. List All Applications")
         print("3. Update Application Status")
         print("4. Add Note to Application")
-        print("5. Exit")
+        print("5. Pipeline Analytics")
+        print("6. Search")
+        print("7. Import Applications (CSV sheet / crawl results)")
+        print("8. Export Applications to CSV")
+        print("9. Exit")
         choice = input("Enter your choice: ")
+        if events is not None:
+            events.sync_with_store() # The web frontend may have changed applications while the menu waited
 
         if choice == '1':
             add_new_application()
@@ -170,7 +265,17 @@ def main_menu():
         elif choice == '4':
             add_note_to_application()
         elif choice == '5':
+            show_pipeline_analytics()
+        elif choice == '6':
+            search_everything()
+        elif choice == '7':
+            import_applications()
+        elif choice == '8':
+            export_applications()
+        elif choice == '9':
             print("Exiting Job Application Tracker. Goodbye!")
+            if store is not None:
+                store.close()
             break
         else:
             print("Invalid choice. Please try again.")
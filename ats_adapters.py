@@ -0,0 +1,208 @@
+import datetime
+import re
+import urllib.parse
+
+JSON_HEADERS = {"Accept": "application/json"}
+
+# Registered adapter classes, tried in order by detect_ats().
+ADAPTERS = []
+
+
+def register_adapter(adapter_cls):
+    """Class decorator that adds an ATS adapter to the registry."""
+    ADAPTERS.append(adapter_cls)
+    return adapter_cls
+
+
+def make_posting(posting_id, title, location, url, updated_at):
+    """Normalized posting dict shared by every adapter."""
+    return {
+        'id': str(posting_id) if posting_id is not None else '',
+        'title': (title or '').strip(),
+        'location': (location or '').strip(),
+        'url': url or '',
+        'updated_at': updated_at or '',
+    }
+
+
+def _first_path_segment(url):
+    segments = [s for s in urllib.parse.urlparse(url).path.split('/') if s]
+    return segments[0] if segments else None
+
+
+def _millis_to_iso(value):
+    if not value:
+        return ''
+    return datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc).isoformat()
+
+
+class ATSAdapter:
+    """
+    Base class for applicant-tracking-system boards with a public JSON listing API.
+
+    Subclasses set `name` and `hosts`, implement board_from_url() to pull the board
+    identifier out of a careers URL, and fetch_postings() to page through the API.
+    api_base can be overridden (e.g. to a local fixture server in tests).
+    """
+
+    name = None
+    hosts = ()
+    default_api_base = None
+
+    def __init__(self, api_base=None):
+        self.api_base = (api_base or self.default_api_base or '').rstrip('/')
+
+    @classmethod
+    def handles_host(cls, host):
+        return any(host == h or host.endswith('.' + h) for h in cls.hosts)
+
+    def board_from_url(self, url):
+        raise NotImplementedError
+
+    def fetch_postings(self, fetcher, board, timeout=15):
+        raise NotImplementedError
+
+
+@register_adapter
+class GreenhouseAdapter(ATSAdapter):
+    name = 'greenhouse'
+    hosts = ('boards.greenhouse.io', 'job-boards.greenhouse.io')
+    default_api_base = 'https://boards-api.greenhouse.io/v1/boards'
+
+    def board_from_url(self, url):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        if 'for' in query: # boards.greenhouse.io/embed/job_board?for=<slug>
+            return query['for'][0]
+        slug = _first_path_segment(url)
+        return slug if slug and slug != 'embed' else None
+
+    def fetch_postings(self, fetcher, board, timeout=15):
+        # Greenhouse returns the whole board in one response.
+        response = fetcher.get(f"{self.api_base}/{board}/jobs", timeout=timeout, headers=JSON_HEADERS)
+        response.raise_for_status()
+        return [
+            make_posting(job.get('id'), job.get('title'), (job.get('location') or {}).get('name'),
+                         job.get('absolute_url'), job.get('updated_at'))
+            for job in response.json().get('jobs', [])
+        ]
+
+
+@register_adapter
+class LeverAdapter(ATSAdapter):
+    name = 'lever'
+    hosts = ('jobs.lever.co',)
+    default_api_base = 'https://api.lever.co/v0/postings'
+    page_size = 100
+
+    def board_from_url(self, url):
+        return _first_path_segment(url)
+
+    def fetch_postings(self, fetcher, board, timeout=15):
+        postings = []
+        skip = 0
+        while True:
+            response = fetcher.get(
+                f"{self.api_base}/{board}?mode=json&skip={skip}&limit={self.page_size}",
+                timeout=timeout, headers=JSON_HEADERS
+            )
+            response.raise_for_status()
+            page = response.json()
+            for job in page:
+                postings.append(make_posting(
+                    job.get('id'), job.get('text'), (job.get('categories') or {}).get('location'),
+                    job.get('hostedUrl'), _millis_to_iso(job.get('updatedAt') or job.get('createdAt'))
+                ))
+            if len(page) < self.page_size:
+                return postings
+            skip += self.page_size
+
+
+@register_adapter
+class AshbyAdapter(ATSAdapter):
+    name = 'ashby'
+    hosts = ('jobs.ashbyhq.com',)
+    default_api_base = 'https://api.ashbyhq.com/posting-api/job-board'
+
+    def board_from_url(self, url):
+        return _first_path_segment(url)
+
+    def fetch_postings(self, fetcher, board, timeout=15):
+        # Ashby's posting API returns every published job in one response.
+        response = fetcher.get(f"{self.api_base}/{board}", timeout=timeout, headers=JSON_HEADERS)
+        response.raise_for_status()
+        return [
+            make_posting(job.get('id'), job.get('title'), job.get('location'),
+                         job.get('jobUrl'), job.get('publishedAt'))
+            for job in response.json().get('jobs', [])
+        ]
+
+
+@register_adapter
+class WorkdayAdapter(ATSAdapter):
+    name = 'workday'
+    hosts = ('myworkdayjobs.com',)
+    page_size = 20 # Workday's CXS API rejects larger pages
+    LOCALE_SEGMENT = re.compile(r'^[a-z]{2}-[A-Z]{2}$')
+
+    def board_from_url(self, url):
+        parsed = urllib.parse.urlparse(url)
+        segments = [s for s in parsed.path.split('/') if s and not self.LOCALE_SEGMENT.match(s)]
+        if not segments:
+            return None
+        tenant = parsed.netloc.split('.')[0]
+        # Board is (scheme://host, tenant, site); postings link back to the human-facing site.
+        return (f"{parsed.scheme}://{parsed.netloc}", tenant, segments[0])
+
+    def fetch_postings(self, fetcher, board, timeout=15):
+        origin, tenant, site = board
+        api_base = self.api_base or f"{origin}/wday/cxs"
+        postings = []
+        offset = 0
+        total = None
+        while True:
+            payload = {"appliedFacets": {}, "limit": self.page_size, "offset": offset, "searchText": ""}
+            response = fetcher.post_json(f"{api_base}/{tenant}/{site}/jobs", payload,
+                                         timeout=timeout, headers=JSON_HEADERS)
+            response.raise_for_status()
+            page = response.json()
+            jobs = page.get('jobPostings') or []
+            if total is None:
+                total = page.get('total') or 0 # Only the first page reports it; later ones say 0
+            for job in jobs:
+                bullet_fields = job.get('bulletFields') or []
+                postings.append(make_posting(
+                    bullet_fields[0] if bullet_fields else job.get('externalPath'),
+                    job.get('title'), job.get('locationsText'),
+                    f"{origin}/{site}{job.get('externalPath', '')}", job.get('postedOn')
+                ))
+            offset += len(jobs)
+            if len(jobs) < self.page_size or (total and offset >= total):
+                return postings
+
+
+def detect_ats(url, api_bases=None):
+    """
+    Returns (adapter, board) for a careers URL hosted on a known ATS, or None.
+    api_bases optionally maps adapter name -> API base URL override.
+    """
+    host = urllib.parse.urlparse(url).netloc.lower()
+    for adapter_cls in ADAPTERS:
+        if adapter_cls.handles_host(host):
+            adapter = adapter_cls((api_bases or {}).get(adapter_cls.name))
+            board = adapter.board_from_url(url)
+            if board:
+                return adapter, board
+    return None
+
+
+def fetch_ats_postings(url, fetcher, timeout=15, api_bases=None):
+    """
+    Fetches structured postings for an ATS-hosted careers URL.
+    Returns (ats_name, postings), or None when the URL isn't on a supported ATS.
+    HTTP and JSON errors propagate so callers can fall back to HTML scraping.
+    """
+    detected = detect_ats(url, api_bases)
+    if detected is None:
+        return None
+    adapter, board = detected
+    return adapter.name, adapter.fetch_postings(fetcher, board, timeout=timeout)
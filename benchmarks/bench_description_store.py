@@ -0,0 +1,87 @@
+"""
+Archives several simulated crawls of ATS-style job description pages and compares the
+DescriptionStore's footprint with saving raw HTML. Run from the repository root:
+
+    python -m benchmarks.bench_description_store [num_postings] [num_crawls]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+from description_store import DescriptionStore
+
+_WORDS = ("build scalable systems machine learning models data pipelines distributed training inference "
+          "latency customers product team ownership python kubernetes experience years degree strong "
+          "communication collaborate research production impact mentor design review").split()
+
+
+def ats_page(posting_id, revision=0, seed=0):
+    """A Greenhouse/Workday-like description page: heavy shared boilerplate around a unique description."""
+    rng = random.Random(f"{posting_id}-{revision}")
+    head = ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Job Posting</title>'
+            '<link rel="stylesheet" href="https://boards.cdn.example.com/assets/board-3f9c.css">'
+            + "".join(f'<meta name="og:{k}" content="Careers at Example Corp - join our {k} team">'
+                      for k in ("title", "site", "type", "locale", "image"))
+            + '<style>' + "".join(f".c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i * 4099 % 0xffffff:06x}}}"
+                                  for i in range(300)) + '</style></head><body>')
+    nav = '<header><nav>' + "".join(f'<a class="nav-link" href="/teams/{t}">{t.title()} Team</a>'
+                                    for t in ("engineering", "design", "sales", "people", "legal")) + '</nav></header>'
+    description = " ".join(rng.choice(_WORDS) for _ in range(450))
+    body = (f'<main id="app_body"><h1 class="app-title">Machine Learning Engineer {posting_id}</h1>'
+            f'<div class="location">Remote</div><div id="content"><p>{description}</p></div>'
+            '<div class="benefits"><ul>' + "".join(f"<li>Benefit number {i}: health, dental, vision</li>"
+                                                   for i in range(20)) + '</ul></div></main>')
+    token = random.Random(f"{seed}-{posting_id}-{revision}").getrandbits(64) # Per-render noise, not content
+    footer = (f'<script>window.__BOARD__={{"csrf":"{token:x}","board":"example"}};</script>'
+              '<footer>' + "<p>Example Corp is an equal opportunity employer. " * 10 + '</p></footer></body></html>')
+    return (head + nav + body + footer).encode('utf-8')
+
+
+def main(num_postings=300, num_crawls=5):
+    path = os.path.join(tempfile.mkdtemp(), 'descriptions.sqlite3')
+    store = DescriptionStore(path)
+    rng = random.Random(1)
+    revisions = [0] * num_postings
+    fetched_bytes = plain_zlib = 0
+    started = time.perf_counter()
+    for crawl in range(num_crawls):
+        for posting_id in range(num_postings):
+            if crawl and rng.random() < 0.1:
+                revisions[posting_id] += 1 # The posting text was edited since the last crawl
+            body = ats_page(posting_id, revisions[posting_id])
+            fetched_bytes += len(body)
+            plain_zlib += len(zlib.compress(body, 9))
+            store.save(f"https://boards.example.com/jobs/{posting_id}", body, app_id=posting_id,
+                       fetched_at=crawl * 86400 + posting_id)
+    elapsed = time.perf_counter() - started
+    stats = store.stats()
+    print(f"{num_crawls} crawls x {num_postings} postings, codec {store.codec}, {elapsed:.1f}s")
+    print(f"Raw HTML, every fetch:   {fetched_bytes / 1e6:8.2f} MB")
+    print(f"zlib per page, no dedup: {plain_zlib / 1e6:8.2f} MB ({fetched_bytes / plain_zlib:.1f}x)")
+    print(f"Raw HTML, versions only: {stats['raw_bytes'] / 1e6:8.2f} MB ({fetched_bytes / stats['raw_bytes']:.1f}x; "
+          f"{stats['snapshots']} versions)")
+    stored = stats['stored_bytes']
+    print(f"DescriptionStore:        {stored / 1e6:8.2f} MB "
+          f"({fetched_bytes / stored:.1f}x; {stats['raw_bytes'] / stored:.1f}x over the versions)")
+    print(f"Database file:           {os.path.getsize(path) / 1e6:8.2f} MB")
+
+    posting_id = max(range(num_postings), key=revisions.__getitem__)
+    versions = store.versions(app_id=posting_id)
+    started = time.perf_counter()
+    changed = store.changed(versions[0][2], versions[-1][2])
+    print(f"\nPosting {posting_id}: {len(versions)} versions; changed(first, last) = {changed} "
+          f"in {(time.perf_counter() - started) * 1e6:.0f} us")
+    started = time.perf_counter()
+    diff = store.diff(versions[0][2], versions[-1][2])
+    print(f"diff(first, last): {len(diff)} lines in {(time.perf_counter() - started) * 1000:.1f} ms")
+    markup_only = ats_page(posting_id, revisions[posting_id], seed=1) # Same text, different script token
+    digest = store.save(f"https://boards.example.com/jobs/{posting_id}", markup_only, app_id=posting_id)
+    print(f"Markup-only change counts as changed: {store.changed(versions[-1][2], digest)}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,42 @@
+"""
+Crawls a corpus of synthetic listing pages from a local HTTP server through
+ScrapePipeline with different numbers of parse processes. Run from the repository root:
+
+    python -m benchmarks.bench_scrape_pipeline [num_pages] [postings_per_page]
+"""
+import os
+import resource
+import sys
+import tempfile
+
+from benchmarks.fixtures import start_fixture_server
+from scrape_pipeline import ScrapePipeline
+from scraper_http import HttpFetcher
+
+
+def main(num_pages=400, postings_per_page=2000):
+    server = start_fixture_server(num_pages, postings_per_page)
+    base = f"http://127.0.0.1:{server.server_port}"
+    companies = [(f"Company {i}", f"{base}/company/{i}") for i in range(num_pages)]
+    output_path = os.path.join(tempfile.mkdtemp(), 'results.jsonl')
+    print(f"{num_pages} pages x {postings_per_page} postings, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for parse_workers in [0] + [n for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)]:
+        # No rate limiting against our own fixture server; the pipeline caps per-host concurrency.
+        fetcher = HttpFetcher(pool_size=16, requests_per_second=1e6, burst=1e6)
+        pipeline = ScrapePipeline(fetch_workers=16, parse_workers=parse_workers, max_per_host=16, fetcher=fetcher)
+        stats = pipeline.run(companies, output_path)
+        fetcher.close()
+        rate = stats['pages'] / stats['elapsed']
+        baseline = baseline or rate
+        label = "inline parse" if parse_workers == 0 else f"{parse_workers} parse process(es)"
+        print(f"{label:<24} {stats['elapsed']:6.2f}s  {rate:7.1f} pages/s  ({rate / baseline:.1f}x)  "
+              f"{stats['links']} links, {stats['bytes'] / 1e6:.0f} MB")
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Peak RSS of the coordinating process: {peak_mib:.0f} MiB")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,123 @@
+"""
+Compares listing postings from sitemaps and feeds (sitemaps.enumerate_postings) with
+downloading and parsing each career page's HTML, against a local fixture server where
+three in four companies publish a sitemap index, sitemap or RSS feed. A warm run after a
+few postings changed shows the lastmod/ETag skipping. Run from the repository root:
+
+    python -m benchmarks.bench_sitemaps [num_companies] [postings_per_company]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import job_scraper
+import sitemaps
+from benchmarks.fixtures import _urlset, company_format, start_sitemap_fixture_server
+from scraper_http import HttpFetcher
+from stage_stats import StageStats
+
+
+def crawl(companies, fetcher, sitemap_state=None):
+    """
+    Crawls with or without sitemaps. Returns ({company: set of links}, seconds) and a
+    StageStats for the companies that publish a sitemap or feed (the rest always use HTML).
+    """
+    stats = StageStats()
+    links = {}
+    started = time.perf_counter()
+    for result in job_scraper.crawl_career_pages(companies, max_workers=16, max_per_host=16, fetcher=fetcher,
+                                                 sitemap_state=sitemap_state):
+        if result['error']:
+            raise RuntimeError(f"{result['Company']}: {result['error']}")
+        if company_format(int(result['Company'].split()[-1])) != 'html':
+            job_scraper.record_crawl_stats(stats, result)
+        links[result['Company']] = set(result['links'])
+    return stats, links, time.perf_counter() - started
+
+
+def report(label, stats, seconds):
+    counters = stats.summary()['counters']
+    print(f"{label:<20} {seconds:6.2f}s {counters['bytes'] / 1e6:9.2f} MB {counters['links']:9} "
+          f"{counters.get('unchanged_postings', 0):10}")
+
+
+def bench_memory(num_urls=50000):
+    """
+    Peak Python memory while job_scraper.fetch_sitemap_postings reads one large sitemap
+    from the fixture server (with a keyword hint no posting matches, so only the read
+    itself is measured) vs. holding the file's entries in a list or parsing it in one piece.
+    """
+    server = start_sitemap_fixture_server(2, num_urls) # Company 1 publishes a single plain sitemap
+    careers_url = f"http://127.0.0.1:{server.server_port}/company/1"
+    fetcher = HttpFetcher(requests_per_second=1e6, burst=1e6)
+    body = server.render('/company/1/sitemap.xml')[1]
+    state = sitemaps.SitemapState(os.path.join(tempfile.mkdtemp(), 'crawl_state.sqlite3'))
+    try:
+        job_scraper.fetch_sitemap_postings(careers_url, "no such posting", fetcher, state) # Warms the server
+        state.forget_source(careers_url)
+        state.forget_file(f"{careers_url}/sitemap.xml")
+        tracemalloc.start()
+        found = job_scraper.fetch_sitemap_postings(careers_url, "no such posting", fetcher, state)
+        streamed = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        entries = list(sitemaps.iter_feed_entries([body]))
+        listed = tracemalloc.get_traced_memory()[1]
+        del entries
+        tracemalloc.reset_peak()
+        ET.fromstring(body)
+        whole = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        state.close()
+        server.shutdown()
+    assert found is not None and found['bytes'] == len(body), "the sitemap was not read"
+    print(f"\n{num_urls} URL sitemap ({len(body) / 1e6:.1f} MB): peak {streamed / 1e6:.2f} MB in "
+          f"fetch_sitemap_postings, {listed / 1e6:.2f} MB holding its entries in a list, "
+          f"{whole / 1e6:.2f} MB with ElementTree.fromstring")
+
+
+def main(num_companies=100, postings_per_company=2000):
+    server = start_sitemap_fixture_server(num_companies, postings_per_company)
+    base = f"http://127.0.0.1:{server.server_port}"
+    companies = [(f"Company {i}", f"{base}/company/{i}") for i in range(num_companies)]
+    # No rate limiting against our own fixture server.
+    fetcher = HttpFetcher(pool_size=16, requests_per_second=1e6, burst=1e6)
+    state_path = os.path.join(tempfile.mkdtemp(), 'crawl_state.sqlite3')
+    try:
+        # Untimed pass so the (in-process) fixture server has rendered every file before the runs.
+        warm_up = sitemaps.SitemapState(':memory:')
+        crawl(companies, fetcher, warm_up)
+        warm_up.close()
+
+        print(f"{'':<20} {'wall':>7} {'read':>12} {'postings':>9} {'unchanged':>10}")
+        html_stats, html_links, seconds = crawl(companies, fetcher)
+        report("HTML listing pages", html_stats, seconds)
+
+        state = sitemaps.SitemapState(state_path)
+        stats, links, seconds = crawl(companies, fetcher, state)
+        report("Sitemaps, first run", stats, seconds)
+        assert links == html_links, "sitemaps and HTML found different postings"
+
+        rng = random.Random(0)
+        for company in rng.sample(range(num_companies), max(1, num_companies // 10)):
+            for posting in rng.sample(range(postings_per_company), 5): # A tenth of the boards edit a few postings
+                server.bump(company, posting)
+        stats, links, seconds = crawl(companies, fetcher, state)
+        report("Sitemaps, warm run", stats, seconds)
+        assert links == html_links
+        state.close()
+    finally:
+        fetcher.close()
+        server.shutdown()
+    print(f"({sum(company_format(i) != 'html' for i in range(num_companies))} of {num_companies} companies "
+          f"publish a sitemap or feed; bytes and postings count only those, wall time\n"
+          "includes the others, which are crawled from their HTML in every run)")
+    bench_memory()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,101 @@
+"""
+End-to-end benchmark of the hot paths on synthetic data: crawling and link extraction
+against a local fixture server, the company CSV merge (and list snapshot), and tracker
+add/update/list. Run from the repository root:
+
+    python -m benchmarks.bench_suite [--scale N] [--json results.jsonl]
+
+--scale multiplies the dataset sizes (default 1: 200 pages, 20,000 CSV rows, 20,000
+applications). With --json every crawled page and a final summary (all stages) are
+appended as JSON lines, so runs can be diffed to catch regressions.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import csv_merge
+import job_scraper
+from benchmarks.fixtures import generate_rows, start_fixture_server, write_career_urls_csv, write_company_list_csv
+from company_snapshot import load_company_table
+from scraper_http import HttpFetcher
+from stage_stats import StageStats
+from tracker_models import JobApplication
+from tracker_store import ApplicationStore
+
+
+def bench_crawl(stats, num_pages, postings_per_page=2000):
+    """Fetch + link extraction for num_pages listing pages through crawl_career_pages."""
+    server = start_fixture_server(16, postings_per_page)
+    base = f"http://127.0.0.1:{server.server_port}"
+    companies = [(f"Company {i}", f"{base}/company/{i}") for i in range(num_pages)]
+    # No rate limiting against our own fixture server.
+    fetcher = HttpFetcher(pool_size=16, requests_per_second=1e6, burst=1e6)
+    try:
+        with stats.timer('crawl_total'):
+            for result in job_scraper.crawl_career_pages(companies, max_workers=16, max_per_host=16, fetcher=fetcher):
+                job_scraper.record_crawl_stats(stats, result)
+    finally:
+        fetcher.close()
+        server.shutdown()
+
+
+def bench_csv(stats, workdir, n):
+    """Merges a new company list of n rows (half of them already known) into an output CSV of n rows."""
+    output_path = os.path.join(workdir, 'company_career_urls_output.csv')
+    list_path = os.path.join(workdir, 'TheList.csv')
+    write_career_urls_csv(output_path, n)
+    write_company_list_csv(list_path, n, start=n // 2)
+    with stats.timer('csv_merge'):
+        merge_stats = csv_merge.stream_merge_career_urls(output_path, list_path)
+    for name, value in merge_stats.items():
+        stats.count(f'merge_{name}', value)
+
+    with stats.timer('snapshot_build'):
+        load_company_table(list_path, force=True)
+    with stats.timer('snapshot_load'):
+        table = load_company_table(list_path)
+    with stats.timer('snapshot_select'):
+        table.select(region='CA', min_base=100000)
+
+
+def bench_tracker(stats, workdir, n):
+    """Adds, updates and lists n applications in a fresh SQLite tracker database."""
+    store = ApplicationStore(os.path.join(workdir, 'job_tracker.db'))
+    apps = [JobApplication(**row) for row in generate_rows(n)]
+    with store.batch():
+        for app in apps:
+            with stats.timer('tracker_add'):
+                store.add(app)
+    with store.batch():
+        for i, app in enumerate(apps):
+            app.status = JobApplication.PREDEFINED_STATUSES[i % len(JobApplication.PREDEFINED_STATUSES)]
+            with stats.timer('tracker_update'):
+                store.update(app)
+    with stats.timer('tracker_list'):
+        listed = sum(1 for _ in store.iter_all())
+    with stats.timer('tracker_by_status'):
+        store.by_status("Applied")
+    with stats.timer('tracker_search'):
+        store.search("Company 42")
+    stats.count('tracker_rows', listed)
+    store.close()
+
+
+def main(scale=1, jsonl_path=None):
+    stats = StageStats(jsonl_path)
+    workdir = tempfile.mkdtemp(prefix='job_help_bench_')
+    try:
+        bench_crawl(stats, 200 * scale)
+        bench_csv(stats, workdir, 20000 * scale)
+        bench_tracker(stats, workdir, 20000 * scale)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(stats.format_summary())
+    stats.close()
+
+
+if __name__ == '__main__':
+    scale = int(sys.argv[sys.argv.index('--scale') + 1]) if '--scale' in sys.argv[:-1] else 1
+    jsonl_path = sys.argv[sys.argv.index('--json') + 1] if '--json' in sys.argv[:-1] else None
+    main(scale, jsonl_path)
@@ -0,0 +1,37 @@
+"""
+Builds an ApplicationFrame for N synthetic applications and times the analytics.
+Run from the repository root:
+
+    python -m benchmarks.bench_tracker_analytics [num_applications]
+"""
+import sys
+import time
+
+import tracker_analytics
+from benchmarks.bench_tracker_models import generate_rows
+from tracker_models import ApplicationColumns, JobApplication
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<38} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return result
+
+
+def main(n=100000):
+    apps = [JobApplication(**row) for row in generate_rows(n)]
+    for i, app in enumerate(apps):
+        app.last_activity_ordinal = app.application_ordinal + i % 45
+    columns = ApplicationColumns.from_applications(apps)
+    print(f"{n} applications")
+    timed("frame from JobApplication objects", lambda: tracker_analytics.ApplicationFrame.from_applications(apps))
+    frame = timed("frame from ApplicationColumns", lambda: tracker_analytics.ApplicationFrame.from_columns(columns))
+    timed("funnel", lambda: tracker_analytics.funnel(frame))
+    timed("time in stage", lambda: tracker_analytics.time_in_stage(frame))
+    timed("response rate by source", lambda: tracker_analytics.response_rates(frame, 'source'))
+    timed("response rate by company", lambda: tracker_analytics.response_rates(frame, 'company'))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,102 @@
+"""
+Memory and speed of the slotted JobApplication (and ApplicationColumns) against the
+previous dict-based class. Run from the repository root:
+
+    python -m benchmarks.bench_tracker_models [num_applications]
+"""
+import datetime
+import random
+import sys
+import time
+import tracemalloc
+
+from tracker_models import ApplicationColumns, JobApplication
+
+
+class LegacyJobApplication:
+    """The pre-__slots__ JobApplication, trimmed to what the benchmark exercises."""
+
+    def __init__(self, company_name, job_title, application_date_str, source_of_listing="", job_id="",
+                 job_description_link="", location="", salary_expectation="", status="Wishlist/To Apply",
+                 notes=""):
+        self.company_name = company_name
+        self.job_title = job_title
+        self.job_id = job_id
+        self.application_date = datetime.datetime.strptime(application_date_str, "%Y-%m-%d").date()
+        self.source_of_listing = source_of_listing
+        self.job_description_link = job_description_link
+        self.location = location
+        self.salary_expectation = salary_expectation
+        self.status = status if status in JobApplication.PREDEFINED_STATUSES else "Wishlist/To Apply"
+        self.last_activity_date = datetime.date.today()
+        self.notes = notes
+        self.resume_version = None
+        self.cover_letter_version = None
+
+    def add_note(self, note):
+        if self.notes:
+            self.notes += f"\n[{datetime.date.today()}] {note}"
+        else:
+            self.notes = f"[{datetime.date.today()}] {note}"
+        self.last_activity_date = datetime.date.today()
+
+
+def generate_rows(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime.date(2024, 1, 1).toordinal()
+    for i in range(n):
+        yield dict(
+            company_name=f"Company {i % 5000}",
+            job_title=rng.choice(["Software Engineer", "ML Engineer", "Data Scientist"]),
+            application_date_str=datetime.date.fromordinal(start + rng.randrange(600)).isoformat(),
+            source_of_listing=rng.choice(["LinkedIn", "Referral", "Scraper"]),
+            job_description_link=f"https://jobs.example.com/{i}",
+            location="Remote",
+            status=rng.choice(JobApplication.PREDEFINED_STATUSES),
+        )
+
+
+def measure(label, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {elapsed * 1000:8.1f} ms {current / 1024 / 1024:8.1f} MiB")
+    return result
+
+
+def bench_notes(cls, num_notes):
+    app = cls("Acme", "Engineer", "2025-01-01")
+    started = time.perf_counter()
+    for i in range(num_notes):
+        app.add_note(f"Follow-up #{i}: pinged the recruiter about next steps.")
+    return time.perf_counter() - started
+
+
+def main(n=50000):
+    rows = list(generate_rows(n))
+    print(f"{n} applications")
+    measure("legacy class (build)", lambda: [LegacyJobApplication(**row) for row in rows])
+    apps = measure("slotted JobApplication (build)", lambda: [JobApplication(**row) for row in rows])
+    measure("ApplicationColumns (from objects)", lambda: ApplicationColumns.from_applications(apps))
+
+    started = time.perf_counter()
+    counts = {}
+    for app in apps:
+        counts[app.status] = counts.get(app.status, 0) + 1
+    per_object = time.perf_counter() - started
+    columns = ApplicationColumns.from_applications(apps)
+    started = time.perf_counter()
+    columns.count_by_status()
+    columnar = time.perf_counter() - started
+    print(f"count by status: objects {per_object * 1000:.1f} ms, columns {columnar * 1000:.1f} ms")
+
+    num_notes = 20000
+    print(f"{num_notes} add_note calls: legacy {bench_notes(LegacyJobApplication, num_notes) * 1000:.1f} ms, "
+          f"slotted {bench_notes(JobApplication, num_notes) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
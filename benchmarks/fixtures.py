@@ -0,0 +1,202 @@
+"""
+Synthetic data for the benchmarks: listing pages (and career sites with sitemaps and
+feeds) served by a local HTTP server, company CSVs in the repository's two formats, and
+tracker applications.
+"""
+import csv
+import gzip
+import http.server
+import random
+import threading
+import zlib
+
+import link_extractor
+from benchmarks.bench_tracker_models import generate_rows
+
+_WORDS = ["Data", "Cloud", "Neural", "Quantum", "Blue", "Bright", "Deep", "Open", "Signal", "Vector",
+          "Labs", "Systems", "Networks", "Robotics", "Health", "Analytics", "Works", "Logic"]
+_SUFFIXES = ["", "", "", " Inc.", ", Inc.", " LLC", " Corp"]
+
+
+def company_name(i):
+    """Deterministic name for company i, so both CSV generators agree on who is who."""
+    rng = random.Random(i)
+    return f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {i}{rng.choice(_SUFFIXES)}"
+
+
+def start_fixture_server(num_pages=16, postings_per_page=2000):
+    """
+    Serves synthetic listing pages at /company/<i> (cycling through num_pages distinct
+    pages) on a free localhost port from a background thread. Call shutdown() when done.
+    """
+    pages = [link_extractor.generate_listing_page(postings_per_page, seed=i) for i in range(min(num_pages, 16))]
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages[int(self.path.rsplit('/', 1)[-1]) % len(pages)]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_company_list_csv(path, n, start=0, seed=0):
+    """Writes a HiringTechCompanies - TheList.csv lookalike: metadata line, header, companies start..start+n."""
+    rng = random.Random(seed)
+    regions = ["Boston", "NYC", "Seattle", "CA, SF Bay, San Francisco", "CA, LA, Westside", "Texas, Austin"]
+    industries = ["Software", "Cloud Software", "Fintech", "Biotechnology", "Artificial Intelligence", ""]
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Last update: synthetic", "", "", "", "", "", "", "", "", ""])
+        writer.writerow(["Company", "City", "Region", "Industry", "Product(s) /Keywords", "Software Engineer (Base)",
+                         "Senior Engineer (Base)", "#Employees (at location)", "Notes", ""])
+        for i in range(start, start + n):
+            base = rng.choice([0, 0, rng.randrange(60000, 180000)])
+            writer.writerow([company_name(i), "Somewhere", rng.choice(regions), rng.choice(industries),
+                             "Widgets, APIs", f"${base:,}" if base else "", "", rng.choice(["", "50", "300"]), "",
+                             ""])
+
+
+def write_career_urls_csv(path, n, start=0, seed=1, url_share=0.6):
+    """Writes a company_career_urls_output.csv lookalike for companies start..start+n; about url_share have a URL."""
+    rng = random.Random(seed)
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Company", "URL"])
+        for i in range(start, start + n):
+            url = f"https://careers.example{i}.com/jobs" if rng.random() < url_share else ""
+            writer.writerow([company_name(i), url])
+
+
+_TITLES = ["Machine Learning Engineer", "Software Engineer", "Data Scientist", "Senior ML Researcher",
+           "Product Manager", "Learning Platform Engineer"]
+
+
+class SitemapFixtureServer(http.server.ThreadingHTTPServer):
+    """
+    Career sites for companies 0..num_companies-1 under /company/<i>, each with the same
+    postings on an HTML listing page and, depending on i % 4, in a gzipped sitemap index
+    (0), a plain sitemap (1), an RSS feed at /company/<i>/feed (2) or nowhere else (3).
+    Responses carry an ETag and honor If-None-Match. bump(i, n) edits posting n of company
+    i, moving its lastmod (and that of the sitemap file and index listing it).
+    """
+
+    sitemap_chunk = 500 # Postings per child sitemap of an index
+
+    def __init__(self, num_companies, postings_per_company):
+        self.num_companies = num_companies
+        self.postings_per_company = postings_per_company
+        self.revisions = {}
+        self.lock = threading.Lock()
+        self.bodies = {}
+        super().__init__(('127.0.0.1', 0), _SitemapHandler)
+        self.daemon_threads = True
+
+    def bump(self, company, posting):
+        with self.lock:
+            self.revisions[company, posting] = self.revisions.get((company, posting), 0) + 1
+            self.bodies.clear()
+
+    def postings(self, company, start=0, stop=None):
+        """(path, title, lastmod) for a company's postings start..stop."""
+        stop = self.postings_per_company if stop is None else min(stop, self.postings_per_company)
+        postings = []
+        for n in range(start, stop):
+            title = _TITLES[(company + n) % len(_TITLES)]
+            slug = title.lower().replace(' ', '-')
+            postings.append((f"/company/{company}/jobs/{n}-{slug}", title,
+                             f"2026-01-{1 + self.revisions.get((company, n), 0):02d}"))
+        return postings
+
+    def render(self, path):
+        """(content type, body) for a path, or None for a 404."""
+        parts = path.strip('/').split('/')
+        if len(parts) < 2 or parts[0] != 'company' or not parts[1].isdigit():
+            return None
+        company, kind = int(parts[1]), company_format(int(parts[1]))
+        host = f"http://127.0.0.1:{self.server_port}"
+        if len(parts) == 2:
+            rows = ['<html><head><title>Careers</title></head><body><nav><a href="/about">About</a></nav><ul>']
+            rows.extend(f'<li class="job-row"><div><a href="{posting_path}"><span>{title}</span></a></div>'
+                        f'<p>Location: Remote</p><p>Posted {lastmod}</p></li>'
+                        for posting_path, title, lastmod in self.postings(company))
+            rows.append('</ul></body></html>')
+            return 'text/html; charset=utf-8', "".join(rows).encode('utf-8')
+        name = parts[2]
+        if kind == 'index' and name == 'sitemap.xml':
+            children = []
+            for start in range(0, self.postings_per_company, self.sitemap_chunk):
+                lastmod = max(lastmod for _, _, lastmod in self.postings(company, start, start + self.sitemap_chunk))
+                children.append(f"<sitemap><loc>{host}/company/{company}/sitemap-jobs-{start // self.sitemap_chunk}"
+                                f".xml.gz</loc><lastmod>{lastmod}</lastmod></sitemap>")
+            return 'application/xml', (f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns='
+                                       f'"http://www.sitemaps.org/schemas/sitemap/0.9">{"".join(children)}'
+                                       '</sitemapindex>').encode('utf-8')
+        if kind == 'index' and name.startswith('sitemap-jobs-') and name.endswith('.xml.gz'):
+            start = int(name[len('sitemap-jobs-'):-len('.xml.gz')]) * self.sitemap_chunk
+            return 'application/x-gzip', gzip.compress(
+                _urlset(host, self.postings(company, start, start + self.sitemap_chunk)), mtime=0)
+        if kind == 'sitemap' and name == 'sitemap.xml':
+            return 'application/xml', _urlset(host, self.postings(company))
+        if kind == 'rss' and name == 'feed':
+            items = "".join(f"<item><title>{title}</title><link>{host}{posting_path}</link>"
+                            f"<pubDate>{lastmod}</pubDate></item>"
+                            for posting_path, title, lastmod in self.postings(company))
+            return 'application/rss+xml', (f'<?xml version="1.0"?><rss version="2.0"><channel><title>Jobs</title>'
+                                           f'{items}</channel></rss>').encode('utf-8')
+        return None
+
+
+def company_format(company):
+    """How SitemapFixtureServer publishes company i's postings: 'index', 'sitemap', 'rss' or 'html'."""
+    return ('index', 'sitemap', 'rss', 'html')[company % 4]
+
+
+def _urlset(host, postings):
+    urls = "".join(f"<url><loc>{host}{path}</loc><lastmod>{lastmod}</lastmod></url>" for path, _, lastmod in postings)
+    return (f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'{urls}</urlset>').encode('utf-8')
+
+
+class _SitemapHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            if self.path not in server.bodies:
+                server.bodies[self.path] = server.render(self.path)
+            rendered = server.bodies[self.path]
+        if rendered is None:
+            self.send_error(404)
+            return
+        content_type, body = rendered
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_sitemap_fixture_server(num_companies=100, postings_per_company=2000):
+    """Starts a SitemapFixtureServer on a free localhost port in a background thread. Call shutdown() when done."""
+    server = SitemapFixtureServer(num_companies, postings_per_company)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
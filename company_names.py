@@ -0,0 +1,106 @@
+import collections
+import re
+import unicodedata
+
+# Legal-form tokens dropped from the end of a name: "Stripe, Inc." -> "stripe".
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'bv', 'pte', 'pty', 'lp',
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+EXACT_CONFIDENCE = 1.0
+COMPACT_CONFIDENCE = 0.95 # Same letters, different spacing: "Data Bricks" / "Databricks"
+
+
+def canonical_company_name(name):
+    """
+    Canonical form used for de-duplication: lower-cased, accents and punctuation removed,
+    '&' spelled out, a leading 'the' and trailing legal suffixes dropped.
+    """
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    name = name.replace('&', ' and ')
+    name = _PUNCTUATION.sub(' ', name)
+    tokens = _WHITESPACE.sub(' ', name).strip().split(' ')
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def name_ngrams(canonical, n=3):
+    """Character n-grams of a canonical name, padded so short names still get a few grams."""
+    padded = f" {canonical} "
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+class CompanyNameIndex:
+    """
+    Near-duplicate index over company names.
+
+    Exact and spacing-only matches on the canonical name are dict lookups. Fuzzy matches
+    use character n-gram blocking: only names sharing an n-gram with the query are scored
+    (by Jaccard similarity), and n-grams shared by more than max_block_size names are
+    skipped as uninformative, so lookups stay sub-quadratic as the list grows.
+    """
+
+    def __init__(self, threshold=0.8, ngram=3, max_block_size=200, min_fuzzy_length=6):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.max_block_size = max_block_size
+        self.min_fuzzy_length = min_fuzzy_length
+        self.names = [] # id -> display name
+        self.grams = [] # id -> n-gram set
+        self.by_canonical = {}
+        self.by_compact = {}
+        self.blocks = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Adds a name to the index and returns its id."""
+        canonical = canonical_company_name(name)
+        name_id = len(self.names)
+        grams = name_ngrams(canonical, self.ngram)
+        self.names.append(name)
+        self.grams.append(grams)
+        self.by_canonical.setdefault(canonical, name_id)
+        self.by_compact.setdefault(canonical.replace(' ', ''), name_id)
+        for gram in grams:
+            block = self.blocks[gram]
+            if len(block) <= self.max_block_size:
+                block.append(name_id)
+        return name_id
+
+    def find(self, name):
+        """Returns (matched_name, confidence) for the best match at or above threshold, or None."""
+        canonical = canonical_company_name(name)
+        if canonical in self.by_canonical:
+            return self.names[self.by_canonical[canonical]], EXACT_CONFIDENCE
+        compact = canonical.replace(' ', '')
+        if compact in self.by_compact:
+            return self.names[self.by_compact[compact]], COMPACT_CONFIDENCE
+        if len(compact) < self.min_fuzzy_length:
+            return None # Too short for n-gram similarity to mean anything
+
+        query = name_ngrams(canonical, self.ngram)
+        overlaps = collections.Counter()
+        for gram in query:
+            block = self.blocks.get(gram)
+            if block and len(block) <= self.max_block_size:
+                overlaps.update(block)
+
+        best = None
+        for name_id, overlap in overlaps.items():
+            similarity = overlap / (len(query) + len(self.grams[name_id]) - overlap)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (name_id, similarity)
+        if best is None:
+            return None
+        # Scale fuzzy scores below the exact/compact tiers so confidences stay ordered.
+        return self.names[best[0]], round(best[1] * COMPACT_CONFIDENCE, 3)
@@ -0,0 +1,307 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+
+import numpy as np
+
+from csv_merge import clean_company_name
+
+SNAPSHOT_MAGIC = b'JHCTAB01'
+MISSING = -1 # Missing salary / headcount, or missing category
+
+# Source column -> (field, kind). Text columns keep the raw string, categorical columns are
+# dictionary-encoded to int16 codes and number columns are parsed to int32.
+COLUMNS = [
+    ('Company', 'company', 'text'),
+    ('City', 'city', 'category'),
+    ('Region', 'region', 'category'),
+    ('Industry', 'industry', 'category'),
+    ('Product(s) /Keywords', 'keywords', 'text'),
+    ('Software Engineer (Base)', 'swe_base', 'number'),
+    ('Senior Engineer (Base)', 'senior_base', 'number'),
+    ('#Employees (at location)', 'employees', 'number'),
+    ('Notes', 'notes', 'text'),
+]
+
+_NOT_DIGITS = re.compile(r"[$,\s]")
+
+
+def snapshot_path_for(csv_path):
+    """The snapshot lives next to the CSV as a hidden file."""
+    directory, filename = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, f".{filename}.snapshot")
+
+
+def parse_number(value):
+    """'$75,000' -> 75000, '10,000' -> 10000. Blank, '$0' and unparseable values are MISSING."""
+    digits = _NOT_DIGITS.sub('', value)
+    if not digits.isdigit() or int(digits) == 0:
+        return MISSING
+    return int(digits)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_csv(csv_path):
+    """Reads every column of TheList into Python lists keyed by field name."""
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        next(reader, None) # Skip metadata line
+        header = next(reader, [])
+        if 'Company' not in header:
+            raise ValueError(f"'Company' column not found in header of '{csv_path}': {header}")
+        positions = [(header.index(source) if source in header else None, field, kind)
+                     for source, field, kind in COLUMNS]
+        values = {field: [] for _, field, _ in COLUMNS}
+        company_idx = header.index('Company')
+        for row in reader:
+            if len(row) <= company_idx or not row[company_idx].strip():
+                continue
+            for idx, field, _ in positions:
+                values[field].append(row[idx].strip() if idx is not None and idx < len(row) else '')
+    return values
+
+
+def _encode_columns(values):
+    """Turns the parsed lists into (arrays, categories): typed numpy columns plus category names."""
+    arrays = {}
+    categories = {}
+    for _, field, kind in COLUMNS:
+        column = values[field]
+        if kind == 'number':
+            arrays[field] = np.fromiter((parse_number(value) for value in column), dtype=np.int32, count=len(column))
+        elif kind == 'category':
+            index = {}
+            codes = [index.setdefault(value, len(index)) if value else MISSING for value in column]
+            arrays[field] = np.array(codes, dtype=np.int16)
+            categories[field] = list(index)
+        else:
+            # Arrow-style string column: one UTF-8 blob plus row offsets into it.
+            encoded = [value.encode('utf-8') for value in column]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            arrays[f'{field}.offsets'] = offsets
+            arrays[f'{field}.data'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return arrays, categories
+
+
+def write_snapshot(snapshot_path, arrays, categories, rows, source):
+    """
+    Writes the columns as one file: magic, header length, a JSON header (source
+    signature, categories and each column's dtype/offset/length) and then the raw
+    column bytes, each 8-byte aligned so they can be memory-mapped in place.
+    """
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, offset, len(array)]
+        offset += (array.nbytes + 7) & ~7
+    header = json.dumps({'source': source, 'rows': rows, 'categories': categories, 'columns': layout}).encode('utf-8')
+    header += b' ' * (-(len(SNAPSHOT_MAGIC) + 8 + len(header)) % 8)
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.snapshot')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(SNAPSHOT_MAGIC + struct.pack('<Q', len(header)) + header)
+            for array in arrays.values():
+                file.write(array.tobytes())
+                file.write(b'\0' * (-array.nbytes % 8))
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_snapshot_header(snapshot_path):
+    """Returns (header_dict, data_start) or None if the file is missing or not a snapshot."""
+    try:
+        with open(snapshot_path, 'rb') as file:
+            prefix = file.read(len(SNAPSHOT_MAGIC) + 8)
+            if len(prefix) < len(SNAPSHOT_MAGIC) + 8 or not prefix.startswith(SNAPSHOT_MAGIC):
+                return None
+            (header_length,) = struct.unpack('<Q', prefix[len(SNAPSHOT_MAGIC):])
+            header = json.loads(file.read(header_length))
+            return header, len(prefix) + header_length
+    except (OSError, ValueError):
+        return None
+
+
+class CompanyTable:
+    """
+    All columns of HiringTechCompanies - TheList.csv as typed arrays: salaries and
+    headcount as int32 (MISSING when blank), city/region/industry as int16 category
+    codes, free text as UTF-8 blobs with offsets. Built by load_company_table(), which
+    memory-maps a cached snapshot so loading costs a header parse, not a CSV parse.
+    """
+
+    def __init__(self, arrays, categories, rows):
+        self.arrays = arrays
+        self.categories = categories
+        self.rows = rows
+        self._text_cache = {}
+        for _, field, kind in COLUMNS:
+            if kind != 'text':
+                setattr(self, field, arrays[field])
+
+    def __len__(self):
+        return self.rows
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, header, data_start):
+        buffer = np.memmap(snapshot_path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name, (dtype, offset, length) in header['columns'].items():
+            dtype = np.dtype(dtype)
+            start = data_start + offset
+            arrays[name] = buffer[start:start + length * dtype.itemsize].view(dtype)
+        return cls(arrays, header['categories'], header['rows'])
+
+    # --- Column access ------------------------------------------------------
+
+    def text(self, field):
+        """Decodes a text column ('company', 'keywords', 'notes') into a list of str (cached)."""
+        if field not in self._text_cache:
+            offsets = self.arrays[f'{field}.offsets']
+            data = self.arrays[f'{field}.data'].tobytes()
+            self._text_cache[field] = [data[start:end].decode('utf-8')
+                                       for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        return self._text_cache[field]
+
+    def iter_text(self, field, block=65536):
+        """
+        Yields a text column's values one at a time without decoding (or caching) the whole
+        column, reading the memory-mapped offsets a block at a time.
+        """
+        offsets = self.arrays[f'{field}.offsets']
+        data = self.arrays[f'{field}.data']
+        for first in range(0, self.rows, block):
+            bounds = offsets[first:min(first + block, self.rows) + 1].tolist()
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                yield data[start:end].tobytes().decode('utf-8')
+
+    def category_names(self, field, codes):
+        names = self.categories[field]
+        return [names[code] if code != MISSING else '' for code in codes.tolist()]
+
+    def company_names(self, indices=None, clean=True):
+        """Company names (cleaned the same way as the merge does) for all rows or the given rows."""
+        names = self.text('company')
+        if indices is not None:
+            names = [names[i] for i in np.asarray(indices).tolist()]
+        return [clean_company_name(name) for name in names] if clean else list(names)
+
+    def iter_company_names(self, clean=True):
+        """Streams every row's company name (see company_names()) without building a list."""
+        for name in self.iter_text('company'):
+            yield clean_company_name(name) if clean else name
+
+    def row(self, i):
+        result = {}
+        for _, field, kind in COLUMNS:
+            if kind == 'text':
+                result[field] = self.text(field)[i]
+            elif kind == 'category':
+                code = int(self.arrays[field][i])
+                result[field] = self.categories[field][code] if code != MISSING else ''
+            else:
+                value = int(self.arrays[field][i])
+                result[field] = value if value != MISSING else None
+        return result
+
+    # --- Queries ------------------------------------------------------------
+
+    @staticmethod
+    def _word_pattern(patterns):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        return re.compile("|".join(rf"\b{re.escape(p.strip())}\b" for p in patterns), re.IGNORECASE)
+
+    def category_mask(self, field, patterns):
+        """
+        Rows whose category contains any of the patterns as whole words, case-insensitively:
+        region 'CA' matches 'CA, SF Bay, San Francisco', industry 'software' matches
+        'Cloud Software'. Categories are matched once each, then mapped over the codes.
+        """
+        regex = self._word_pattern(patterns)
+        matches = np.array([bool(regex.search(name)) for name in self.categories[field]] + [False])
+        # MISSING (-1) indexes the trailing False.
+        return matches[self.arrays[field]]
+
+    def select(self, region=None, industry=None, city=None, min_base=None, min_senior=None, min_employees=None,
+               keyword=None):
+        """
+        Returns the row indices matching every given filter: category filters as in
+        category_mask(), minimums on the salary/headcount columns (rows with the value
+        missing never match) and keyword as whole words in Industry or Product(s)/Keywords.
+        """
+        mask = np.ones(self.rows, dtype=bool)
+        for field, patterns in (('region', region), ('industry', industry), ('city', city)):
+            if patterns:
+                mask &= self.category_mask(field, patterns)
+        for field, minimum in (('swe_base', min_base), ('senior_base', min_senior), ('employees', min_employees)):
+            if minimum is not None:
+                mask &= self.arrays[field] >= minimum
+        if keyword:
+            regex = self._word_pattern(keyword)
+            industries = self.category_names('industry', self.arrays['industry'])
+            keywords = self.text('keywords')
+            mask &= np.fromiter((bool(regex.search(f"{industries[i]} {keywords[i]}")) for i in range(self.rows)),
+                                dtype=bool, count=self.rows)
+        return np.flatnonzero(mask)
+
+
+def load_company_table(csv_path, snapshot_path=None, force=False):
+    """
+    Loads TheList as a CompanyTable, reusing the binary snapshot when it is still valid:
+    same source size and mtime, or (if only the mtime changed) the same SHA-256.
+    Otherwise the CSV is parsed once and the snapshot rewritten.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    stat = os.stat(csv_path)
+    found = None if force else _read_snapshot_header(snapshot_path)
+    if found is not None:
+        header, data_start = found
+        source = header['source']
+        if source['size'] == stat.st_size and (source['mtime_ns'] == stat.st_mtime_ns
+                                               or source['sha256'] == _file_sha256(csv_path)):
+            return CompanyTable.from_snapshot(snapshot_path, header, data_start)
+
+    values = _parse_csv(csv_path)
+    arrays, categories = _encode_columns(values)
+    rows = len(values['company'])
+    source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': _file_sha256(csv_path)}
+    write_snapshot(snapshot_path, arrays, categories, rows, source)
+    return CompanyTable(arrays, categories, rows)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'HiringTechCompanies - TheList.csv'
+    started = time.perf_counter()
+    table = load_company_table(csv_path, force=True)
+    print(f"Parsed CSV and wrote snapshot: {len(table)} companies in {(time.perf_counter() - started) * 1000:.1f} ms")
+    started = time.perf_counter()
+    table = load_company_table(csv_path)
+    print(f"Loaded snapshot: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    started = time.perf_counter()
+    matches = table.select(region='CA', min_base=100000)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"\nRegion=CA, Software Engineer base >= $100,000: {len(matches)} companies ({elapsed:.2f} ms)")
+    for i in matches[:10]:
+        row = table.row(i)
+        print(f"  {row['company']:<32} {row['region']:<28} ${row['swe_base']:,}")
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+DEFAULT_STATE_FILENAME = '.crawl_state.sqlite3'
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+
+def state_path_for(output_filepath):
+    """Crawl state lives next to company_career_urls_output.csv."""
+    return os.path.join(os.path.dirname(os.path.abspath(output_filepath)), DEFAULT_STATE_FILENAME)
+
+
+def postings_hash(links):
+    """Order-independent hash of a company's posting URLs."""
+    digest = hashlib.sha256()
+    for link in sorted(set(links)):
+        digest.update(link.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class CrawlStateStore:
+    """
+    Per-company crawl history used by incremental sweeps.
+
+    For every company it remembers when it was last fetched, a hash of the posting URLs
+    seen, and the URLs themselves. Boards whose postings change get polled more often
+    (the poll interval halves down to min_interval); boards that stay the same back off
+    (the interval grows by backoff_factor up to max_interval).
+    """
+
+    def __init__(self, path, min_interval=6 * HOUR, max_interval=14 * DAY,
+                 initial_interval=DAY, backoff_factor=1.5):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.backoff_factor = backoff_factor
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS company_state (
+                company TEXT PRIMARY KEY,
+                url TEXT,
+                last_fetch REAL,
+                next_fetch REAL,
+                poll_interval REAL,
+                content_hash TEXT,
+                change_count INTEGER NOT NULL DEFAULT 0,
+                fetch_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS seen_postings (
+                company TEXT NOT NULL,
+                url TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (company, url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_company_state_next_fetch ON company_state (next_fetch);
+        """)
+        self.conn.commit()
+
+    def due_companies(self, companies, now=None):
+        """
+        Filters (company, url) pairs down to the ones that should be fetched now: companies
+        never crawled, whose URL changed, or whose next_fetch time has passed.
+        """
+        now = time.time() if now is None else now
+        schedule = {
+            company: (url, next_fetch)
+            for company, url, next_fetch in self.conn.execute("SELECT company, url, next_fetch FROM company_state")
+        }
+        due = []
+        for company, url in companies:
+            known = schedule.get(company)
+            if known is None or known[0] != url or known[1] is None or known[1] <= now:
+                due.append((company, url))
+        return due
+
+    def record_result(self, company, url, links, now=None):
+        """
+        Stores the outcome of a successful fetch and reschedules the company.
+        Returns {'new': [...], 'removed': [...], 'unchanged': int, 'changed': bool}.
+        """
+        now = time.time() if now is None else now
+        new_hash = postings_hash(links)
+        row = self.conn.execute(
+            "SELECT content_hash, poll_interval FROM company_state WHERE company = ?", (company,)
+        ).fetchone()
+        old_hash, interval = row if row else (None, None)
+
+        previous = {u for (u,) in self.conn.execute("SELECT url FROM seen_postings WHERE company = ?", (company,))}
+        current = set(links)
+        new_links = sorted(current - previous)
+        removed_links = sorted(previous - current)
+        changed = old_hash != new_hash
+
+        if interval is None:
+            interval = self.initial_interval
+        elif changed:
+            interval = max(self.min_interval, interval / 2)
+        else:
+            interval = min(self.max_interval, interval * self.backoff_factor)
+
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO company_state (company, url, last_fetch, next_fetch, poll_interval, content_hash,
+                                           change_count, fetch_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT(company) DO UPDATE SET
+                    url = excluded.url,
+                    last_fetch = excluded.last_fetch,
+                    next_fetch = excluded.next_fetch,
+                    poll_interval = excluded.poll_interval,
+                    content_hash = excluded.content_hash,
+                    change_count = change_count + excluded.change_count,
+                    fetch_count = fetch_count + 1
+            """, (company, url, now, now + interval, interval, new_hash, 1 if changed and row else 0))
+            if removed_links:
+                self.conn.executemany("DELETE FROM seen_postings WHERE company = ? AND url = ?",
+                                      [(company, u) for u in removed_links])
+            if new_links:
+                self.conn.executemany("INSERT INTO seen_postings (company, url, first_seen) VALUES (?, ?, ?)",
+                                      [(company, u, now) for u in new_links])
+
+        return {
+            'new': new_links,
+            'removed': removed_links,
+            'unchanged': len(current & previous),
+            'changed': changed,
+        }
+
+    def record_failure(self, company, url, now=None):
+        """Keeps the previous postings but retries the company after min_interval."""
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute("""
+                INSERT INTO company_state (company, url, last_fetch, next_fetch, poll_interval)
+                VALUES (?, ?, ?, ?, NULL)
+                ON CONFLICT(company) DO UPDATE SET next_fetch = excluded.next_fetch
+            """, (company, url, now, now + self.min_interval))
+
+    def seen_postings(self, company):
+        return [u for (u,) in self.conn.execute(
+            "SELECT url FROM seen_postings WHERE company = ? ORDER BY url", (company,))]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,236 @@
+import csv
+import heapq
+import itertools
+import os
+import tempfile
+
+from company_names import (COMPACT_CONFIDENCE, EXACT_CONFIDENCE, CompanyNameIndex,
+                           canonical_company_name)
+
+OUTPUT_FIELDNAMES = ['Company', 'URL']
+
+# Existing rows sort ahead of new ones with the same key, so their URLs win.
+EXISTING_ROW = 0
+NEW_ROW = 1
+
+
+def company_key(name):
+    """
+    Key used to sort and de-duplicate companies: the canonical name without spaces, so
+    "Stripe", "Stripe, Inc." and "Stripe Inc" (or "Wal-Mart" and "Walmart") share a key.
+    """
+    return canonical_company_name(name).replace(' ', '')
+
+
+def clean_company_name(raw_name):
+    """Basic cleaning: take only the name before a parenthesis if one exists."""
+    company_name = raw_name.strip()
+    if '(' in company_name:
+        company_name = company_name.split('(', 1)[0].strip()
+    return company_name
+
+
+def iter_existing_career_urls(filepath):
+    """Streams (Company, URL) pairs from company_career_urls_output.csv without loading it."""
+    if not os.path.exists(filepath):
+        return
+    with open(filepath, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        if not reader.fieldnames or 'Company' not in reader.fieldnames or 'URL' not in reader.fieldnames:
+            print(f"Warning: '{filepath}' is missing 'Company' or 'URL' header. Treating as empty.")
+            return
+        for row in reader:
+            company_name = (row.get('Company') or '').strip()
+            if company_name:
+                yield company_name, (row.get('URL') or '').strip()
+
+
+def iter_new_companies(filepath):
+    """Streams cleaned company names from HiringTechCompanies - TheList.csv."""
+    try:
+        with open(filepath, mode='r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            next(reader) # Skip metadata line
+            actual_header = next(reader) # Actual header
+            try:
+                company_col_idx = actual_header.index('Company')
+            except ValueError:
+                print(f"Error: 'Company' column not found in header of '{filepath}': {actual_header}")
+                return
+            for row in reader:
+                if len(row) > company_col_idx:
+                    company_name = clean_company_name(row[company_col_idx])
+                    if company_name:
+                        yield company_name
+    except FileNotFoundError:
+        print(f"Error: The file '{filepath}' was not found.")
+    except StopIteration:
+        print(f"Error: CSV file '{filepath}' seems to be empty or has too few rows for headers.")
+
+
+def _write_sorted_runs(tagged_rows, run_size, tmpdir):
+    """Sorts the input in chunks of run_size rows and spills each chunk to a temp CSV."""
+    run_paths = []
+    while True:
+        chunk = list(itertools.islice(tagged_rows, run_size))
+        if not chunk:
+            return run_paths
+        chunk.sort()
+        path = os.path.join(tmpdir, f"run_{len(run_paths):05d}.csv")
+        with open(path, mode='w', encoding='utf-8', newline='') as file:
+            csv.writer(file).writerows(chunk)
+        run_paths.append(path)
+
+
+def _read_run(path):
+    with open(path, mode='r', encoding='utf-8', newline='') as file:
+        for key, origin, seq, company_name, url in csv.reader(file):
+            yield key, int(origin), int(seq), company_name, url
+
+
+def _pick_group_rows(group):
+    """
+    Keeps the first row for each distinct URL in the group, or just the first row when no
+    row has a URL (existing rows sort first). Rows sharing a key but pointing at different
+    career pages are kept apart rather than folded into one.
+    """
+    kept = {}
+    for row in group:
+        if row[4] and row[4] not in kept:
+            kept[row[4]] = row
+    return list(kept.values()) or [group[0]]
+
+
+def iter_merged_companies(output_filepath, new_companies_list_filepath, run_size=100000, tmpdir=None,
+                          fuzzy=True, on_merge=None, new_companies=None):
+    """
+    External sort-merge of the existing output rows and the new company list (read from
+    new_companies_list_filepath, or taken from new_companies, an iterable of cleaned
+    names such as the cached company snapshot's, when given).
+
+    Yields (Company, URL) in company-key order, one row per company key and URL; rows
+    without a URL are folded into the first row sharing their key that has one, while rows
+    with different URLs are all kept. With fuzzy=True a company without a URL is also
+    dropped if a CompanyNameIndex finds a near-duplicate already written. Each dropped row
+    is reported as on_merge(dropped_name, kept_name, confidence). Memory use while sorting
+    is bounded by run_size rows; the fuzzy index grows with the number of unique companies.
+    """
+    counter = itertools.count()
+    existing = ((company_key(name), EXISTING_ROW, next(counter), name, url)
+                for name, url in iter_existing_career_urls(output_filepath))
+    if new_companies is None:
+        new_companies = iter_new_companies(new_companies_list_filepath)
+    new = ((company_key(name), NEW_ROW, next(counter), name, '') for name in new_companies)
+    tagged_rows = itertools.chain(existing, new)
+    name_index = CompanyNameIndex() if fuzzy else None
+
+    def report(dropped_name, kept_name, confidence):
+        if on_merge is not None:
+            on_merge(dropped_name, kept_name, confidence)
+
+    def plain_duplicates(group):
+        """Rows a case-insensitive exact-name merge would already have dropped (new rows only)."""
+        seen = set()
+        dropped = set()
+        for row in group:
+            lowered = row[3].lower()
+            if row[1] == NEW_ROW and lowered in seen:
+                dropped.add(id(row))
+            seen.add(lowered)
+        return dropped
+
+    def resolve(group):
+        kept_rows = _pick_group_rows(group)
+        kept = kept_rows[0]
+        kept_name, kept_url = kept[3], kept[4]
+        already_dropped = plain_duplicates(group)
+        if name_index is not None and not kept_url:
+            match = name_index.find(kept_name)
+            if match is not None:
+                for row in group:
+                    if id(row) not in already_dropped:
+                        report(row[3], match[0], match[1])
+                return []
+        by_url = {row[4]: row for row in kept_rows}
+        for row in group:
+            if id(row) not in already_dropped and not any(row is other for other in kept_rows):
+                # A row repeating a kept URL folds into that row, a URL-less one into the first.
+                into = by_url.get(row[4], kept)[3]
+                same = canonical_company_name(row[3]) == canonical_company_name(into)
+                report(row[3], into, EXACT_CONFIDENCE if same else COMPACT_CONFIDENCE)
+        if name_index is not None:
+            for row in kept_rows:
+                name_index.add(row[3])
+        return [(row[3], row[4]) for row in kept_rows]
+
+    with tempfile.TemporaryDirectory(dir=tmpdir, prefix='career_urls_merge_') as run_dir:
+        run_paths = _write_sorted_runs(tagged_rows, run_size, run_dir)
+        merged = heapq.merge(*(_read_run(path) for path in run_paths), key=lambda row: row[:3])
+        for _, group in itertools.groupby(merged, key=lambda row: row[0]):
+            yield from resolve(list(group))
+
+
+def write_csv_atomically(filepath, fieldnames, rows):
+    """Writes rows to a temp file in the same directory, then renames it over filepath."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.csv')
+    try:
+        with os.fdopen(fd, mode='w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates 0600 files; keep the permissions the CSV had (or the umask default).
+        if os.path.exists(filepath):
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def stream_merge_career_urls(output_filepath, new_companies_list_filepath, run_size=100000, on_row=None,
+                             fuzzy=True, on_merge=None, new_companies=None):
+    """
+    Merges the new company list into the output CSV in bounded memory and replaces the
+    file atomically. on_row(company_name, url) is called for each written row and
+    on_merge(dropped_name, kept_name, confidence) for each near-duplicate folded away;
+    new_companies is passed on to iter_merged_companies().
+    Returns counts: {'rows', 'with_urls', 'needing_urls', 'exact_merges', 'compact_merges',
+    'fuzzy_merges', 'fetches_saved'}. Exact merges share a canonical name, compact merges a
+    company_key() (same letters, different spacing or punctuation); fuzzy merges are the
+    trigram-similarity matches of CompanyNameIndex.
+    """
+    stats = {'rows': 0, 'with_urls': 0, 'needing_urls': 0, 'exact_merges': 0, 'compact_merges': 0,
+             'fuzzy_merges': 0, 'fetches_saved': 0}
+
+    def count_merge(dropped_name, kept_name, confidence):
+        if confidence >= EXACT_CONFIDENCE:
+            stats['exact_merges'] += 1
+        elif company_key(dropped_name) == company_key(kept_name):
+            stats['compact_merges'] += 1
+        else:
+            stats['fuzzy_merges'] += 1
+        # Each folded row is one fewer page to crawl (or URL to look up) on every sweep.
+        stats['fetches_saved'] += 1
+        if on_merge is not None:
+            on_merge(dropped_name, kept_name, confidence)
+
+    def counted_rows():
+        for company_name, url in iter_merged_companies(output_filepath, new_companies_list_filepath, run_size,
+                                                       fuzzy=fuzzy, on_merge=count_merge,
+                                                       new_companies=new_companies):
+            stats['rows'] += 1
+            stats['with_urls' if url else 'needing_urls'] += 1
+            if on_row is not None:
+                on_row(company_name, url)
+            yield company_name, url
+
+    write_csv_atomically(output_filepath, OUTPUT_FIELDNAMES, counted_rows())
+    return stats
@@ -0,0 +1,342 @@
+import collections
+import difflib
+import hashlib
+import html.parser
+import re
+import sqlite3
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError: # zstandard is optional; zlib with a preset dictionary is used instead
+    zstandard = None
+
+import job_scraper
+from scraper_http import HttpFetcher
+
+DEFAULT_SNAPSHOT_PATH = '.description_snapshots.sqlite3'
+
+ZLIB = 'zlib'
+ZSTD = 'zstd'
+ZLIB_DICT_SIZE = 32 * 1024 # zlib only looks back 32 KiB, so a larger preset dictionary is wasted
+ZSTD_DICT_SIZE = 112 * 1024
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dictionaries (
+        id INTEGER PRIMARY KEY,
+        codec TEXT NOT NULL,
+        data BLOB NOT NULL,
+        created_at REAL NOT NULL
+    );
+    -- One row per distinct page body, keyed by the SHA-256 of the raw bytes.
+    CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        text_hash TEXT NOT NULL,
+        codec TEXT NOT NULL,
+        dict_id INTEGER,
+        size INTEGER NOT NULL,
+        stored_size INTEGER NOT NULL,
+        data BLOB NOT NULL
+    );
+    -- Versions of a page over time, optionally tied to a tracked application.
+    CREATE TABLE IF NOT EXISTS snapshots (
+        id INTEGER PRIMARY KEY,
+        url TEXT NOT NULL,
+        app_id INTEGER,
+        hash TEXT NOT NULL REFERENCES blobs (hash),
+        fetched_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_snapshots_app ON snapshots (app_id, fetched_at);
+    CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots (url, fetched_at);
+"""
+
+# Tags and text runs: the units the zlib dictionary is assembled from.
+_FRAGMENT = re.compile(rb"<[^<>]{1,512}>|[^<\n]{8,512}")
+
+
+class _TextExtractor(html.parser.HTMLParser):
+    """Collects the visible text lines of a page (script/style contents are skipped)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            text = " ".join(data.split())
+            if text:
+                self.lines.append(text)
+
+
+def visible_text_lines(body):
+    extractor = _TextExtractor()
+    extractor.feed(body.decode('utf-8', errors='replace'))
+    extractor.close()
+    return extractor.lines
+
+
+def build_zlib_dictionary(samples, size=ZLIB_DICT_SIZE):
+    """
+    Builds a zlib preset dictionary from tags and text runs that occur in at least two
+    samples (ATS boilerplate), most widespread last since zlib reaches nearer bytes cheaper.
+    """
+    counts = collections.Counter()
+    for sample in samples:
+        counts.update(set(_FRAGMENT.findall(sample)))
+    chosen = []
+    total = 0
+    for fragment, seen in counts.most_common():
+        if seen < 2 or total + len(fragment) > size:
+            break
+        chosen.append(fragment)
+        total += len(fragment)
+    return b"".join(reversed(chosen))
+
+
+class DescriptionStore:
+    """
+    Content-addressed archive of job description pages.
+
+    Bodies are stored once per SHA-256 (identical pages across applications and crawls
+    share a blob) and compressed with a shared dictionary trained on earlier pages, which
+    pays off because ATS pages are mostly the same boilerplate. Every blob also records a
+    hash of its visible text, so "did the posting change?" is a hash comparison and
+    markup-only churn (tokens, timestamps in scripts) doesn't count as a change.
+    Uses zstd when the zstandard package is installed, zlib otherwise.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, codec=None, level=9, train_after=64):
+        if codec == ZSTD and zstandard is None:
+            raise ValueError("codec 'zstd' needs the zstandard package")
+        self.codec = codec or (ZSTD if zstandard is not None else ZLIB)
+        self.level = level
+        self.train_after = train_after
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._dictionaries = {} # id -> (codec, bytes)
+        row = self.conn.execute("SELECT id FROM dictionaries WHERE codec = ? ORDER BY id DESC LIMIT 1",
+                                (self.codec,)).fetchone()
+        self.dict_id = row[0] if row else None
+
+    # --- Compression --------------------------------------------------------
+
+    def _dictionary(self, dict_id):
+        if dict_id not in self._dictionaries:
+            self._dictionaries[dict_id] = self.conn.execute(
+                "SELECT codec, data FROM dictionaries WHERE id = ?", (dict_id,)).fetchone()
+        return self._dictionaries[dict_id][1]
+
+    def _compress(self, body):
+        zdict = self._dictionary(self.dict_id) if self.dict_id is not None else None
+        if self.codec == ZSTD:
+            dict_data = zstandard.ZstdCompressionDict(zdict) if zdict else None
+            return zstandard.ZstdCompressor(level=self.level, dict_data=dict_data).compress(body)
+        compressor = zlib.compressobj(self.level, zdict=zdict) if zdict else zlib.compressobj(self.level)
+        return compressor.compress(body) + compressor.flush()
+
+    def _decompress(self, codec, dict_id, data):
+        zdict = self._dictionary(dict_id) if dict_id is not None else None
+        if codec == ZSTD:
+            if zstandard is None:
+                raise ValueError("this snapshot was stored with zstd; install the zstandard package")
+            dict_data = zstandard.ZstdCompressionDict(zdict) if zdict else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+        decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def train_dictionary(self, max_samples=128):
+        """Trains a new shared dictionary on the most recent bodies; returns its id."""
+        samples = [self.load(digest) for (digest,) in self.conn.execute(
+            "SELECT hash FROM blobs ORDER BY rowid DESC LIMIT ?", (max_samples,))]
+        if len(samples) < 2:
+            return self.dict_id
+        if self.codec == ZSTD:
+            data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+        else:
+            data = build_zlib_dictionary(samples)
+        if not data:
+            return self.dict_id
+        cursor = self.conn.execute("INSERT INTO dictionaries (codec, data, created_at) VALUES (?, ?, ?)",
+                                   (self.codec, data, time.time()))
+        self.conn.commit()
+        self.dict_id = cursor.lastrowid
+        return self.dict_id
+
+    def recompress(self):
+        """Re-encodes blobs not yet using the current dictionary; returns the bytes saved."""
+        saved = 0
+        rows = self.conn.execute("SELECT hash, codec, dict_id, stored_size, data FROM blobs "
+                                 "WHERE codec != ? OR dict_id IS NOT ?", (self.codec, self.dict_id)).fetchall()
+        for digest, codec, dict_id, stored_size, data in rows:
+            compressed = self._compress(self._decompress(codec, dict_id, data))
+            if len(compressed) < stored_size:
+                self.conn.execute("UPDATE blobs SET codec = ?, dict_id = ?, stored_size = ?, data = ? WHERE hash = ?",
+                                  (self.codec, self.dict_id, len(compressed), compressed, digest))
+                saved += stored_size - len(compressed)
+        self.conn.commit()
+        return saved
+
+    # --- Saving and loading -------------------------------------------------
+
+    def save(self, url, body, app_id=None, fetched_at=None):
+        """
+        Archives one fetched page. The body is stored only if no identical body exists, and
+        a new version is recorded only if it differs from the latest one for this URL (and
+        application, if given).
+        Returns the content hash.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        latest = self.conn.execute("SELECT hash FROM snapshots WHERE url = ? AND app_id IS ? "
+                                   "ORDER BY fetched_at DESC, id DESC LIMIT 1", (url, app_id)).fetchone()
+        if latest is not None and latest[0] == digest:
+            return digest
+        if self.conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+            text_hash = hashlib.sha256("\n".join(visible_text_lines(body)).encode('utf-8')).hexdigest()
+            compressed = self._compress(body)
+            self.conn.execute("INSERT INTO blobs (hash, text_hash, codec, dict_id, size, stored_size, data) "
+                              "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (digest, text_hash, self.codec, self.dict_id, len(body), len(compressed), compressed))
+        self.conn.execute("INSERT INTO snapshots (url, app_id, hash, fetched_at) VALUES (?, ?, ?, ?)",
+                          (url, app_id, digest, time.time() if fetched_at is None else fetched_at))
+        self.conn.commit()
+        if self.dict_id is None and self.train_after and self.count_blobs() >= self.train_after:
+            self.train_dictionary()
+            self.recompress()
+        return digest
+
+    def load(self, digest):
+        """Returns the raw body stored under a content hash, or None."""
+        row = self.conn.execute("SELECT codec, dict_id, data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return self._decompress(*row) if row else None
+
+    def versions(self, app_id=None, url=None):
+        """(snapshot_id, url, hash, fetched_at) for an application's or URL's versions, oldest first."""
+        if app_id is not None:
+            query, params = "app_id = ?", (app_id,)
+        else:
+            query, params = "url = ?", (url,)
+        return self.conn.execute(f"SELECT id, url, hash, fetched_at FROM snapshots WHERE {query} "
+                                 "ORDER BY fetched_at, id", params).fetchall()
+
+    def latest(self, app_id=None, url=None):
+        """The most recent body saved for an application or URL, or None."""
+        versions = self.versions(app_id, url)
+        return self.load(versions[-1][2]) if versions else None
+
+    # --- Comparing versions -------------------------------------------------
+
+    def changed(self, digest_a, digest_b):
+        """Whether the visible text differs between two stored bodies; no decompression involved."""
+        if digest_a == digest_b:
+            return False
+        rows = dict(self.conn.execute("SELECT hash, text_hash FROM blobs WHERE hash IN (?, ?)", (digest_a, digest_b)))
+        return rows.get(digest_a) != rows.get(digest_b)
+
+    def diff(self, digest_a, digest_b, context=3):
+        """Unified diff of the visible text of two stored bodies ([] when the text is the same)."""
+        if not self.changed(digest_a, digest_b):
+            return []
+        return list(difflib.unified_diff(visible_text_lines(self.load(digest_a)),
+                                         visible_text_lines(self.load(digest_b)),
+                                         digest_a[:12], digest_b[:12], n=context, lineterm=""))
+
+    # --- Housekeeping -------------------------------------------------------
+
+    def count_blobs(self):
+        return self.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+    def stats(self):
+        """
+        Storage summary: 'snapshots', 'blobs', 'raw_bytes' (every snapshot at full size),
+        'unique_bytes' (distinct bodies uncompressed) and 'stored_bytes' (what is on disk).
+        """
+        snapshots, raw_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(b.size), 0) FROM snapshots s JOIN blobs b ON b.hash = s.hash").fetchone()
+        blobs, unique_bytes, stored_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        stored_bytes += self.conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM dictionaries").fetchone()[0]
+        return {'snapshots': snapshots, 'blobs': blobs, 'raw_bytes': raw_bytes, 'unique_bytes': unique_bytes,
+                'stored_bytes': stored_bytes}
+
+    def close(self):
+        self.conn.close()
+
+
+def archive_applications(app_store, desc_store, fetcher=None, max_workers=8, max_per_host=2, timeout=15):
+    """
+    Fetches the description page of every tracked application with a link and saves it
+    as a new version if it changed. Returns {'fetched', 'changed', 'failed'}. A fetcher
+    created here (none given) is closed before returning.
+    """
+    if fetcher is None:
+        fetcher = HttpFetcher(pool_size=max_workers)
+        try:
+            return archive_applications(app_store, desc_store, fetcher, max_workers, max_per_host, timeout)
+        finally:
+            fetcher.close()
+    targets = {}
+    for app_id, link in app_store.conn.execute(
+            "SELECT id, job_link FROM applications WHERE job_link LIKE 'http%' ORDER BY id"):
+        targets.setdefault(link, []).append(app_id)
+
+    def work(link, _):
+        try:
+            body, _ = job_scraper.fetch_job_page(link, timeout=timeout, fetcher=fetcher)
+            return link, body, None
+        except Exception as e:
+            return link, None, e
+
+    counts = {'fetched': 0, 'changed': 0, 'failed': 0}
+    for link, body, error in job_scraper.run_per_host(((link, link) for link in targets), work,
+                                                      max_workers, max_per_host):
+        if error is not None:
+            counts['failed'] += 1
+            print(f"[error] {link}: {error}")
+            continue
+        counts['fetched'] += 1
+        previous = desc_store.versions(app_id=targets[link][0])
+        for app_id in targets[link]:
+            digest = desc_store.save(link, body, app_id=app_id)
+        if previous and desc_store.changed(previous[-1][2], digest):
+            counts['changed'] += 1
+    return counts
+
+
+if __name__ == '__main__':
+    import sys
+
+    from tracker_store import ApplicationStore
+
+    if not (sys.argv[1:] == ['archive'] or (len(sys.argv) == 3 and sys.argv[1] == 'diff')):
+        print("Usage: python description_store.py archive | diff <application id>")
+        sys.exit(1)
+    desc_store = DescriptionStore()
+    if sys.argv[1] == 'diff':
+        versions = desc_store.versions(app_id=int(sys.argv[2]))
+        if len(versions) < 2:
+            print(f"Application #{sys.argv[2]} has {len(versions)} saved version(s); nothing to compare.")
+        else:
+            lines = desc_store.diff(versions[-2][2], versions[-1][2])
+            print("\n".join(lines) if lines else "No visible changes between the last two versions.")
+    else:
+        app_store = ApplicationStore()
+        print(archive_applications(app_store, desc_store))
+        app_store.close()
+    stats = desc_store.stats()
+    if stats['stored_bytes']:
+        print(f"{stats['snapshots']} snapshots, {stats['blobs']} distinct pages: "
+              f"{stats['raw_bytes'] / 1e6:.1f} MB raw -> {stats['stored_bytes'] / 1e6:.2f} MB stored "
+              f"({stats['raw_bytes'] / stats['stored_bytes']:.1f}x).")
+    desc_store.close()
@@ -1,9 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
 
+import collections
+import concurrent.futures
 import csv
+import functools
 import urllib.parse
 import os
+import sys
+import time
+
+import ats_adapters
+from company_snapshot import load_company_table
+import csv_merge
+from crawl_state import CrawlStateStore, state_path_for
+import link_extractor
+from page_cache import DEFAULT_CACHE_PATH, PageCache, fetch_with_cache
+from scraper_http import HttpFetcher, get_default_fetcher
+from search_index import SearchIndex
+import sitemaps
+from stage_stats import StageStats
+import url_discovery
 
 def read_existing_career_urls(filepath):
     """Reads the company_career_urls_output.csv file."""
@@ -46,175 +62,429 @@ def read_existing_career_urls(filepath):
     return existing_data, company_names_set
 
 def read_new_companies_list(filepath):
-    """Reads the HiringTechCompanies - TheList.csv file."""
-    new_companies = []
+    """
+    Streams the company names from HiringTechCompanies - TheList.csv (via the cached
+    snapshot). Yields nothing, after printing the error, if the list can't be loaded.
+    """
     try:
-        with open(filepath, mode='r', encoding='utf-8', newline='') as file:
-            reader = csv.reader(file)
-            next(reader) # Skip metadata line
-            actual_header = next(reader) # Actual header
-            
-            company_col_idx = -1
-            try:
-                company_col_idx = actual_header.index('Company')
-            except ValueError:
-                print(f"Error: 'Company' column not found in header of '{filepath}': {actual_header}")
-                return new_companies
-
-            for row in reader:
-                if len(row) > company_col_idx:
-                    company_name = row[company_col_idx].strip()
-                    # Basic cleaning: take only the name before a parenthesis if one exists
-                    if '(' in company_name:
-                        company_name = company_name.split('(', 1)[0].strip()
-                    if company_name:
-                        new_companies.append(company_name)
-    except FileNotFoundError:
-        print(f"Error: The file '{filepath}' was not found.")
-    except StopIteration:
-        print(f"Error: CSV file '{filepath}' seems to be empty or has too few rows for headers.")
+        table = load_company_table(filepath)
     except Exception as e:
         print(f"An error occurred while reading '{filepath}': {e}")
-    return new_companies
+        return
+    for name in table.iter_company_names():
+        if name:
+            yield name
 
-def merge_and_update_career_urls(output_filepath, new_companies_list_filepath):
+def merge_and_update_career_urls(output_filepath, new_companies_list_filepath, print_rows=False,
+                                 run_size=100000, fuzzy=True, stats=None):
     """
-    Merges new companies into the output CSV and identifies those needing URLs.
-    """
-    existing_data, existing_company_names_set = read_existing_career_urls(output_filepath)
-    new_company_names_list = read_new_companies_list(new_companies_list_filepath)
+    Merges new companies into the output CSV and counts those needing URLs.
 
-    # Add new unique companies to the existing data list
-    for new_name in new_company_names_list:
-        if new_name.lower() not in existing_company_names_set:
-            existing_data.append({'Company': new_name, 'URL': ''})
-            existing_company_names_set.add(new_name.lower()) # Add to set to avoid duplicates from new list itself
+    The merge is a sorted-run external merge (see csv_merge), and the new company names
+    are streamed from the cached company snapshot (see company_snapshot), so memory stays
+    bounded by run_size rows however long the lists are; the output file is replaced
+    atomically. Near-duplicate names ("Stripe" / "Stripe, Inc.") are folded together (see
+    company_names). Printing every merged row and every merge as it happens is opt-in via
+    print_rows. If stats (a StageStats) is given, the merge time and row/merge counts are
+    recorded there. Returns the merge counts (see csv_merge.stream_merge_career_urls), or
+    None if the merge failed.
+    """
+    def print_row(company_name, url):
+        print(f"Company: {company_name}, URL: {url}" if url else f"Company: {company_name} (needs a career page URL)")
 
-    # Sort by company name for consistency, can be optional
-    existing_data.sort(key=lambda x: x['Company'].lower())
+    def print_merge(dropped_name, kept_name, confidence):
+        print(f"Merged '{dropped_name}' -> '{kept_name}' (confidence {confidence:.2f})")
 
-    # Write the consolidated list back to the output file
     try:
-        with open(output_filepath, mode='w', encoding='utf-8', newline='') as file:
-            if not existing_data: 
-                 writer = csv.writer(file)
-                 writer.writerow(['Company', 'URL']) 
-            else:
-                # Ensure fieldnames are based on the actual keys present, default to 'Company', 'URL'
-                fieldnames = list(existing_data[0].keys()) if existing_data else ['Company', 'URL']
-                if 'Company' not in fieldnames: fieldnames.insert(0, 'Company') # Ensure Company is first
-                if 'URL' not in fieldnames: fieldnames.append('URL') # Ensure URL is present
-                # Filter out any other potential keys if they are not 'Company' or 'URL' for simplicity
-                fieldnames = [f for f in fieldnames if f in ['Company', 'URL']]
-
-
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                # Filter rows to only write 'Company' and 'URL'
-                filtered_rows = [{k: row[k] for k in fieldnames if k in row} for row in existing_data]
-                writer.writerows(filtered_rows)
-        print(f"Successfully updated '{output_filepath}' with new companies.")
+        started = time.perf_counter()
+        merge_stats = csv_merge.stream_merge_career_urls(
+            output_filepath, new_companies_list_filepath, run_size=run_size, fuzzy=fuzzy,
+            on_row=print_row if print_rows else None, on_merge=print_merge if print_rows else None,
+            new_companies=read_new_companies_list(new_companies_list_filepath))
+        if stats is not None:
+            stats.observe('merge', time.perf_counter() - started)
+            for name, value in merge_stats.items():
+                stats.count(f'merge_{name}', value)
+            stats.event('merge', output=output_filepath, seconds=round(time.perf_counter() - started, 6),
+                        **merge_stats)
+        print(f"Successfully updated '{output_filepath}' with new companies "
+              f"({merge_stats['rows']} rows: {merge_stats['with_urls']} with URLs, "
+              f"{merge_stats['needing_urls']} needing URLs).")
+        print(f"Duplicate names merged: {merge_stats['exact_merges']} exact, {merge_stats['compact_merges']} "
+              f"spacing/punctuation, {merge_stats['fuzzy_merges']} fuzzy "
+              f"({merge_stats['fetches_saved']} fetches saved per sweep).")
     except Exception as e:
         print(f"Error writing to '{output_filepath}': {e}")
+        return None
+    return merge_stats
 
-    # Now, re-process the updated file to list companies needing URLs
-    companies_with_urls = []
-    companies_needing_urls = []
-    for item in existing_data:
-        # Check if 'Company' key exists and is not empty before trying to access 'URL'
-        if item.get('Company') and not item.get('URL'):
-            companies_needing_urls.append(item['Company'])
-        elif item.get('Company') and item.get('URL'):
-             companies_with_urls.append(item)
-            
-    print("\n--- Companies with URLs (from consolidated list) ---")
-    if companies_with_urls:
-        for item in companies_with_urls:
-            print(f"Company: {item.get('Company')}, URL: {item.get('URL')}")
-    else:
-        print("No companies with pre-filled URLs found in the consolidated list.")
-
-    print("\n--- Companies needing career page URLs (from consolidated list) ---")
-    if companies_needing_urls:
-        for i, company_name in enumerate(companies_needing_urls):
-            print(f"{i+1}. {company_name}")
-    else:
-        print("No companies found that need a career page URL in the consolidated list.")
-        
-    return companies_with_urls, companies_needing_urls
+def fetch_job_page(url, timeout=15, fetcher=None):
+    """
+    Downloads a job page and returns (raw response body, Content-Type charset or None).
+    Raises on HTTP/network errors.
+    """
+    fetcher = fetcher or get_default_fetcher()
+    response = fetcher.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content, link_extractor.header_charset(response.headers.get('Content-Type'))
 
-def scrape_specific_job_page(specific_url, keyword_hint="machine learning"): # Renamed from scrape_uber_jobs
+def extract_job_links(content, base_url, keyword_hint="machine learning", verbose=True, encoding=None):
+    """Extracts links that look like job postings from a downloaded page (encoding: its HTTP charset)."""
+    # This generic heuristic (href mentions job/career/position/opening and the link text
+    # matches the keyword hint) is a placeholder; site-specific parsing would do better.
+    job_links = link_extractor.extract_job_links(content, base_url, keyword_hint, encoding=encoding)
+    if verbose:
+        for full_url in job_links:
+            print(f"Found potential job link: {full_url}")
+    return job_links
+
+def fetch_ats_postings(url, keyword_hint="machine learning", fetcher=None, timeout=15):
+    """
+    Tries the JSON listing API of a known ATS (Greenhouse, Lever, Ashby, Workday) for url.
+    Returns (ats_name, postings) with postings filtered by keyword_hint on the title, or None
+    if the URL isn't on a supported ATS or the API call failed (callers fall back to HTML).
+    """
+    fetcher = fetcher or get_default_fetcher()
+    try:
+        found = ats_adapters.fetch_ats_postings(url, fetcher, timeout=timeout)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"ATS API lookup failed for {url}, falling back to HTML: {e}")
+        return None
+    if found is None:
+        return None
+    ats_name, postings = found
+    keyword_regex = link_extractor.compile_keyword_hint(keyword_hint)
+    if keyword_regex is not None:
+        postings = [p for p in postings if keyword_regex.search(p['title'].lower())]
+    return ats_name, postings
+
+def fetch_sitemap_postings(url, keyword_hint="machine learning", fetcher=None, sitemap_state=None, timeout=15):
+    """
+    Lists the postings of a careers page from its sitemap or RSS/Atom/JSON feed (see
+    sitemaps.enumerate_postings). Returns that result, or None if the site has no
+    sitemap/feed or reading it failed (callers fall back to HTML).
+    """
+    fetcher = fetcher or get_default_fetcher()
+    try:
+        return sitemaps.enumerate_postings(fetcher, sitemap_state, url, keyword_hint, timeout=timeout)
+    except Exception as e:
+        print(f"Sitemap/feed read failed for {url}, falling back to HTML: {e}")
+        return None
+
+def scrape_specific_job_page(specific_url, keyword_hint="machine learning", stats=None,
+                             sitemap_state=None): # Renamed from scrape_uber_jobs
     """
     Scrapes a specific job page URL (e.g. Uber).
     The keyword_hint is used for very basic filtering if needed, but the URL is primary.
     Note: HTML structure and selectors are highly likely to need adjustment.
+    Fetch/parse timings, bytes and links found are recorded in stats (a StageStats) if given.
+    With a sitemaps.SitemapState the site's sitemap or job feed is used when it has one.
     """
     base_url = specific_url 
-    params = {} 
 
     print(f"Attempting to fetch job page: {base_url} (related to '{keyword_hint}')...")
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Connection": "keep-alive",
-        "DNT": "1", # Do Not Track
-        "Upgrade-Insecure-Requests": "1"
-    }
+    ats_result = fetch_ats_postings(base_url, keyword_hint)
+    if ats_result is not None:
+        ats_name, postings = ats_result
+        print(f"Detected {ats_name} board; found {len(postings)} matching postings via its JSON API.")
+        for posting in postings:
+            print(f"Found job posting: {posting['title']} ({posting['location'] or 'N/A'}) - {posting['url']}")
+        return [posting['url'] for posting in postings]
+
+    if sitemap_state is not None:
+        found = fetch_sitemap_postings(base_url, keyword_hint, sitemap_state=sitemap_state)
+        if found is not None:
+            print(f"Read {len(found['postings'])} matching postings from {found['feed_url']} "
+                  f"({len(found['changed_links'])} new or updated).")
+            return [posting['url'] for posting in found['postings']]
 
+    started = time.perf_counter()
     try:
         # Using base_url directly as it now contains the query
-        response = requests.get(base_url, headers=headers, timeout=15)
-        response.raise_for_status()
+        content, charset = fetch_job_page(base_url)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching page: {e}")
+        if stats is not None:
+            stats.count('errors')
         return []
-
-    soup = BeautifulSoup(response.content, "html.parser")
-    job_links = []
+    fetched = time.perf_counter()
 
     # --- PARSING LOGIC (HIGHLY LIKELY TO BE INCORRECT AND NEED ADJUSTMENT) ---
     print("Attempting to parse job page. Selectors are speculative and may not work for all sites.")
-
-    # This generic parsing logic is unlikely to work well for diverse job pages.
-    # It's a placeholder and would need to be made site-specific or much more intelligent.
-    for a_tag in soup.find_all('a', href=True):
-        href = a_tag['href']
-        link_text_lower = a_tag.get_text(separator=" ", strip=True).lower()
-        hint_parts = keyword_hint.lower().split(" ")
-        
-        is_relevant_by_text = True
-        if keyword_hint:
-             is_relevant_by_text = any(part in link_text_lower for part in hint_parts if len(part) > 2)
-
-        # Basic filtering for links that might be job postings
-        if is_relevant_by_text and ('job' in href or 'career' in href or 'position' in href or 'opening' in href):
-            full_url = href
-            parsed_base_url = urllib.parse.urlparse(base_url)
-            if href.startswith('/'):
-                full_url = f"{parsed_base_url.scheme}://{parsed_base_url.netloc}{href}"
-            
-            if full_url not in job_links:
-                job_links.append(full_url)
-                print(f"Found potential job link: {full_url}")
+    job_links = extract_job_links(content, base_url, keyword_hint, encoding=charset)
+    if stats is not None:
+        record_crawl_stats(stats, {'Company': None, 'URL': base_url, 'source': 'html', 'links': job_links,
+                                   'error': None, 'bytes': len(content), 'fetch_time': fetched - started,
+                                   'parse_time': time.perf_counter() - fetched})
 
     if not job_links:
         print(f"No specific job links found on {base_url} using current generic selectors.")
-        # print(f"Page content (first 500 chars): {response.text[:500]}") # For debugging
+        # print(f"Page content (first 500 chars): {content[:500]}") # For debugging
     return job_links
 
+def read_company_urls(filepath):
+    """Reads (Company, URL) pairs from the consolidated CSV, skipping rows without a URL."""
+    companies = []
+    existing_data, _ = read_existing_career_urls(filepath)
+    for row in existing_data:
+        if row['URL']:
+            companies.append((row['Company'], row['URL']))
+    return companies
+
+def _crawl_one(company_name, url, keyword_hint, timeout, fetcher, cache=None, sitemap_state=None):
+    """Fetches and parses one career page. Never raises; errors are reported in the result."""
+    started = time.monotonic()
+    result = {'Company': company_name, 'URL': url, 'links': [], 'error': None, 'not_modified': False,
+              'source': 'html', 'postings': None, 'bytes': 0, 'fetch_time': 0.0, 'parse_time': 0.0}
+    try:
+        ats_result = fetch_ats_postings(url, keyword_hint, fetcher, timeout)
+        if ats_result is not None:
+            result['source'], result['postings'] = ats_result
+            result['links'] = [posting['url'] for posting in result['postings']]
+            result['fetch_time'] = result['elapsed'] = time.monotonic() - started
+            return result
+        if sitemap_state is not None:
+            found = fetch_sitemap_postings(url, keyword_hint, fetcher, sitemap_state, timeout)
+            if found is not None:
+                result['source'], result['postings'] = found['source'], found['postings']
+                result['links'] = [posting['url'] for posting in found['postings']]
+                result['changed_links'], result['unchanged'] = found['changed_links'], found['unchanged']
+                result['bytes'] = found['bytes']
+                result['fetch_time'] = result['elapsed'] = time.monotonic() - started
+                return result
+        if cache is None:
+            content, charset = fetch_job_page(url, timeout=timeout, fetcher=fetcher)
+        else:
+            content, charset, entry, not_modified = fetch_with_cache(fetcher, cache, url, timeout=timeout)
+            parsed = entry.extra if entry is not None else None
+            if not_modified and parsed and parsed.get('keyword_hint') == keyword_hint:
+                # Page unchanged since the last sweep: reuse the links parsed back then.
+                result['links'] = parsed['links']
+                result['not_modified'] = True
+                result['fetch_time'] = result['elapsed'] = time.monotonic() - started
+                return result
+        result['fetch_time'] = time.monotonic() - started
+        result['bytes'] = len(content) if content else 0
+        parse_started = time.monotonic()
+        result['links'] = extract_job_links(content, url, keyword_hint, verbose=False, encoding=charset)
+        result['parse_time'] = time.monotonic() - parse_started
+        if cache is not None:
+            cache.set_extra(url, {'keyword_hint': keyword_hint, 'links': result['links']})
+    except Exception as e:
+        result['error'] = str(e)
+        result['fetch_time'] = result['fetch_time'] or time.monotonic() - started
+    result['elapsed'] = time.monotonic() - started
+    return result
+
+def record_crawl_stats(stats, result):
+    """Adds one crawl result (from crawl_career_pages or the scrape pipeline) to a StageStats."""
+    stats.observe('fetch', result['fetch_time'])
+    if result['parse_time']:
+        stats.observe('parse', result['parse_time'])
+    stats.count('pages')
+    stats.count('bytes', result['bytes'])
+    stats.count('links', len(result['links']))
+    if result['error']:
+        stats.count('errors')
+    if result.get('not_modified'):
+        stats.count('not_modified')
+    if result.get('unchanged'):
+        stats.count('unchanged_postings', result['unchanged'])
+    stats.event('page', company=result['Company'], url=result['URL'], source=result['source'],
+                links=len(result['links']), bytes=result['bytes'], fetch_time=round(result['fetch_time'], 6),
+                parse_time=round(result['parse_time'], 6), error=result['error'])
+
+def crawl_career_pages(companies, keyword_hint="machine learning", max_workers=16,
+                       max_per_host=2, timeout=15, fetcher=None, cache=None, sitemap_state=None):
+    """
+    Crawls many career pages concurrently and yields one result dict per page as it finishes.
+
+    companies is an iterable of (company_name, url) pairs, e.g. from read_company_urls().
+    At most max_workers pages are in flight overall and at most max_per_host per netloc,
+    so a slow or rate-limited host only holds back its own URLs. Each result has the keys
+    'Company', 'URL', 'links', 'error' (None on success), 'elapsed' (seconds), plus 'bytes',
+    'fetch_time' and 'parse_time' for instrumentation (see record_crawl_stats).
+    URLs on a known ATS are read through its JSON API instead ('source' names the ATS and
+    'postings' holds structured postings); everything else uses the HTML heuristic
+    ('source' == 'html'). All workers share one pooled HttpFetcher so connections to the
+    same ATS host are reused.
+    If a PageCache is given, pages are fetched conditionally and unchanged pages (304) reuse
+    the links parsed on the previous run; such results have 'not_modified' set to True.
+    If a sitemaps.SitemapState is given, sites that publish a sitemap or job feed are read
+    from it instead of their HTML page ('source' is 'sitemap' or 'feed'; 'changed_links'
+    lists postings that are new or whose lastmod changed and 'unchanged' counts the rest).
+    A fetcher created here (none given) is closed once the crawl finishes or is abandoned.
+    """
+    owns_fetcher = fetcher is None
+    if owns_fetcher:
+        fetcher = HttpFetcher(pool_size=max_workers)
+    work = functools.partial(_crawl_one, keyword_hint=keyword_hint, timeout=timeout, fetcher=fetcher, cache=cache,
+                             sitemap_state=sitemap_state)
+    try:
+        yield from run_per_host(companies, work, max_workers, max_per_host)
+    finally:
+        if owns_fetcher:
+            fetcher.close()
+
+def run_per_host(companies, work, max_workers=16, max_per_host=2, stop=None):
+    """
+    Runs work(company_name, url) on a thread pool for each (company_name, url) pair and
+    yields the return values as they finish. At most max_workers calls run at once and at
+    most max_per_host per netloc. New work is only submitted while the caller keeps
+    consuming, so a slow consumer holds back the fetches instead of buffering pages.
+    Once stop (a threading.Event) is set nothing new is submitted; the calls already
+    running are still yielded.
+    """
+    # Group work by host so scheduling never parks a worker thread waiting on a busy host.
+    pending_by_host = collections.OrderedDict()
+    for company_name, url in companies:
+        host = urllib.parse.urlparse(url).netloc.lower()
+        pending_by_host.setdefault(host, collections.deque()).append((company_name, url))
+
+    in_flight_by_host = collections.Counter()
+    futures = {}
+
+    def submit_ready(executor):
+        if stop is not None and stop.is_set():
+            return
+        for host, queue in pending_by_host.items():
+            while queue and len(futures) < max_workers and in_flight_by_host[host] < max_per_host:
+                company_name, url = queue.popleft()
+                future = executor.submit(work, company_name, url)
+                futures[future] = host
+                in_flight_by_host[host] += 1
+            if len(futures) >= max_workers:
+                break
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        submit_ready(executor)
+        while futures:
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                host = futures.pop(future)
+                in_flight_by_host[host] -= 1
+                if not pending_by_host[host] and not in_flight_by_host[host]:
+                    del pending_by_host[host]
+                yield future.result()
+            submit_ready(executor)
+
+def crawl_all_companies(output_filepath, keyword_hint="machine learning", max_workers=16, max_per_host=2,
+                        cache_path=DEFAULT_CACHE_PATH, incremental=True, index_search=True, only_companies=None,
+                        stats=None, verbose=True, use_sitemaps=True):
+    """
+    Crawls the companies in the consolidated CSV that have a URL, printing results as they arrive
+    (per-page lines only with verbose=True). Per-page fetch/parse timings, bytes and link counts
+    go to stats (a StageStats) if given.
+    only_companies optionally restricts the crawl to these names (e.g. from
+    CompanyTable.select()); names are compared by csv_merge.company_key().
+    Results always go to the crawl state store (kept next to the CSV), which reports new and
+    removed postings per company; with incremental=True only the companies it says are due
+    are fetched, while incremental=False fetches them all.
+    With index_search=True found postings are added to the tracker's full-text search index.
+    With use_sitemaps=True companies whose site publishes a sitemap or job feed are listed
+    from it (skipping files whose lastmod is unchanged) and only the rest from their HTML.
+    """
+    companies = read_company_urls(output_filepath)
+    if only_companies is not None:
+        wanted = {csv_merge.company_key(name) for name in only_companies}
+        companies = [(name, url) for name, url in companies if csv_merge.company_key(name) in wanted]
+    state = CrawlStateStore(state_path_for(output_filepath))
+    if incremental:
+        total = len(companies)
+        companies = state.due_companies(companies)
+        print(f"Incremental crawl: {len(companies)} of {total} companies are due for a re-fetch.")
+    cache = PageCache(cache_path) if cache_path else None
+    search = SearchIndex() if index_search else None
+    sitemap_state = sitemaps.SitemapState(state_path_for(output_filepath)) if use_sitemaps else None
+    print(f"Crawling {len(companies)} career pages ({max_workers} workers, {max_per_host} per host)...")
+    found = 0
+    failed = 0
+    new_total = 0
+    removed_total = 0
+    from_feeds = 0
+    unchanged_total = 0
+    for result in crawl_career_pages(companies, keyword_hint, max_workers, max_per_host, cache=cache,
+                                     sitemap_state=sitemap_state):
+        if stats is not None:
+            record_crawl_stats(stats, result)
+        if result['error']:
+            failed += 1
+            if verbose:
+                print(f"[error] {result['Company']}: {result['error']}")
+            state.record_failure(result['Company'], result['URL'])
+            continue
+        found += len(result['links'])
+        if result['source'] in ('sitemap', 'feed'):
+            from_feeds += 1
+            unchanged_total += result['unchanged']
+        if search is not None:
+            search.index_crawl_result(result)
+        diff = state.record_result(result['Company'], result['URL'], result['links'])
+        new_total += len(diff['new'])
+        removed_total += len(diff['removed'])
+        if verbose:
+            print(f"[{len(result['links'])} links, +{len(diff['new'])} new, -{len(diff['removed'])} removed, "
+                  f"{result['elapsed']:.1f}s] {result['Company']}")
+            for link in diff['new']:
+                print(f"    new: {link}")
+    print(f"\nCrawl finished: {found} potential job links, {failed} pages failed.")
+    print(f"Postings since last crawl: {new_total} new, {removed_total} removed.")
+    state.close()
+    if search is not None:
+        search.store.close()
+    if sitemap_state is not None:
+        print(f"Sitemaps/feeds: {from_feeds} companies listed without their HTML page, "
+              f"{unchanged_total} postings unchanged since they were last read.")
+        sitemap_state.close()
+    if cache is not None:
+        print(f"Page cache: {cache.stats['hits']} unchanged (304), {cache.stats['misses']} downloaded, "
+              f"{cache.stats['evictions']} evicted.")
+        cache.close()
+    if stats is not None:
+        print(stats.format_summary())
+
 if __name__ == "__main__":
     output_csv_file = 'company_career_urls_output.csv'
     new_companies_input_csv = 'HiringTechCompanies - TheList.csv'
+    # --stats <file> appends per-page/merge events and a final summary as JSON lines.
+    stats = None
+    if '--stats' in sys.argv[:-1]:
+        stats = StageStats(sys.argv[sys.argv.index('--stats') + 1])
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'crawl':
+        # Optional filters over TheList, e.g. crawl --region CA --industry software --min-base 120000
+        filters = {}
+        for flag, key, convert in (('--region', 'region', str), ('--industry', 'industry', str),
+                                   ('--keyword', 'keyword', str), ('--min-base', 'min_base', int)):
+            if flag in sys.argv[:-1]:
+                filters[key] = convert(sys.argv[sys.argv.index(flag) + 1])
+        only_companies = None
+        if filters:
+            table = load_company_table(new_companies_input_csv)
+            only_companies = table.company_names(table.select(**filters))
+            print(f"{len(only_companies)} companies in '{new_companies_input_csv}' match {filters}.")
+        crawl_all_companies(output_csv_file, incremental='--full' not in sys.argv, only_companies=only_companies,
+                            stats=stats, verbose=stats is None, use_sitemaps='--no-sitemaps' not in sys.argv)
+        if stats is not None:
+            stats.close()
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'discover':
+        url_discovery.discover_career_urls(output_csv_file)
+        sys.exit(0)
     
     print(f"Merging companies from '{new_companies_input_csv}' into '{output_csv_file}'...")
     
-    companies_with_urls, companies_needing_urls = merge_and_update_career_urls(
+    merge_stats = merge_and_update_career_urls(
         output_filepath=output_csv_file,
-        new_companies_list_filepath=new_companies_input_csv
+        new_companies_list_filepath=new_companies_input_csv,
+        print_rows='--verbose' in sys.argv,
+        stats=stats
     )
+    if stats is not None:
+        stats.close()
     
     print(f"\nConsolidated list in '{output_csv_file}' is ready.")
-    print("Next steps would be to find career page URLs for the companies listed as 'needing URLs'.")
+    if merge_stats and merge_stats['needing_urls']:
+        print(f"Run 'python job_scraper.py discover' to look up career page URLs for the "
+              f"{merge_stats['needing_urls']} companies still needing one.")
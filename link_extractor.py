@@ -0,0 +1,263 @@
+import codecs
+import functools
+import html.parser
+import re
+import urllib.parse
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError: # lxml is optional; the pure-Python HTMLParser path is used instead
+    lxml_etree = None
+
+# Substrings in an href that suggest the link points at a posting or a listing.
+JOB_HREF_PATTERN = re.compile(r'job|career|position|opening')
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">, or an XML declaration.
+_DECLARED_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)'
+                               rb'|<\?xml[^>]+encoding\s*=\s*["\']([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+# The charset parameter of an HTTP Content-Type header.
+_HEADER_CHARSET = re.compile(r';\s*charset\s*=\s*["\']?([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+@functools.lru_cache(maxsize=64)
+def compile_keyword_hint(keyword_hint):
+    """
+    Turns a keyword hint like "machine learning" into a compiled regex matching any
+    of its words longer than two characters, or None when every link text should match.
+    """
+    if not keyword_hint:
+        return None
+    parts = [part for part in keyword_hint.lower().split(" ") if len(part) > 2]
+    if not parts:
+        return re.compile(r'(?!)') # Same as the old any() over an empty list: never matches
+    return re.compile('|'.join(re.escape(part) for part in parts))
+
+
+class AnchorExtractor(html.parser.HTMLParser):
+    """
+    Streaming anchor collector: records (href, text) for every <a href=...> as the
+    parser emits events, without building a document tree.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.anchors = []
+        self._href = None
+        self._text_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a':
+            return
+        if self._href is not None:
+            self._close_anchor() # Unclosed <a> before a new one; browsers do the same
+        for name, value in attrs:
+            if name == 'href' and value is not None:
+                self._href = value
+                self._text_parts = []
+                break
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._href is not None:
+            self._close_anchor()
+
+    def handle_data(self, data):
+        if self._text_parts is not None:
+            data = data.strip()
+            if data:
+                self._text_parts.append(data)
+
+    def _close_anchor(self):
+        self.anchors.append((self._href, " ".join(self._text_parts)))
+        self._href = None
+        self._text_parts = None
+
+    def close(self):
+        super().close()
+        if self._href is not None:
+            self._close_anchor()
+
+
+class _LxmlAnchorTarget:
+    """lxml parser target with the same (href, text) output as AnchorExtractor, run from C."""
+
+    def __init__(self):
+        self.anchors = []
+        self._href = None
+        self._text_parts = None
+
+    def start(self, tag, attrib):
+        if tag != 'a':
+            return
+        if self._href is not None:
+            self._close_anchor()
+        href = attrib.get('href')
+        if href is not None:
+            self._href = href
+            self._text_parts = []
+
+    def end(self, tag):
+        if tag == 'a' and self._href is not None:
+            self._close_anchor()
+
+    def data(self, data):
+        if self._text_parts is not None:
+            data = data.strip()
+            if data:
+                self._text_parts.append(data)
+
+    def _close_anchor(self):
+        self.anchors.append((self._href, " ".join(self._text_parts)))
+        self._href = None
+        self._text_parts = None
+
+    def close(self):
+        if self._href is not None:
+            self._close_anchor()
+        return self.anchors
+
+
+def header_charset(content_type):
+    """
+    The charset named in a Content-Type header value, or None. Unlike requests'
+    Response.encoding this doesn't fall back to Latin-1 for text/* types without one, so
+    page_charset() still gets to look at the page's own declaration.
+    """
+    found = _HEADER_CHARSET.search(content_type or '')
+    return found.group(1) if found else None
+
+
+def page_charset(content, encoding=None):
+    """
+    The charset to decode a page body with: encoding (e.g. the HTTP Content-Type charset)
+    if given and known, else a byte order mark, else a <meta>/XML declaration near the top
+    of the page, else UTF-8. lxml's own default for undeclared pages is Latin-1, so both
+    backends decode with this instead.
+    """
+    candidates = [encoding]
+    candidates.extend(name for bom, name in _BOMS if content.startswith(bom))
+    declared = _DECLARED_CHARSET.search(content, 0, 4096)
+    if declared:
+        candidates.append((declared.group(1) or declared.group(2)).decode('ascii'))
+    for candidate in candidates:
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+    return 'utf-8'
+
+
+def _decode(content, encoding=None):
+    if isinstance(content, str):
+        return content
+    return content.decode(page_charset(content, encoding), errors='replace')
+
+
+def iter_anchors(content, use_lxml=None, encoding=None):
+    """
+    Returns (href, text) pairs for every anchor with an href in the page.
+    Uses lxml when it is installed (use_lxml=None) unless told otherwise. Bytes are
+    decoded as described in page_charset(); pass the HTTP charset as encoding if known.
+    """
+    if use_lxml is None:
+        use_lxml = lxml_etree is not None
+    if not content:
+        return []
+    if use_lxml:
+        if isinstance(content, str):
+            content, encoding = content.encode('utf-8'), 'utf-8'
+        parser = lxml_etree.HTMLParser(target=_LxmlAnchorTarget(), encoding=page_charset(content, encoding))
+        return lxml_etree.fromstring(content, parser)
+    parser = AnchorExtractor()
+    parser.feed(_decode(content, encoding))
+    parser.close()
+    return parser.anchors
+
+
+def filter_job_links(anchors, base_url, keyword_hint="machine learning"):
+    """Applies the job-link heuristic to (href, text) pairs and returns absolute, de-duplicated URLs."""
+    keyword_regex = compile_keyword_hint(keyword_hint)
+    job_links = []
+    seen = set()
+    for href, text in anchors:
+        if not JOB_HREF_PATTERN.search(href):
+            continue
+        if keyword_regex is not None and not keyword_regex.search(text.lower()):
+            continue
+        full_url = urllib.parse.urljoin(base_url, href)
+        if full_url not in seen:
+            seen.add(full_url)
+            job_links.append(full_url)
+    return job_links
+
+
+def extract_job_links(content, base_url, keyword_hint="machine learning", use_lxml=None, encoding=None):
+    """Fast replacement for the BeautifulSoup anchor loop; returns links in document order."""
+    return filter_job_links(iter_anchors(content, use_lxml, encoding), base_url, keyword_hint)
+
+
+def extract_job_links_soup(content, base_url, keyword_hint="machine learning"):
+    """
+    The original BeautifulSoup implementation (with urljoin), kept as a reference
+    for benchmarks and to check that extract_job_links returns the same links.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    job_links = []
+    for a_tag in soup.find_all('a', href=True):
+        href = a_tag['href']
+        link_text_lower = a_tag.get_text(separator=" ", strip=True).lower()
+        hint_parts = keyword_hint.lower().split(" ")
+
+        is_relevant_by_text = True
+        if keyword_hint:
+            is_relevant_by_text = any(part in link_text_lower for part in hint_parts if len(part) > 2)
+
+        if is_relevant_by_text and ('job' in href or 'career' in href or 'position' in href or 'opening' in href):
+            full_url = urllib.parse.urljoin(base_url, href)
+            if full_url not in job_links:
+                job_links.append(full_url)
+    return job_links
+
+
+def generate_listing_page(num_postings=2000, seed=0):
+    """Builds a synthetic Workday/Greenhouse-style listing page for benchmarks."""
+    import random
+
+    rng = random.Random(seed)
+    titles = ["Machine Learning Engineer", "Software Engineer", "Data Scientist",
+              "Senior ML Researcher", "Product Manager", "Learning Platform Engineer"]
+    rows = ['<html><head><title>Careers</title></head><body><nav>'
+            '<a href="/about">About</a><a href="/careers">Careers</a></nav><ul class="jobs">']
+    for i in range(num_postings):
+        title = rng.choice(titles)
+        href = rng.choice([f"/jobs/{i}", f"jobs/{i}?src=list", f"https://boards.example.com/positions/{i}",
+                           f"/team/{i}"])
+        rows.append(f'<li class="job-row"><div><a href="{href}"><span>{title}</span> '
+                    f'<em>&amp; Team {i % 17}</em></a></div><p>Location: Remote</p></li>')
+    rows.append('</ul></body></html>')
+    return "".join(rows).encode('utf-8')
+
+
+if __name__ == '__main__':
+    # Benchmark: streaming extractor vs. the BeautifulSoup loop on a large listing page.
+    import timeit
+
+    page = generate_listing_page(5000)
+    base = "https://careers.example.com/en/search?q=ml"
+
+    soup_links = extract_job_links_soup(page, base)
+    runs = 5
+    soup_time = timeit.timeit(lambda: extract_job_links_soup(page, base), number=runs) / runs
+    print(f"Page: {len(page) / 1024:.0f} KiB, {len(soup_links)} matching links")
+    print(f"BeautifulSoup loop: {soup_time * 1000:.1f} ms")
+
+    variants = [("HTMLParser", False)]
+    if lxml_etree is not None:
+        variants.append(("lxml", True))
+    for label, use_lxml in variants:
+        assert extract_job_links(page, base, use_lxml=use_lxml) == soup_links, f"{label} extractor disagrees"
+        fast_time = timeit.timeit(lambda: extract_job_links(page, base, use_lxml=use_lxml), number=runs) / runs
+        print(f"Streaming extractor ({label}): {fast_time * 1000:.1f} ms ({soup_time / fast_time:.1f}x faster)")
@@ -0,0 +1,161 @@
+import collections
+import json
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = '.page_cache.sqlite3'
+
+from link_extractor import header_charset
+
+CacheEntry = collections.namedtuple('CacheEntry', ['url', 'etag', 'last_modified', 'body', 'extra', 'charset'])
+
+
+class PageCache:
+    """
+    On-disk HTTP cache for career pages, keyed by URL.
+
+    Stores the body together with ETag/Last-Modified so later fetches can be made
+    conditional, the Content-Type charset it was served with, plus an optional `extra`
+    JSON blob (e.g. the links parsed from the body) so a 304 can skip parsing as well as
+    the download. Entries are evicted least-recently-used first once the cache grows past
+    max_bytes or max_entries.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=256 * 1024 * 1024, max_entries=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                extra TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                charset TEXT
+            )
+        """)
+        if 'charset' not in {row[1] for row in self.conn.execute("PRAGMA table_info(pages)")}:
+            self.conn.execute("ALTER TABLE pages ADD COLUMN charset TEXT") # Caches written before it was kept
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access)")
+        self.conn.commit()
+        self.stats = collections.Counter(hits=0, misses=0, not_modified=0, evictions=0)
+
+    def record(self, key, count=1):
+        """Thread-safe increment of one of the hit/miss counters in self.stats."""
+        with self.lock:
+            self.stats[key] += count
+
+    def lookup(self, url):
+        """Returns the CacheEntry for url, or None. Does not count as a hit or miss."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, etag, last_modified, body, extra, charset FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        extra = json.loads(row[4]) if row[4] else None
+        return CacheEntry(row[0], row[1], row[2], row[3], extra, row[5])
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Builds If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None, extra=None, charset=None):
+        """Inserts or replaces the entry for url, then evicts if the cache is over budget."""
+        extra_json = json.dumps(extra) if extra is not None else None
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, body, extra, size, last_access, charset) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, extra_json, len(body), time.time(), charset)
+            )
+            self._evict_locked()
+            self.conn.commit()
+
+    def set_extra(self, url, extra):
+        """Attaches caller data (such as parsed links) to an existing entry."""
+        with self.lock:
+            self.conn.execute("UPDATE pages SET extra = ? WHERE url = ?", (json.dumps(extra), url))
+            self.conn.commit()
+
+    def touch(self, url):
+        """Marks url as recently used (called on a 304)."""
+        with self.lock:
+            self.conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def _evict_locked(self):
+        total_bytes, total_entries = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM pages"
+        ).fetchone()
+        if total_bytes <= self.max_bytes and (self.max_entries is None or total_entries <= self.max_entries):
+            return
+        cursor = self.conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC")
+        victims = []
+        for url, size in cursor:
+            if total_bytes <= self.max_bytes and (self.max_entries is None or total_entries <= self.max_entries):
+                break
+            victims.append((url,))
+            total_bytes -= size
+            total_entries -= 1
+        self.conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+        self.stats['evictions'] += len(victims)
+
+    def size(self):
+        """Returns (total_bytes, entry_count) currently stored."""
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM pages").fetchone()
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def fetch_with_cache(fetcher, cache, url, timeout=15):
+    """
+    Conditional GET through the cache. Returns (body, charset, entry, not_modified), with
+    charset from the Content-Type header (see fetch_job_page).
+
+    On a 304 the cached body and charset are returned with not_modified=True and `entry` carries any
+    extra data stored earlier, so the caller can skip re-parsing. On a 200 the new body is
+    cached and entry is None. HTTP errors are raised like fetch_job_page does.
+    """
+    entry = cache.lookup(url)
+    response = fetcher.get(url, timeout=timeout, headers=PageCache.conditional_headers(entry))
+    if response.status_code == 304 and entry is not None:
+        cache.touch(url)
+        cache.record('hits')
+        cache.record('not_modified')
+        return entry.body, entry.charset, entry, True
+
+    response.raise_for_status()
+    cache.record('misses')
+    charset = header_charset(response.headers.get('Content-Type'))
+    cache.store(
+        url,
+        response.content,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        charset=charset,
+    )
+    return response.content, charset, None, False
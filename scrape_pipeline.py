@@ -0,0 +1,225 @@
+import concurrent.futures
+import functools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from crawl_state import state_path_for
+import job_scraper
+import link_extractor
+from scraper_http import HttpFetcher
+from sitemaps import SitemapState
+
+_DONE = object() # End-of-stream marker passed down the stage queues
+
+
+def download_page(company_name, url, keyword_hint="machine learning", timeout=15, fetcher=None, sitemap_state=None):
+    """
+    I/O stage: downloads one career page, or reads its ATS JSON API or (with a
+    sitemaps.SitemapState) its sitemap/job feed; those results need no parsing.
+    Never raises; errors are reported in the result.
+    """
+    started = time.monotonic()
+    item = {'Company': company_name, 'URL': url, 'source': 'html', 'links': [], 'postings': None,
+            'error': None, 'content': None, 'charset': None, 'bytes': 0, 'fetch_time': 0.0, 'parse_time': 0.0}
+    try:
+        ats_result = job_scraper.fetch_ats_postings(url, keyword_hint, fetcher, timeout)
+        found = None
+        if ats_result is None and sitemap_state is not None:
+            found = job_scraper.fetch_sitemap_postings(url, keyword_hint, fetcher, sitemap_state, timeout)
+        if ats_result is not None:
+            item['source'], item['postings'] = ats_result
+            item['links'] = [posting['url'] for posting in item['postings']]
+        elif found is not None:
+            item['source'], item['postings'] = found['source'], found['postings']
+            item['links'] = [posting['url'] for posting in item['postings']]
+            item['changed_links'], item['unchanged'] = found['changed_links'], found['unchanged']
+            item['bytes'] = found['bytes']
+        else:
+            item['content'], item['charset'] = job_scraper.fetch_job_page(url, timeout=timeout, fetcher=fetcher)
+            item['bytes'] = len(item['content'])
+    except Exception as e:
+        item['error'] = str(e)
+    item['fetch_time'] = time.monotonic() - started
+    return item
+
+
+def parse_page(content, base_url, keyword_hint="machine learning", encoding=None):
+    """CPU stage, run in a worker process: returns (links, parse_seconds). encoding is the HTTP charset."""
+    started = time.perf_counter()
+    links = link_extractor.extract_job_links(content, base_url, keyword_hint, encoding=encoding)
+    return links, time.perf_counter() - started
+
+
+class ScrapePipeline:
+    """
+    Three-stage crawl: a thread pool downloads pages, a process pool parses them and a
+    writer thread streams results to a JSON lines file as they complete.
+
+    Stages are connected by bounded queues and the number of pages being parsed is capped,
+    so when parsing or writing falls behind the downloaders simply stop being scheduled.
+    At most about queue_size + fetch_workers + 2 * parse_workers pages are held in memory
+    regardless of how many companies are crawled. parse_workers=0 parses in the calling
+    thread instead (useful as a single-process baseline).
+    """
+
+    def __init__(self, keyword_hint="machine learning", fetch_workers=16, parse_workers=None, max_per_host=2,
+                 queue_size=None, timeout=15, fetcher=None, stage_stats=None, sitemap_state=None):
+        self.keyword_hint = keyword_hint
+        self.fetch_workers = fetch_workers
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.max_per_host = max_per_host
+        self.queue_size = queue_size or max(self.fetch_workers, 2 * self.parse_workers)
+        self.timeout = timeout
+        self.fetcher = fetcher or HttpFetcher(pool_size=fetch_workers)
+        self.stage_stats = stage_stats # Optional StageStats fed with every page
+        self.sitemap_state = sitemap_state # Optional sitemaps.SitemapState, see download_page
+        self.stats = {'pages': 0, 'parsed': 0, 'failed': 0, 'links': 0, 'bytes': 0,
+                      'fetch_time': 0.0, 'parse_time': 0.0, 'elapsed': 0.0}
+
+    def _fetch_stage(self, companies, downloaded, errors, stop):
+        download = functools.partial(download_page, keyword_hint=self.keyword_hint, timeout=self.timeout,
+                                     fetcher=self.fetcher, sitemap_state=self.sitemap_state)
+        try:
+            for item in job_scraper.run_per_host(companies, download, self.fetch_workers, self.max_per_host,
+                                                 stop=stop):
+                if stop.is_set():
+                    break # The run was aborted; only let the downloads already running finish
+                downloaded.put(item) # Blocks while the parse stage is behind
+        except Exception as e:
+            errors.append(e)
+        finally:
+            downloaded.put(_DONE)
+
+    def _write_stage(self, output_path, finished, errors):
+        try:
+            with open(output_path, mode='w', encoding='utf-8') as file:
+                while True:
+                    item = finished.get()
+                    if item is _DONE:
+                        break
+                    file.write(json.dumps(item) + "\n")
+                    if finished.empty():
+                        file.flush()
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so the parse stage never blocks on a dead writer.
+            while finished.get() is not _DONE:
+                pass
+
+    def _record(self, item):
+        stats = self.stats
+        stats['pages'] += 1
+        stats['bytes'] += item['bytes']
+        stats['fetch_time'] += item['fetch_time']
+        stats['parse_time'] += item['parse_time']
+        if item['error']:
+            stats['failed'] += 1
+        stats['links'] += len(item['links'])
+        if self.stage_stats is not None:
+            job_scraper.record_crawl_stats(self.stage_stats, item)
+
+    def run(self, companies, output_path):
+        """
+        Crawls (company_name, url) pairs and writes one JSON object per company to
+        output_path. Returns the stats dict (pages, parsed, failed, links, bytes, summed
+        fetch/parse seconds and wall-clock elapsed).
+        """
+        started = time.monotonic()
+        downloaded = queue.Queue(maxsize=self.queue_size)
+        finished = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        stop = threading.Event()
+        pool = concurrent.futures.ProcessPoolExecutor(self.parse_workers) if self.parse_workers else None
+        fetch_thread = threading.Thread(target=self._fetch_stage, args=(companies, downloaded, errors, stop),
+                                        daemon=True)
+        write_thread = threading.Thread(target=self._write_stage, args=(output_path, finished, errors), daemon=True)
+        fetch_thread.start()
+        write_thread.start()
+
+        def emit(item):
+            item.pop('content', None)
+            item.pop('charset', None)
+            self._record(item)
+            finished.put(item) # Blocks while the writer is behind
+
+        in_flight = {}
+        max_in_flight = 2 * self.parse_workers
+
+        def collect(block):
+            done, _ = concurrent.futures.wait(in_flight, timeout=None if block else 0,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                try:
+                    item['links'], item['parse_time'] = future.result()
+                    self.stats['parsed'] += 1
+                except Exception as e:
+                    item['error'] = f"parse failed: {e}"
+                emit(item)
+
+        item = None
+        try:
+            while True:
+                try:
+                    item = downloaded.get(timeout=0.05 if in_flight else None)
+                except queue.Empty:
+                    collect(block=False)
+                    continue
+                if item is _DONE:
+                    break
+                if item['content'] is None:
+                    emit(item)
+                elif pool is None:
+                    item['links'], item['parse_time'] = parse_page(item['content'], item['URL'], self.keyword_hint,
+                                                                   item['charset'])
+                    self.stats['parsed'] += 1
+                    emit(item)
+                else:
+                    while len(in_flight) >= max_in_flight:
+                        collect(block=True)
+                    future = pool.submit(parse_page, item['content'], item['URL'], self.keyword_hint, item['charset'])
+                    item['content'] = None # The worker has its own copy now
+                    in_flight[future] = item
+                if in_flight:
+                    collect(block=False)
+            while in_flight:
+                collect(block=True)
+        finally:
+            stop.set() # On an early exit no further companies are fetched
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            finished.put(_DONE)
+            # Unblock the fetch stage so its thread can finish the downloads already running.
+            while item is not _DONE:
+                item = downloaded.get()
+            fetch_thread.join()
+            write_thread.join()
+        if errors:
+            raise errors[0]
+        self.stats['elapsed'] = time.monotonic() - started
+        return self.stats
+
+
+def run_pipeline(companies, output_path, keyword_hint="machine learning", fetch_workers=16, parse_workers=None,
+                 max_per_host=2, fetcher=None, sitemap_state=None):
+    """Convenience wrapper around ScrapePipeline(...).run(companies, output_path)."""
+    pipeline = ScrapePipeline(keyword_hint, fetch_workers, parse_workers, max_per_host, fetcher=fetcher,
+                              sitemap_state=sitemap_state)
+    return pipeline.run(companies, output_path)
+
+
+if __name__ == '__main__':
+    input_csv = 'company_career_urls_output.csv'
+    output_jsonl = sys.argv[1] if len(sys.argv) > 1 else 'crawl_results.jsonl'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    companies = job_scraper.read_company_urls(input_csv)
+    print(f"Crawling {len(companies)} career pages into '{output_jsonl}'...")
+    sitemap_state = SitemapState(state_path_for(input_csv))
+    stats = run_pipeline(companies, output_jsonl, parse_workers=workers, sitemap_state=sitemap_state)
+    sitemap_state.close()
+    print(f"Done in {stats['elapsed']:.1f}s: {stats['pages']} pages ({stats['bytes'] / 1e6:.1f} MB), "
+          f"{stats['links']} links, {stats['failed']} failed.")
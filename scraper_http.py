@@ -0,0 +1,194 @@
+import email.utils
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Connection": "keep-alive",
+    "DNT": "1", # Do Not Track
+    "Upgrade-Insecure-Requests": "1"
+}
+
+# Status codes that are worth retrying; anything else is returned to the caller as-is.
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.updated:
+                    wait = self.updated - now # Paused by pause_until()
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause_until(self, until):
+        """
+        Holds back all tokens until the monotonic time `until`, then allows a single request.
+        A pause that already lasts longer is left as it is.
+        """
+        with self.lock:
+            if until <= self.updated:
+                return
+            self.tokens = 1.0
+            self.updated = until
+
+
+class HostRateLimiter:
+    """
+    Keeps one TokenBucket per netloc so every host gets its own request budget.
+    host_rates optionally maps netloc -> (requests_per_second, burst) for hosts that
+    get a budget other than the default (e.g. job board hosts shared by every company).
+    """
+
+    def __init__(self, requests_per_second=2.0, burst=4, host_rates=None):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urllib.parse.urlparse(url).netloc.lower()
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(*self.host_rates.get(host, (self.requests_per_second, self.burst)))
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        self.bucket_for(url).acquire()
+
+
+def build_session(pool_size=32, headers=None):
+    """Creates a requests.Session with a keep-alive connection pool sized for concurrent crawls."""
+    session = requests.Session()
+    # Retries are handled by HttpFetcher so they can honor Retry-After and the rate limiter.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+def parse_retry_after(value):
+    """Returns the Retry-After header value in seconds, or None if missing/unparseable."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class HttpFetcher:
+    """
+    Shared fetch layer for the scraper: pooled session, per-host rate limiting and
+    exponential backoff (with jitter) that honors Retry-After on 429/503 responses.
+    """
+
+    def __init__(self, pool_size=32, requests_per_second=2.0, burst=4, max_retries=3,
+                 backoff_base=0.5, max_backoff=30.0, session=None, host_rates=None):
+        self.session = session or build_session(pool_size)
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst, host_rates)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+    def _backoff_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+    def get(self, url, timeout=15, headers=None, stream=False):
+        """
+        GETs url and returns the final response. Retryable statuses are retried up to
+        max_retries times; the last response is returned so callers can raise_for_status().
+        Network errors are re-raised after the final attempt. With stream=True the body is
+        left unread for iter_content(); close the response when done.
+        """
+        return self.request("GET", url, timeout=timeout, headers=headers, stream=stream)
+
+    def post_json(self, url, payload, timeout=15, headers=None):
+        """POSTs a JSON body (e.g. to an ATS search API) with the same rate limiting and retries as get()."""
+        return self.request("POST", url, timeout=timeout, headers=headers, json=payload)
+
+    def request(self, method, url, timeout=15, headers=None, json=None, stream=False):
+        """Sends one request through the rate limiter, retrying as described in get()."""
+        attempt = 0
+        while True:
+            bucket = self.rate_limiter.bucket_for(url)
+            bucket.acquire()
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=timeout, json=json,
+                                                stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+                return response
+
+            delay = self._backoff_delay(attempt, response)
+            # Back off the whole host, not just this request, so sibling workers don't hammer it.
+            # The next acquire() on this bucket sleeps out the delay.
+            bucket.pause_until(time.monotonic() + delay)
+            response.close()
+            attempt += 1
+
+    def close(self):
+        self.session.close()
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_default_fetcher():
+    """Returns the process-wide HttpFetcher, creating it on first use."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = HttpFetcher()
+        return _default_fetcher
@@ -0,0 +1,208 @@
+import csv
+import os
+import re
+
+from tracker_store import ApplicationStore, DEFAULT_DB_PATH
+
+APPLICATION = 'application'
+COMPANY = 'company'
+POSTING = 'posting'
+
+# Prefix indexes make "mach*" style queries index lookups instead of full-vocabulary scans.
+FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'"
+
+SCHEMA = f"""
+    -- Full-text index over the tracker's applications table, kept in sync by triggers so rows
+    -- written by the web frontend are indexed too.
+    CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+        company_name, job_title, location, notes,
+        content = 'applications', content_rowid = 'id', {FTS_OPTIONS}
+    );
+    CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+        INSERT INTO applications_fts (rowid, company_name, job_title, location, notes)
+        VALUES (new.id, new.company_name, new.job_title, new.location, new.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+        INSERT INTO applications_fts (applications_fts, rowid, company_name, job_title, location, notes)
+        VALUES ('delete', old.id, old.company_name, old.job_title, old.location, old.notes);
+    END;
+    CREATE TRIGGER IF NOT EXISTS applications_fts_update
+    AFTER UPDATE OF company_name, job_title, location, notes ON applications BEGIN
+        INSERT INTO applications_fts (applications_fts, rowid, company_name, job_title, location, notes)
+        VALUES ('delete', old.id, old.company_name, old.job_title, old.location, old.notes);
+        INSERT INTO applications_fts (rowid, company_name, job_title, location, notes)
+        VALUES (new.id, new.company_name, new.job_title, new.location, new.notes);
+    END;
+
+    -- Companies from HiringTechCompanies - TheList.csv and scraped job postings.
+    CREATE TABLE IF NOT EXISTS search_documents (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        doc_key TEXT NOT NULL,
+        title TEXT,
+        body TEXT,
+        UNIQUE (kind, doc_key)
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(
+        title, body, content = 'search_documents', content_rowid = 'id', {FTS_OPTIONS}
+    );
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_insert AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_delete AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_documents_fts (search_documents_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END;
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_update AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_documents_fts (search_documents_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+    END;
+
+    CREATE TABLE IF NOT EXISTS search_sources (
+        path TEXT PRIMARY KEY,
+        mtime REAL NOT NULL,
+        size INTEGER NOT NULL
+    );
+"""
+
+UPSERT_DOCUMENT = """
+    INSERT INTO search_documents (kind, doc_key, title, body) VALUES (?, ?, ?, ?)
+    ON CONFLICT(kind, doc_key) DO UPDATE SET title = excluded.title, body = excluded.body
+    WHERE title IS NOT excluded.title OR body IS NOT excluded.body
+"""
+
+COMPANY_COLUMNS = ['City', 'Region', 'Industry', 'Product(s) /Keywords']
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text, prefix=True):
+    """
+    Turns free text into an FTS5 MATCH expression: every word must match, and with
+    prefix=True each word also matches longer words ("mach lear" finds "Machine Learning").
+    Returns None if the text has no searchable words.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' if prefix else f'"{token}"' for token in tokens)
+
+
+class SearchIndex:
+    """
+    Persistent inverted index (SQLite FTS5) over tracked applications, companies and scraped
+    postings. Lives in the tracker database, so it is built once and then maintained
+    incrementally: application rows via triggers, companies and postings via upserts.
+    """
+
+    def __init__(self, store=None, path=DEFAULT_DB_PATH):
+        self.store = store or ApplicationStore(path)
+        self.conn = self.store.conn
+        needs_rebuild = not self._table_exists('applications_fts')
+        self.conn.executescript(SCHEMA)
+        if needs_rebuild:
+            # First run against an existing database: index the rows already there.
+            self.conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('rebuild')")
+        self.conn.commit()
+
+    def _table_exists(self, name):
+        return self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+    # --- Indexing -----------------------------------------------------------
+
+    def upsert_document(self, kind, doc_key, title, body=""):
+        self.conn.execute(UPSERT_DOCUMENT, (kind, doc_key, title, body))
+
+    def remove_document(self, kind, doc_key):
+        self.conn.execute("DELETE FROM search_documents WHERE kind = ? AND doc_key = ?", (kind, doc_key))
+
+    def index_companies(self, filepath, force=False):
+        """
+        Indexes HiringTechCompanies - TheList.csv (Company plus City, Region, Industry and
+        Product(s)/Keywords). Skipped when the file is unchanged since the last run.
+        Returns the number of companies indexed.
+        """
+        stat = os.stat(filepath)
+        source = os.path.abspath(filepath)
+        known = self.conn.execute("SELECT mtime, size FROM search_sources WHERE path = ?", (source,)).fetchone()
+        if not force and known == (stat.st_mtime, stat.st_size):
+            return 0
+
+        count = 0
+        with self.store.batch():
+            with open(filepath, mode='r', encoding='utf-8', newline='') as file:
+                reader = csv.reader(file)
+                next(reader, None) # Skip metadata line
+                header = next(reader, [])
+                if 'Company' not in header:
+                    print(f"Error: 'Company' column not found in header of '{filepath}': {header}")
+                    return 0
+                company_idx = header.index('Company')
+                column_idx = [header.index(column) for column in COMPANY_COLUMNS if column in header]
+                for row in reader:
+                    if len(row) <= company_idx or not row[company_idx].strip():
+                        continue
+                    company_name = row[company_idx].strip()
+                    body = " | ".join(row[i].strip() for i in column_idx if i < len(row) and row[i].strip())
+                    self.upsert_document(COMPANY, company_name, company_name, body)
+                    count += 1
+            self.conn.execute("INSERT OR REPLACE INTO search_sources (path, mtime, size) VALUES (?, ?, ?)",
+                              (source, stat.st_mtime, stat.st_size))
+        return count
+
+    def index_crawl_result(self, result):
+        """Indexes the postings (or bare links) from one crawl_career_pages() result."""
+        with self.store.batch():
+            if result.get('postings'):
+                for posting in result['postings']:
+                    body = " | ".join(part for part in (result['Company'], posting['location']) if part)
+                    self.upsert_document(POSTING, posting['url'], posting['title'] or posting['url'], body)
+            else:
+                for link in result.get('links', []):
+                    self.upsert_document(POSTING, link, link, result['Company'])
+
+    # --- Querying -----------------------------------------------------------
+
+    def search(self, text, kinds=None, limit=20, prefix=True):
+        """
+        Searches applications, companies and postings. Returns dicts with 'kind', 'key'
+        (application id, company name or posting URL), 'title', 'snippet' and 'rank'
+        (lower is better), best matches first.
+        """
+        match = build_match_query(text, prefix)
+        if match is None:
+            return []
+        kinds = set(kinds or (APPLICATION, COMPANY, POSTING))
+        results = []
+        if APPLICATION in kinds:
+            rows = self.conn.execute("""
+                SELECT a.id, a.company_name, a.job_title, a.status,
+                       snippet(applications_fts, -1, '[', ']', '...', 8), rank
+                FROM applications_fts JOIN applications a ON a.id = applications_fts.rowid
+                WHERE applications_fts MATCH ?
+                ORDER BY rank LIMIT ?
+            """, (match, limit))
+            for app_id, company_name, job_title, status, snippet, rank in rows:
+                results.append({'kind': APPLICATION, 'key': app_id, 'title': f"{job_title} at {company_name} ({status})",
+                                'snippet': snippet, 'rank': rank})
+        document_kinds = sorted(kinds & {COMPANY, POSTING})
+        if document_kinds:
+            placeholders = ", ".join("?" for _ in document_kinds)
+            rows = self.conn.execute(f"""
+                SELECT d.kind, d.doc_key, d.title,
+                       snippet(search_documents_fts, -1, '[', ']', '...', 8), rank
+                FROM search_documents_fts JOIN search_documents d ON d.id = search_documents_fts.rowid
+                WHERE search_documents_fts MATCH ? AND d.kind IN ({placeholders})
+                ORDER BY rank LIMIT ?
+            """, (match, *document_kinds, limit))
+            for kind, doc_key, title, snippet, rank in rows:
+                results.append({'kind': kind, 'key': doc_key, 'title': title, 'snippet': snippet, 'rank': rank})
+        results.sort(key=lambda result: result['rank'])
+        return results[:limit]
+
+    def optimize(self):
+        """Merges FTS5 index segments; worth running after large bulk loads."""
+        self.conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('optimize')")
+        self.conn.execute("INSERT INTO search_documents_fts (search_documents_fts) VALUES ('optimize')")
+        self.conn.commit()
@@ -0,0 +1,539 @@
+import collections
+import functools
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zlib
+
+import ats_adapters
+from crawl_state import DAY
+import link_extractor
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError: # lxml is optional; xml.etree's pull parser is used instead
+    lxml_etree = None
+
+# Tried in order for a careers page without a known feed: files next to the careers page,
+# then the Sitemap: lines of the host's robots.txt, then the usual site-wide locations.
+RELATIVE_CANDIDATES = ('sitemap.xml', 'feed')
+ROOT_CANDIDATES = ('/sitemap.xml', '/sitemap_index.xml')
+
+CHUNK_SIZE = 64 * 1024
+MAX_FILE_BYTES = 50 * 1024 * 1024 # The sitemaps.org limit for one (uncompressed) file
+MAX_FILES = 20 # Per careers page, sitemap index children included
+
+SITEMAP = 'sitemap'
+SITEMAP_INDEX = 'sitemapindex'
+RSS = 'rss'
+ATOM = 'atom'
+JSON_FEED = 'json'
+
+# Root element -> document format, and the element holding one record in that format.
+ROOT_FORMATS = {'urlset': SITEMAP, 'sitemapindex': SITEMAP_INDEX, 'rss': RSS, 'RDF': RSS, 'feed': ATOM}
+RECORD_TAGS = {SITEMAP: 'url', SITEMAP_INDEX: 'sitemap', RSS: 'item', ATOM: 'entry'}
+LASTMOD_FIELDS = ('lastmod', 'updated', 'modified', 'date_modified', 'pubDate', 'date', 'published',
+                  'date_published')
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ROOT_ELEMENT = re.compile(rb'<(?![?!])([^\s/>]+)') # First tag that isn't <?xml ...?>, <!DOCTYPE> or a comment
+
+FeedEntry = collections.namedtuple('FeedEntry', ['format', 'url', 'lastmod', 'title'])
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS feed_sources (
+        careers_url TEXT PRIMARY KEY,
+        feed_url TEXT NOT NULL,
+        checked_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS feed_files (
+        url TEXT PRIMARY KEY,
+        format TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS feed_entries (
+        feed_url TEXT NOT NULL,
+        url TEXT NOT NULL,
+        format TEXT NOT NULL,
+        lastmod TEXT NOT NULL,
+        title TEXT NOT NULL,
+        read_at REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (feed_url, url)
+    );
+"""
+WRITE_BATCH = 500 # Entries written (and diffed against the previous read) per transaction
+
+
+class NotAFeed(ValueError):
+    """The document is not a sitemap, sitemap index, RSS/Atom feed or JSON Feed."""
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def decoded_chunks(chunks, max_bytes=MAX_FILE_BYTES):
+    """
+    Passes body chunks through, gunzipping them on the fly when the body is a gzip file
+    (sitemap.xml.gz), and raises ValueError once more than max_bytes have come out.
+    """
+    decompressor = None
+    total = 0
+    for i, chunk in enumerate(chunk for chunk in chunks if chunk):
+        if i == 0 and chunk[:2] == _GZIP_MAGIC:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        pieces = [chunk]
+        if decompressor is not None:
+            pieces = []
+            while chunk: # Bounded steps, so a gzip bomb can't inflate one chunk into gigabytes
+                pieces.append(decompressor.decompress(chunk, CHUNK_SIZE))
+                chunk = decompressor.unconsumed_tail
+        for piece in pieces:
+            total += len(piece)
+            if total > max_bytes:
+                raise ValueError(f"document is larger than {max_bytes} bytes")
+            if piece:
+                yield piece
+
+
+def _record(doc_format, element):
+    fields = {}
+    for child in element:
+        if not isinstance(child.tag, str): # lxml hands over comments and processing instructions too
+            continue
+        name = _local_name(child.tag)
+        if name == 'link' and child.get('href'): # Atom: <link rel="alternate" href="..."/>
+            if child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', child.get('href').strip())
+        elif name not in fields and child.text and child.text.strip():
+            fields[name] = child.text.strip()
+    url = fields.get('loc') or fields.get('link') or ''
+    if not url and fields.get('guid', '').startswith('http'):
+        url = fields['guid']
+    lastmod = next((fields[name] for name in LASTMOD_FIELDS if name in fields), '')
+    return FeedEntry(doc_format, url, lastmod, fields.get('title', '')) if url else None
+
+
+def _iter_xml_entries(doc_format, chunks, use_lxml):
+    record_tag = RECORD_TAGS[doc_format]
+    if use_lxml:
+        # Only the record elements' end events reach Python; everything else stays in C.
+        parser = lxml_etree.XMLPullParser(events=('end',), tag='{*}' + record_tag, resolve_entities=False,
+                                          no_network=True)
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                entry = _record(doc_format, element)
+                if entry is not None:
+                    yield entry
+                element.clear() # Drop parsed records (and the empty shells before them) so memory stays flat
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        parser.close()
+        return
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    open_elements = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'start':
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            if _local_name(element.tag) == record_tag:
+                entry = _record(doc_format, element)
+                if entry is not None:
+                    yield entry
+                if open_elements:
+                    open_elements[-1].remove(element) # Drop parsed records so memory stays flat
+    parser.close()
+
+
+def _iter_json_entries(chunks):
+    # JSON Feeds are small in practice, so the document is parsed whole (decoded_chunks caps its size).
+    try:
+        document = json.loads(b"".join(chunks))
+    except ValueError as e:
+        raise NotAFeed(f"not JSON: {e}")
+    if not isinstance(document, dict) or not isinstance(document.get('items'), list):
+        raise NotAFeed("JSON document without an 'items' list")
+    for item in document['items']:
+        url = (item.get('url') or item.get('external_url')) if isinstance(item, dict) else None
+        if url:
+            lastmod = next((item[name] for name in LASTMOD_FIELDS if item.get(name)), '')
+            yield FeedEntry(JSON_FEED, url, lastmod, (item.get('title') or '').strip())
+
+
+def iter_feed_entries(chunks, use_lxml=None):
+    """
+    Incrementally parses a sitemap, sitemap index, RSS or Atom feed (or a JSON Feed) from
+    byte chunks and yields a FeedEntry per record. Entries of a sitemap index have format
+    'sitemapindex' and point at child sitemaps. XML records are discarded as soon as they
+    have been read, so memory stays flat however long the file is. Uses lxml when it is
+    installed (use_lxml=None) unless told otherwise.
+    Raises NotAFeed if the body is something else (e.g. an HTML page served for any path).
+    """
+    if use_lxml is None:
+        use_lxml = lxml_etree is not None
+    chunks = iter(chunks)
+    head = b''
+    root = None
+    for chunk in chunks: # Buffer until the root element's name is complete (or clearly isn't coming)
+        head += chunk
+        if head.lstrip(b'\xef\xbb\xbf \t\r\n')[:1] == b'{':
+            return _iter_json_entries(itertools.chain([head], chunks))
+        root = _ROOT_ELEMENT.search(head)
+        if (root is not None and root.end() < len(head)) or len(head) > CHUNK_SIZE:
+            break
+    if root is None:
+        raise NotAFeed("no XML root element at the start of the document")
+    root_name = root.group(1).decode('ascii', errors='replace').rsplit(':', 1)[-1]
+    if root_name not in ROOT_FORMATS:
+        raise NotAFeed(f"unexpected root element <{root_name}>")
+    return _iter_xml_entries(ROOT_FORMATS[root_name], itertools.chain([head], chunks), use_lxml)
+
+
+def robots_sitemaps(careers_url, fetcher, timeout=15):
+    """The Sitemap: URLs listed in the robots.txt of the careers page's host (empty on any error)."""
+    parsed = urllib.parse.urlparse(careers_url)
+    try:
+        response = fetcher.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt", timeout=timeout)
+    except Exception:
+        return []
+    if response.status_code != 200:
+        return []
+    return [line.split(':', 1)[1].strip() for line in response.text.splitlines()
+            if line.lower().startswith('sitemap:') and line.split(':', 1)[1].strip()]
+
+
+def candidate_feed_urls(careers_url, fetcher, timeout=15):
+    """Yields the URLs worth trying for a careers page's sitemap or feed, without duplicates."""
+    parsed = urllib.parse.urlparse(careers_url)
+    base = urllib.parse.urlunparse((parsed.scheme, parsed.netloc, parsed.path.rstrip('/') + '/', '', '', ''))
+    seen = set()
+
+    def candidates():
+        yield from (urllib.parse.urljoin(base, path) for path in RELATIVE_CANDIDATES)
+        yield from robots_sitemaps(careers_url, fetcher, timeout) # Only fetched if the above didn't pan out
+        yield from (urllib.parse.urljoin(base, path) for path in ROOT_CANDIDATES)
+
+    for url in candidates():
+        if url not in seen:
+            seen.add(url)
+            yield url
+
+
+def _url_path(url):
+    # urlparse() is the slowest step per entry and only the path is needed here.
+    rest = url.split('//', 1)[-1]
+    slash = rest.find('/')
+    return rest[slash:].split('?', 1)[0].split('#', 1)[0] if slash >= 0 else ''
+
+
+@functools.lru_cache(maxsize=256)
+def _careers_prefix(careers_url):
+    path = urllib.parse.urlparse(careers_url).path.rstrip('/').lower()
+    return path + '/' if path else None
+
+
+def looks_like_posting(url, careers_url):
+    """
+    Whether a sitemap URL is probably a job posting: below the careers page's path, or
+    matching the same job/career/position/opening pattern as the HTML heuristic.
+    """
+    if url.rstrip('/') == careers_url.rstrip('/'):
+        return False
+    path = _url_path(url).lower()
+    prefix = _careers_prefix(careers_url)
+    return bool(prefix and path.startswith(prefix)) or bool(link_extractor.JOB_HREF_PATTERN.search(path))
+
+
+def posting_text(entry):
+    """Text the keyword hint is matched against: the feed's title, else the URL's last path segment."""
+    if entry.title:
+        return entry.title.lower()
+    segment = urllib.parse.unquote(_url_path(entry.url).rstrip('/').rsplit('/', 1)[-1])
+    return segment.replace('-', ' ').replace('_', ' ').lower()
+
+
+class SitemapState:
+    """
+    What the sitemap enumeration learned on earlier crawls, kept in the crawl state
+    database: the sitemap or feed found for each careers page (or that there was none),
+    each file's ETag/Last-Modified for conditional requests, and the entries read from
+    it with their lastmod. Thread-safe, so one instance can serve all crawl workers.
+    """
+
+    def __init__(self, path, negative_ttl=7 * DAY):
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        if 'read_at' not in {row[1] for row in self.conn.execute("PRAGMA table_info(feed_entries)")}:
+            self.conn.execute("ALTER TABLE feed_entries ADD COLUMN read_at REAL NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def source_for(self, careers_url, now=None):
+        """
+        The sitemap/feed URL found for a careers page, '' if a search within the last
+        negative_ttl seconds found none, or None if it should be (re)discovered.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT feed_url, checked_at FROM feed_sources WHERE careers_url = ?",
+                                    (careers_url,)).fetchone()
+        if row is None:
+            return None
+        feed_url, checked_at = row
+        if not feed_url and checked_at <= (time.time() if now is None else now) - self.negative_ttl:
+            return None
+        return feed_url
+
+    def record_source(self, careers_url, feed_url, now=None):
+        """Remembers the feed of a careers page; feed_url is '' when it has none."""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO feed_sources (careers_url, feed_url, checked_at) "
+                              "VALUES (?, ?, ?)", (careers_url, feed_url, time.time() if now is None else now))
+            self.conn.commit()
+
+    def forget_source(self, careers_url):
+        with self.lock:
+            self.conn.execute("DELETE FROM feed_sources WHERE careers_url = ?", (careers_url,))
+            self.conn.commit()
+
+    def file_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a file read before, or None if it never was."""
+        with self.lock:
+            row = self.conn.execute("SELECT etag, last_modified FROM feed_files WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def entries(self, url):
+        """Yields the FeedEntries stored for a file, in the order they were read, a batch per query."""
+        last_rowid = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT rowid, format, url, lastmod, title FROM feed_entries WHERE feed_url = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?", (url, last_rowid, WRITE_BATCH)).fetchall()
+            for row in rows:
+                yield FeedEntry(*row[1:])
+            if len(rows) < WRITE_BATCH:
+                return
+            last_rowid = rows[-1][0]
+
+    def store_entries(self, url, entries, read_at):
+        """
+        Writes a batch of entries of a file being read (stamped with the read's read_at)
+        and returns {entry url: lastmod} as stored by the previous read for those entries.
+        """
+        with self.lock:
+            before = dict(self.conn.execute(
+                "SELECT url, lastmod FROM feed_entries WHERE feed_url = ? AND url IN (%s)"
+                % ", ".join("?" * len(entries)), (url, *(entry.url for entry in entries))))
+            self.conn.executemany("INSERT OR REPLACE INTO feed_entries (feed_url, format, url, lastmod, title, read_at) "
+                                  "VALUES (?, ?, ?, ?, ?, ?)", [(url, *entry, read_at) for entry in entries])
+            self.conn.commit()
+        return before
+
+    def finish_file(self, url, doc_format, read_at, etag=None, last_modified=None):
+        """Completes a read started with store_entries: drops entries the file no longer lists."""
+        with self.lock:
+            self.conn.execute("DELETE FROM feed_entries WHERE feed_url = ? AND read_at != ?", (url, read_at))
+            self.conn.execute("INSERT OR REPLACE INTO feed_files (url, format, etag, last_modified, fetched_at) "
+                              "VALUES (?, ?, ?, ?, ?)", (url, doc_format, etag, last_modified, read_at))
+            self.conn.commit()
+
+    def forget_file(self, url):
+        """Drops a file whose read failed part way, so the next read starts from scratch."""
+        with self.lock:
+            self.conn.execute("DELETE FROM feed_files WHERE url = ?", (url,))
+            self.conn.execute("DELETE FROM feed_entries WHERE feed_url = ?", (url,))
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def _read_file(fetcher, state, url, tally, timeout, reuse=False):
+    """
+    Yields (entry, unchanged) for one sitemap or feed while it is read, following sitemap
+    index children once the index itself has been read. Entries are written to state and
+    diffed against the previous read in batches of WRITE_BATCH, so memory does not grow
+    with the file. With reuse=True (the parent index gave the same lastmod as last time)
+    the stored entries are used without a request; a 304 does the same. Entries are
+    unchanged when their lastmod matches the one stored from the previous read.
+    """
+    tally['files'] += 1
+    headers = state.file_headers(url)
+    if reuse and headers is not None:
+        tally['skipped_files'] += 1
+        yield from _expand(fetcher, state, ((entry, True) for entry in state.entries(url)), tally, timeout)
+        return
+    response = fetcher.get(url, timeout=timeout, headers=headers, stream=True)
+    if response.status_code == 304 and headers is not None:
+        response.close()
+        tally['not_modified_files'] += 1
+        yield from _expand(fetcher, state, ((entry, True) for entry in state.entries(url)), tally, timeout)
+        return
+    children = []
+    read_at = None
+    try:
+        response.raise_for_status()
+        read_at = time.time()
+        doc_format = SITEMAP
+        entries = iter_feed_entries(decoded_chunks(_counted(response.iter_content(CHUNK_SIZE), tally)))
+        while True:
+            batch = list(itertools.islice(entries, WRITE_BATCH))
+            if not batch:
+                break
+            doc_format = batch[0].format
+            before = state.store_entries(url, batch, read_at)
+            for entry in batch:
+                unchanged = bool(entry.lastmod) and before.get(entry.url) == entry.lastmod
+                if entry.format == SITEMAP_INDEX:
+                    children.append((entry, unchanged)) # Read once this response is closed
+                else:
+                    yield entry, unchanged
+        state.finish_file(url, doc_format, read_at, response.headers.get('ETag'),
+                          response.headers.get('Last-Modified'))
+    except BaseException: # Also when the consumer stops early: what was stored of the file is partial
+        if read_at is not None:
+            state.forget_file(url)
+        raise
+    finally:
+        response.close()
+    yield from _expand(fetcher, state, children, tally, timeout)
+
+
+def _expand(fetcher, state, pairs, tally, timeout):
+    """
+    Passes (entry, unchanged) pairs through, replacing sitemap index entries with the
+    entries of the sitemaps they point at.
+    """
+    children = []
+    for entry, unchanged in pairs:
+        if entry.format == SITEMAP_INDEX:
+            children.append((entry, unchanged))
+        else:
+            yield entry, unchanged
+    # Site-wide indexes split sitemaps by section; when some are clearly about jobs, read only those.
+    jobs = [(entry, unchanged) for entry, unchanged in children
+            if link_extractor.JOB_HREF_PATTERN.search(entry.url.lower())]
+    for entry, unchanged in jobs or children:
+        if tally['files'] >= tally['max_files']:
+            break
+        yield from _read_file(fetcher, state, entry.url, tally, timeout, reuse=unchanged)
+
+
+def _counted(chunks, tally):
+    for chunk in chunks:
+        tally['bytes'] += len(chunk)
+        yield chunk
+
+
+def enumerate_postings(fetcher, state, careers_url, keyword_hint="machine learning", timeout=15,
+                       max_files=MAX_FILES):
+    """
+    Lists a careers page's postings from its sitemap or RSS/Atom/JSON feed instead of
+    the HTML page. Returns None when the site has none (callers fall back to the HTML
+    heuristic), else a dict with 'source' ('sitemap' or 'feed'), 'feed_url', 'postings'
+    (as from ats_adapters, updated_at = the entry's lastmod) filtered by keyword_hint on
+    the title or URL slug, 'changed_links' (new postings and those whose lastmod moved),
+    'unchanged' (how many did not), 'bytes' read and 'files' ('skipped_files' and
+    'not_modified_files' of them came from state without a download).
+    Feeds are discovered on first use and remembered in state (a SitemapState), as is
+    a failed search for negative_ttl. Network and parse errors on a known feed propagate
+    and make the feed be rediscovered next time.
+    """
+    tally = collections.Counter(max_files=max_files)
+    keyword_regex = link_extractor.compile_keyword_hint(keyword_hint)
+    feed_url = state.source_for(careers_url)
+    if feed_url == '':
+        return None
+    try:
+        if feed_url is not None:
+            result, _ = _collect(_read_file(fetcher, state, feed_url, tally, timeout), careers_url, keyword_regex)
+        else:
+            result = None
+            for candidate in candidate_feed_urls(careers_url, fetcher, timeout):
+                try:
+                    found, job_like = _collect(_read_file(fetcher, state, candidate, tally, timeout), careers_url,
+                                             keyword_regex)
+                except Exception: # 404s, HTML pages, unreadable files: try the next candidate
+                    continue
+                # A site-wide sitemap without anything job-like (e.g. only marketing pages) doesn't count.
+                if job_like:
+                    feed_url, result = candidate, found
+                    break
+            state.record_source(careers_url, feed_url or '')
+            if result is None:
+                return None
+    except Exception:
+        state.forget_source(careers_url)
+        raise
+    result.update(feed_url=feed_url, bytes=tally['bytes'], files=tally['files'],
+                  skipped_files=tally['skipped_files'], not_modified_files=tally['not_modified_files'])
+    return result
+
+
+def _collect(pairs, careers_url, keyword_regex):
+    """
+    Folds (entry, unchanged) pairs into the postings part of enumerate_postings' result as
+    they are read. Also returns whether any entry looked like a posting before the keyword
+    filter.
+    """
+    result = {'source': SITEMAP, 'postings': [], 'changed_links': [], 'unchanged': 0}
+    job_like = False
+    seen = set()
+    for entry, entry_unchanged in pairs:
+        if entry.format == SITEMAP and not looks_like_posting(entry.url, careers_url):
+            continue
+        job_like = True
+        if entry.format in (RSS, ATOM, JSON_FEED):
+            result['source'] = 'feed'
+        if entry.url in seen or (keyword_regex is not None and not keyword_regex.search(posting_text(entry))):
+            continue
+        seen.add(entry.url)
+        result['postings'].append(ats_adapters.make_posting(None, entry.title, '', entry.url, entry.lastmod))
+        if entry_unchanged:
+            result['unchanged'] += 1
+        else:
+            result['changed_links'].append(entry.url)
+    return result, job_like
+
+
+if __name__ == '__main__':
+    import sys
+
+    from scraper_http import HttpFetcher
+
+    if len(sys.argv) < 2:
+        print("Usage: python sitemaps.py <careers url> [keyword hint]")
+        sys.exit(1)
+    careers_url = sys.argv[1]
+    keyword_hint = sys.argv[2] if len(sys.argv) > 2 else ""
+    state = SitemapState(':memory:')
+    found = enumerate_postings(HttpFetcher(), state, careers_url, keyword_hint)
+    if found is None:
+        print(f"No sitemap or feed with postings found for {careers_url}.")
+    else:
+        print(f"{len(found['postings'])} postings from {found['feed_url']} ({found['source']}, {found['files']} "
+              f"files, {found['bytes'] / 1024:.0f} KiB):")
+        for posting in found['postings']:
+            print(f"  {posting['updated_at'] or '-':<25} {posting['title'] or posting['url']}  {posting['url']}")
+    state.close()
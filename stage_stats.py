@@ -0,0 +1,83 @@
+import collections
+import contextlib
+import json
+import threading
+import time
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list (0 for an empty one)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class StageStats:
+    """
+    Thread-safe per-stage timers and counters for crawls, merges and benchmarks.
+
+    observe()/timer() collect duration samples per stage (fetch, parse, merge, ...) and
+    count() sums counters (pages, bytes, links, ...); summary() reduces them to
+    count/total/mean/p50/p95/max per stage. With a jsonl_path every event() is also
+    written as one JSON object per line, so runs can be compared with ordinary tools.
+    """
+
+    def __init__(self, jsonl_path=None):
+        self.lock = threading.Lock()
+        self.samples = collections.defaultdict(list)
+        self.counters = collections.Counter()
+        self.started = time.monotonic()
+        self.sink = open(jsonl_path, mode='a', encoding='utf-8') if jsonl_path else None
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            self.samples[stage].append(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def event(self, kind, **fields):
+        """Writes {'event': kind, 't': seconds since start, **fields} to the JSON lines sink, if any."""
+        if self.sink is None:
+            return
+        line = json.dumps({'event': kind, 't': round(time.monotonic() - self.started, 6), **fields})
+        with self.lock:
+            self.sink.write(line + "\n")
+
+    def summary(self):
+        with self.lock:
+            samples = {stage: sorted(values) for stage, values in self.samples.items()}
+            counters = dict(self.counters)
+        stages = {}
+        for stage, values in samples.items():
+            total = sum(values)
+            stages[stage] = {'count': len(values), 'total': total, 'mean': total / len(values),
+                             'p50': percentile(values, 50), 'p95': percentile(values, 95), 'max': values[-1]}
+        return {'elapsed': time.monotonic() - self.started, 'counters': counters, 'stages': stages}
+
+    def format_summary(self):
+        """Human-readable version of summary(), one line per stage and one for the counters."""
+        summary = self.summary()
+        lines = [f"{stage:<18} n={s['count']:<6} total={s['total']:.3f}s mean={s['mean'] * 1000:.2f}ms "
+                 f"p50={s['p50'] * 1000:.2f}ms p95={s['p95'] * 1000:.2f}ms max={s['max'] * 1000:.2f}ms"
+                 for stage, s in summary['stages'].items()]
+        if summary['counters']:
+            lines.append("  ".join(f"{name}={value}" for name, value in summary['counters'].items()))
+        return "\n".join(lines)
+
+    def close(self):
+        """Writes the summary as a final 'summary' event and closes the sink."""
+        if self.sink is not None:
+            self.event('summary', **self.summary())
+            self.sink.close()
+            self.sink = None
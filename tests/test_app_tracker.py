@@ -0,0 +1,56 @@
+import builtins
+import os
+import subprocess
+import sys
+
+import pytest
+
+import app_tracker
+from tracker_models import JobApplication
+from tracker_store import ApplicationStore
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """A fresh tracker session: the store exists, the event log has not been opened yet."""
+    store = ApplicationStore(str(tmp_path / 'job_tracker.db'))
+    monkeypatch.setattr(app_tracker, 'store', store)
+    monkeypatch.setattr(app_tracker, 'events', None)
+    monkeypatch.setattr(app_tracker, 'search_index', None)
+    yield store
+    store.close()
+
+
+def _answer(monkeypatch, *answers):
+    replies = iter(answers)
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(replies))
+
+
+def _add(monkeypatch, company_name, status_choice):
+    _answer(monkeypatch, company_name, "ML Engineer", "2024-01-02", "LinkedIn", "", "", "Remote", "", status_choice, "")
+    app_tracker.add_new_application()
+
+
+def test_first_add_of_a_session_is_logged_once(session, monkeypatch):
+    _add(monkeypatch, "Acme", "2") # 2 = Applied
+    events = app_tracker.events
+    assert [row[1] for row in events.history(1)] == ['created']
+    assert events.status_counts()["Applied"] == 1
+    assert [row[:2] for row in events.company_summary()] == [("Acme", 1)]
+
+
+def test_first_update_of_a_session_is_logged_once(session, monkeypatch):
+    session.add(JobApplication("Acme", "ML Engineer", "2024-01-02", status="Applied"))
+    _answer(monkeypatch, "1", str(JobApplication.PREDEFINED_STATUSES.index("Rejected") + 1))
+    app_tracker.update_application_status()
+    events = app_tracker.events
+    assert [row[1] for row in events.history(1)] == ['created', 'status_changed']
+    counts = events.status_counts()
+    assert counts["Applied"] == 0 and counts["Rejected"] == 1
+    assert [row[:5] for row in events.company_summary()] == [("Acme", 1, 0, 0, 1)]
+
+
+def test_tracker_starts_without_importing_numpy():
+    code = "import sys, app_tracker; sys.exit('numpy' in sys.modules)"
+    repo_root = os.path.dirname(os.path.abspath(app_tracker.__file__))
+    assert subprocess.run([sys.executable, '-c', code], cwd=repo_root).returncode == 0
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+import ats_adapters
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'ats')
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as file:
+        return json.load(file)
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeFetcher:
+    """Answers GETs from a {url: payload} map and Workday POSTs from the recorded page for the offset."""
+
+    def __init__(self, pages=None, workday_pages=None):
+        self.pages = pages or {}
+        self.workday_pages = workday_pages or {}
+        self.requests = []
+
+    def get(self, url, timeout=15, headers=None):
+        self.requests.append(url)
+        return FakeResponse(self.pages[url])
+
+    def post_json(self, url, payload, timeout=15, headers=None):
+        self.requests.append((url, payload['offset']))
+        return FakeResponse(self.workday_pages.get(payload['offset'], {"total": 0, "jobPostings": []}))
+
+
+@pytest.mark.parametrize('url, name, board', [
+    ("https://boards.greenhouse.io/acme", 'greenhouse', 'acme'),
+    ("https://job-boards.greenhouse.io/acme/jobs/4012345", 'greenhouse', 'acme'),
+    ("https://boards.greenhouse.io/embed/job_board?for=acme", 'greenhouse', 'acme'),
+    ("https://jobs.lever.co/acme/7c2f4d2e", 'lever', 'acme'),
+    ("https://jobs.ashbyhq.com/acme", 'ashby', 'acme'),
+    ("https://acme.wd5.myworkdayjobs.com/en-US/External_Careers",
+     'workday', ("https://acme.wd5.myworkdayjobs.com", 'acme', 'External_Careers')),
+    ("https://acme.wd1.myworkdayjobs.com/Careers/job/Remote/ML-Engineer_R1",
+     'workday', ("https://acme.wd1.myworkdayjobs.com", 'acme', 'Careers')),
+])
+def test_detect_ats_board_urls(url, name, board):
+    adapter, detected = ats_adapters.detect_ats(url)
+    assert (adapter.name, detected) == (name, board)
+
+
+@pytest.mark.parametrize('url', [
+    "https://boards.greenhouse.io/embed/job_board",
+    "https://acme.wd5.myworkdayjobs.com/en-US",
+    "https://acme.com/careers",
+])
+def test_detect_ats_rejects_urls_without_a_board(url):
+    assert ats_adapters.detect_ats(url) is None
+
+
+def test_workday_pages_past_the_first_page_total():
+    origin = "https://acme.wd5.myworkdayjobs.com"
+    fetcher = FakeFetcher(workday_pages={offset: _fixture(f'workday_jobs_offset_{offset}.json')
+                                         for offset in (0, 20, 40)})
+    postings = ats_adapters.WorkdayAdapter().fetch_postings(fetcher, (origin, 'acme', 'External'))
+    assert len(postings) == 45
+    assert [offset for _, offset in fetcher.requests] == [0, 20, 40] # Stops on the short page
+    assert postings[0] == {
+        'id': 'R10400', 'title': 'Machine Learning Engineer', 'location': 'San Francisco, CA',
+        'url': f"{origin}/External/job/San-Francisco/Machine-Learning-Engineer_R10400",
+        'updated_at': 'Posted 1 Days Ago',
+    }
+    assert len({posting['id'] for posting in postings}) == 45
+
+
+def test_workday_stops_on_an_empty_page():
+    first = dict(_fixture('workday_jobs_offset_0.json'), total=0) # A board that never reports its total
+    fetcher = FakeFetcher(workday_pages={0: first})
+    postings = ats_adapters.WorkdayAdapter().fetch_postings(fetcher, ("https://acme.wd5.myworkdayjobs.com", 'acme',
+                                                                      'External'))
+    assert len(postings) == 20
+    assert [offset for _, offset in fetcher.requests] == [0, 20]
+
+
+def test_greenhouse_lever_and_ashby_responses():
+    fetcher = FakeFetcher(pages={
+        "https://boards-api.greenhouse.io/v1/boards/acme/jobs": _fixture('greenhouse_jobs.json'),
+        "https://api.lever.co/v0/postings/acme?mode=json&skip=0&limit=100": _fixture('lever_postings.json'),
+        "https://api.ashbyhq.com/posting-api/job-board/acme": _fixture('ashby_jobs.json'),
+    })
+    greenhouse = ats_adapters.GreenhouseAdapter().fetch_postings(fetcher, 'acme')
+    assert greenhouse[1] == {'id': '4012399', 'title': 'Data Scientist', 'location': 'Remote',
+                             'url': "https://boards.greenhouse.io/acme/jobs/4012399",
+                             'updated_at': "2024-04-28T09:00:00-04:00"}
+    lever = ats_adapters.LeverAdapter().fetch_postings(fetcher, 'acme')
+    assert lever == [{'id': '7c2f4d2e-8a1b-4c3d-9e5f-0a1b2c3d4e5f', 'title': 'Machine Learning Engineer',
+                      'location': 'Toronto', 'url': "https://jobs.lever.co/acme/7c2f4d2e-8a1b-4c3d-9e5f-0a1b2c3d4e5f",
+                      'updated_at': "2024-05-02T16:00:00+00:00"}]
+    ashby = ats_adapters.AshbyAdapter().fetch_postings(fetcher, 'acme')
+    assert [(posting['title'], posting['location']) for posting in ashby] == [('Research Engineer', 'London')]
@@ -0,0 +1,159 @@
+import collections
+import csv
+import http.server
+import threading
+import time
+import types
+
+import pytest
+
+import job_scraper
+from crawl_state import CrawlStateStore, state_path_for
+from page_cache import PageCache
+from scraper_http import HttpFetcher
+
+# No <meta charset>, so only the HTTP header says how to decode the non-ASCII href.
+LATIN1_PAGE = '<html><body><a href="/careers/ingénieur-ml">Machine learning engineer</a></body></html>'
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = LATIN1_PAGE.encode('latin-1')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=ISO-8859-1')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('incremental', [True, False])
+def test_crawl_records_state_in_both_modes(tmp_path, monkeypatch, incremental):
+    output = str(tmp_path / 'company_career_urls_output.csv')
+    with open(output, mode='w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows([['Company', 'URL'], ['Acme', 'https://acme.example.com/careers'],
+                                    ['Globex', 'https://globex.example.com/jobs']])
+
+    def crawl(companies, *args, **kwargs):
+        for company_name, url in companies:
+            failed = company_name == 'Globex'
+            yield {'Company': company_name, 'URL': url, 'source': 'html', 'elapsed': 0.0,
+                   'error': 'HTTP 500' if failed else None,
+                   'links': [] if failed else [f"{url}/ml-engineer", f"{url}/data-scientist"]}
+
+    monkeypatch.setattr(job_scraper, 'crawl_career_pages', crawl)
+    job_scraper.crawl_all_companies(output, incremental=incremental, cache_path=None, index_search=False,
+                                    use_sitemaps=False, verbose=False)
+    state = CrawlStateStore(state_path_for(output))
+    try:
+        assert state.seen_postings('Acme') == ['https://acme.example.com/careers/data-scientist',
+                                               'https://acme.example.com/careers/ml-engineer']
+        # Both companies were just fetched, so neither is due yet.
+        assert state.due_companies([('Acme', 'https://acme.example.com/careers'),
+                                    ('Globex', 'https://globex.example.com/jobs')]) == []
+    finally:
+        state.close()
+
+
+def test_crawl_decodes_pages_with_the_http_charset(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/careers"
+    expected = [f"http://127.0.0.1:{server.server_port}/careers/ingénieur-ml"]
+    fetcher = HttpFetcher(pool_size=1)
+    cache = PageCache(str(tmp_path / 'pages.sqlite3'))
+    try:
+        result = job_scraper._crawl_one('Acme', url, "machine learning", 5, fetcher)
+        assert result['error'] is None and result['links'] == expected
+        for not_modified in (False, True):
+            cache.set_extra(url, None) # Parse again even on the 304, from the cached body and charset
+            result = job_scraper._crawl_one('Acme', url, "machine learning", 5, fetcher, cache=cache)
+            assert result['links'] == expected
+        assert cache.stats['not_modified'] == 1
+    finally:
+        cache.close()
+        fetcher.close()
+
+
+class _SlowHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        tracker = self.server.tracker
+        port = self.server.server_port
+        with tracker.lock:
+            tracker.in_flight[port] += 1
+            tracker.max_per_host = max(tracker.max_per_host, tracker.in_flight[port])
+            tracker.max_total = max(tracker.max_total, sum(tracker.in_flight.values()))
+            tracker.started.append(time.monotonic())
+        time.sleep(0.1)
+        with tracker.lock:
+            tracker.in_flight[port] -= 1
+        body = b'<a href="/careers/ml-1">Machine learning engineer</a>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_crawl_caps_concurrency_and_streams_results(monkeypatch):
+    tracker = types.SimpleNamespace(lock=threading.Lock(), in_flight=collections.Counter(), max_per_host=0,
+                                    max_total=0, started=[])
+    servers = []
+    for _ in range(3): # Three hosts (netlocs differ by port)
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _SlowHandler)
+        server.daemon_threads = True
+        server.tracker = tracker
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    closed = []
+
+    class Fetcher(HttpFetcher):
+        def __init__(self, pool_size):
+            super().__init__(pool_size=pool_size, requests_per_second=1000, burst=1000)
+
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr(job_scraper, 'HttpFetcher', Fetcher)
+    companies = [(f"Company {port} {i}", f"http://127.0.0.1:{port}/careers/{i}")
+                 for i in range(4) for port in (server.server_port for server in servers)]
+    try:
+        crawl = job_scraper.crawl_career_pages(companies, max_workers=4, max_per_host=2, timeout=5)
+        first_result_at = None
+        results = []
+        for result in crawl:
+            first_result_at = first_result_at or time.monotonic()
+            assert not closed # Still crawling
+            results.append(result)
+        assert len(results) == 12 and all(result['error'] is None and result['links'] for result in results)
+        assert (tracker.max_total, tracker.max_per_host) == (4, 2)
+        assert first_result_at < tracker.started[-1] # Results arrive while later pages are still pending
+        assert len(closed) == 1
+
+        crawl = job_scraper.crawl_career_pages(companies, max_workers=4, max_per_host=2, timeout=5)
+        next(crawl)
+        crawl.close() # Abandoned early: the fetcher is closed too
+        assert len(closed) == 2
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
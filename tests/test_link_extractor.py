@@ -0,0 +1,46 @@
+import pytest
+
+import link_extractor
+
+BACKENDS = [False] + ([True] if link_extractor.lxml_etree is not None else [])
+
+NO_META_PAGE = ('<html><head><title>Jobs</title></head><body>'
+                '<a href="/jobs/1">Café Machine Learning Engineer</a>'
+                '<a href="/jobs/2">Ingénieur machine learning — Zürich</a></body></html>')
+
+
+@pytest.mark.parametrize('use_lxml', BACKENDS)
+def test_utf8_page_without_meta_charset(use_lxml):
+    anchors = link_extractor.iter_anchors(NO_META_PAGE.encode('utf-8'), use_lxml=use_lxml)
+    assert anchors == [('/jobs/1', 'Café Machine Learning Engineer'),
+                       ('/jobs/2', 'Ingénieur machine learning — Zürich')]
+
+
+def test_backends_agree_on_declared_and_http_charsets():
+    latin1_page = NO_META_PAGE.replace('<head>', '<head><meta charset="iso-8859-1">').replace('—', '-')
+    cases = [(NO_META_PAGE.encode('utf-8'), None),
+             (latin1_page.encode('latin-1'), None),
+             (NO_META_PAGE.replace('—', '-').encode('cp1252'), 'windows-1252'),
+             ('<?xml version="1.0" encoding="utf-8"?>' + NO_META_PAGE, None)]
+    for content, encoding in cases:
+        results = [link_extractor.iter_anchors(content, use_lxml=use_lxml, encoding=encoding)
+                   for use_lxml in BACKENDS]
+        assert all(result == results[0] for result in results)
+        assert results[0][0] == ('/jobs/1', 'Café Machine Learning Engineer')
+
+
+@pytest.mark.parametrize('use_lxml', BACKENDS)
+def test_extract_job_links_matches_soup_reference(use_lxml):
+    pytest.importorskip('bs4')
+    page = link_extractor.generate_listing_page(300)
+    base = "https://careers.example.com/en/search"
+    assert link_extractor.extract_job_links(page, base, use_lxml=use_lxml) == \
+        link_extractor.extract_job_links_soup(page, base)
+
+
+def test_page_charset():
+    assert link_extractor.page_charset(b'<html>') == 'utf-8'
+    assert link_extractor.page_charset(b'<meta charset="ISO-8859-1">') == 'iso8859-1'
+    assert link_extractor.page_charset(b'<meta charset="bogus">', 'utf-8') == 'utf-8'
+    assert link_extractor.page_charset(b'<meta charset="bogus">') == 'utf-8'
+    assert link_extractor.page_charset(b'<meta charset="latin-1">', 'utf-8') == 'utf-8'
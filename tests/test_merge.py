@@ -0,0 +1,88 @@
+import csv
+import os
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import csv_merge
+import job_scraper
+from company_snapshot import snapshot_path_for
+
+THE_LIST = [
+    ['"Last update: Sept 2, 2020"', 'Suggestions', '', '', ''],
+    ['Company', 'City', 'Region', 'Industry', 'Product(s) /Keywords'],
+    ['Stripe', 'San Francisco', 'CA', 'Fintech', 'Payments'],
+    ['Scale AI', 'San Francisco', 'CA', 'Machine Learning', 'Data labeling'],
+    ['Acme Robotics', 'Austin', 'TX', 'Robotics', ''],
+]
+
+
+def _write(path, rows):
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows(rows)
+
+
+def test_merge_reads_new_companies_from_the_snapshot(tmp_path, monkeypatch):
+    the_list = str(tmp_path / 'TheList.csv')
+    output = str(tmp_path / 'company_career_urls_output.csv')
+    _write(the_list, THE_LIST)
+    _write(output, [['Company', 'URL'], ['Stripe, Inc.', 'https://stripe.com/jobs']])
+
+    def fail(filepath):
+        raise AssertionError("the company list was parsed again instead of read from the snapshot")
+        yield # pragma: no cover
+
+    monkeypatch.setattr(csv_merge, 'iter_new_companies', fail)
+    stats = job_scraper.merge_and_update_career_urls(output, the_list)
+    assert os.path.exists(snapshot_path_for(the_list))
+    assert (stats['rows'], stats['with_urls'], stats['needing_urls']) == (3, 1, 2)
+    with open(output, encoding='utf-8', newline='') as file:
+        rows = sorted(tuple(row) for row in csv.reader(file))
+    assert rows == [('Acme Robotics', ''), ('Company', 'URL'), ('Scale AI', ''),
+                    ('Stripe, Inc.', 'https://stripe.com/jobs')]
+
+
+def test_new_company_names_stream_from_the_snapshot(tmp_path):
+    the_list = str(tmp_path / 'TheList.csv')
+    _write(the_list, THE_LIST)
+    names = job_scraper.read_new_companies_list(the_list)
+    assert iter(names) is names
+    assert list(names) == ['Stripe', 'Scale AI', 'Acme Robotics']
+    assert list(job_scraper.read_new_companies_list(str(tmp_path / 'missing.csv'))) == []
+
+
+def test_merge_stats_count_compact_key_matches_separately(tmp_path):
+    the_list = str(tmp_path / 'TheList.csv')
+    output = str(tmp_path / 'company_career_urls_output.csv')
+    _write(the_list, THE_LIST[:2] + [[name] + [''] * 4 for name in (
+        'Stripe, Inc.', 'Data Bricks', 'Lawrence Livermore National Laboratory', 'Acme Robotics')])
+    _write(output, [['Company', 'URL'], ['Stripe', 'https://stripe.com/jobs'],
+                    ['Databricks', 'https://databricks.com/careers'],
+                    ['Lawrence Livermore National Laboratories', 'https://llnl.gov/careers']])
+    merges = []
+    stats = csv_merge.stream_merge_career_urls(output, the_list, on_merge=lambda *merge: merges.append(merge))
+    assert {dropped: kept for dropped, kept, _ in merges} == {
+        'Stripe, Inc.': 'Stripe', 'Data Bricks': 'Databricks',
+        'Lawrence Livermore National Laboratory': 'Lawrence Livermore National Laboratories'}
+    assert (stats['exact_merges'], stats['compact_merges'], stats['fuzzy_merges']) == (1, 1, 1)
+    assert stats['fetches_saved'] == 3 and stats['rows'] == 4
+
+
+def test_merge_keeps_existing_rows_with_different_urls_under_one_key(tmp_path):
+    the_list = str(tmp_path / 'TheList.csv')
+    output = str(tmp_path / 'company_career_urls_output.csv')
+    _write(the_list, THE_LIST[:2] + [['CrowdStrike', '', '', '', '']])
+    _write(output, [['Company', 'URL'], ['Crowdstrike', 'https://crowdstrike.com/careers'],
+                    ['Crowd Strike', 'https://crowdstrike.wd5.myworkdayjobs.com/crowdstrikecareers'],
+                    ['CROWDSTRIKE', 'https://crowdstrike.com/careers']])
+    merges = []
+    stats = csv_merge.stream_merge_career_urls(output, the_list, on_merge=lambda *merge: merges.append(merge))
+    with open(output, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert sorted((row['Company'], row['URL']) for row in rows) == [
+        ('Crowd Strike', 'https://crowdstrike.wd5.myworkdayjobs.com/crowdstrikecareers'),
+        ('Crowdstrike', 'https://crowdstrike.com/careers')]
+    # The new 'CrowdStrike' row is a plain case-insensitive duplicate, so it isn't reported.
+    assert merges == [('CROWDSTRIKE', 'Crowdstrike', 1.0)]
+    assert (stats['rows'], stats['with_urls'], stats['needing_urls']) == (2, 2, 0)
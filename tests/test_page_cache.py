@@ -0,0 +1,118 @@
+import http.server
+import itertools
+import threading
+import types
+
+import pytest
+
+import page_cache
+from page_cache import PageCache, fetch_with_cache
+from scraper_http import HttpFetcher
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('If-None-Match')))
+            version = server.versions.get(self.path, 1)
+        etag = f'"v{version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = f"<html>{self.path} version {version}</html>".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.versions = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = HttpFetcher(pool_size=1)
+    yield fetcher
+    fetcher.close()
+
+
+def _cache(tmp_path, **kwargs):
+    return PageCache(str(tmp_path / 'pages.sqlite3'), **kwargs)
+
+
+def test_304_reuses_the_cached_body_and_extra(server, fetcher, tmp_path):
+    url = f"http://127.0.0.1:{server.server_port}/careers"
+    cache = _cache(tmp_path)
+    try:
+        body, charset, entry, not_modified = fetch_with_cache(fetcher, cache, url)
+        assert (body, charset, entry, not_modified) == (b"<html>/careers version 1</html>", 'utf-8', None, False)
+        cache.set_extra(url, {'links': ['a']})
+
+        body, charset, entry, not_modified = fetch_with_cache(fetcher, cache, url)
+        assert not_modified and body == b"<html>/careers version 1</html>" and charset == 'utf-8'
+        assert entry.extra == {'links': ['a']}
+        assert server.requests == [('/careers', None), ('/careers', '"v1"')]
+
+        server.versions['/careers'] = 2 # Changed upstream: the conditional GET gets a full 200 again
+        body, _, entry, not_modified = fetch_with_cache(fetcher, cache, url)
+        assert (body, entry, not_modified) == (b"<html>/careers version 2</html>", None, False)
+        assert cache.lookup(url).etag == '"v2"' and cache.lookup(url).extra is None
+        assert (cache.stats['hits'], cache.stats['misses'], cache.stats['not_modified']) == (1, 2, 1)
+    finally:
+        cache.close()
+
+
+def test_evicts_least_recently_used_pages_by_size(server, fetcher, tmp_path, monkeypatch):
+    base = f"http://127.0.0.1:{server.server_port}"
+    page_size = len(b"<html>/a version 1</html>")
+    cache = _cache(tmp_path, max_bytes=3 * page_size)
+    clock = itertools.count()
+    # Distinct, increasing access times so the LRU order doesn't depend on the clock's resolution.
+    monkeypatch.setattr(page_cache, 'time', types.SimpleNamespace(time=lambda: next(clock)))
+    try:
+        for path in ('/a', '/b', '/c'):
+            fetch_with_cache(fetcher, cache, base + path)
+        fetch_with_cache(fetcher, cache, base + '/a') # A 304 marks /a as recently used
+        fetch_with_cache(fetcher, cache, base + '/d') # Over budget: /b is the least recently used
+        assert cache.lookup(base + '/b') is None
+        assert all(cache.lookup(base + path) is not None for path in ('/a', '/c', '/d'))
+        assert cache.size() == (3 * page_size, 3)
+        assert cache.stats['evictions'] == 1
+
+        fetch_with_cache(fetcher, cache, base + '/b') # Evicted, so fetched unconditionally again
+        assert server.requests[-1] == ('/b', None)
+        assert cache.lookup(base + '/c') is None
+        assert (cache.stats['hits'], cache.stats['misses'], cache.stats['evictions']) == (1, 5, 2)
+    finally:
+        cache.close()
+
+
+def test_entry_limit_and_clear(server, fetcher, tmp_path):
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache = _cache(tmp_path, max_entries=2)
+    try:
+        for path in ('/a', '/b', '/c'):
+            fetch_with_cache(fetcher, cache, base + path)
+        assert cache.size()[1] == 2 and cache.stats['evictions'] == 1
+        cache.clear()
+        assert cache.size() == (0, 0)
+    finally:
+        cache.close()
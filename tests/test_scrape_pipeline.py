@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+import job_scraper
+import scrape_pipeline
+
+
+def test_run_per_host_stops_submitting_once_stop_is_set():
+    stop = threading.Event()
+    calls = []
+
+    def work(company_name, url):
+        calls.append(company_name)
+        return company_name
+
+    companies = [(f"Company {i}", f"https://host{i}.example.com/careers") for i in range(100)]
+    results = []
+    for result in job_scraper.run_per_host(companies, work, max_workers=4, stop=stop):
+        results.append(result)
+        stop.set()
+    assert len(calls) == 4 # Only the first batch
+    assert sorted(results) == sorted(calls)
+
+
+def test_failed_run_does_not_keep_crawling(monkeypatch, tmp_path):
+    downloads = []
+
+    def download(company_name, url, **kwargs):
+        downloads.append(company_name)
+        time.sleep(0.001)
+        return {'Company': company_name, 'URL': url, 'source': 'html', 'links': [], 'postings': None,
+                'error': None, 'content': '<html></html>', 'charset': None, 'bytes': 13, 'fetch_time': 0.0,
+                'parse_time': 0.0}
+
+    def parse(content, base_url, keyword_hint, encoding=None):
+        raise RuntimeError("parser crashed")
+
+    monkeypatch.setattr(scrape_pipeline, 'download_page', download)
+    monkeypatch.setattr(scrape_pipeline, 'parse_page', parse)
+    companies = [(f"Company {i}", f"https://host{i}.example.com/careers") for i in range(1000)]
+    pipeline = scrape_pipeline.ScrapePipeline(fetch_workers=4, parse_workers=0, queue_size=4, fetcher=object())
+    with pytest.raises(RuntimeError, match="parser crashed"):
+        pipeline.run(companies, str(tmp_path / 'out.jsonl'))
+    assert len(downloads) < 50
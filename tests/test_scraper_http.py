@@ -0,0 +1,75 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+from scraper_http import HttpFetcher, TokenBucket
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_times.append(time.monotonic())
+            limited = len(server.request_times) <= server.rate_limited_requests
+        if limited:
+            self.send_response(429)
+            self.send_header('Retry-After', server.retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.request_times = []
+    server.rate_limited_requests = 2
+    server.retry_after = '1'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_429_honors_retry_after(server):
+    fetcher = HttpFetcher(pool_size=1, max_retries=3, backoff_base=0.01)
+    response = fetcher.get(f"http://127.0.0.1:{server.server_port}/jobs")
+    assert response.status_code == 200
+    times = server.request_times
+    assert len(times) == 3 # Two 429s, then the retry that got through
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert all(0.9 <= gap < 3 for gap in gaps), gaps
+
+
+def test_429_gives_up_after_max_retries(server):
+    server.rate_limited_requests = 100
+    server.retry_after = '120'
+    fetcher = HttpFetcher(pool_size=1, max_retries=2, max_backoff=0.2)
+    started = time.monotonic()
+    response = fetcher.get(f"http://127.0.0.1:{server.server_port}/jobs")
+    assert response.status_code == 429
+    assert len(server.request_times) == 3
+    assert 0.35 <= time.monotonic() - started < 5 # Retry-After is capped at max_backoff
+
+
+def test_pause_until_keeps_a_longer_pause():
+    bucket = TokenBucket(rate=2.0, capacity=4)
+    now = time.monotonic()
+    bucket.pause_until(now + 10)
+    bucket.pause_until(now + 1)
+    assert bucket.updated == now + 10
+    bucket.tokens = 0.0
+    bucket.pause_until(now + 5)
+    assert bucket.tokens == 0.0 and bucket.updated == now + 10
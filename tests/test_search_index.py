@@ -0,0 +1,101 @@
+import csv
+
+import pytest
+
+from search_index import APPLICATION, COMPANY, POSTING, SearchIndex, build_match_query
+from tracker_models import JobApplication
+from tracker_store import ApplicationStore
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(path=str(tmp_path / 'job_tracker.db'))
+    yield index
+    index.store.close()
+
+
+def _keys(results, kind=APPLICATION):
+    return sorted(result['key'] for result in results if result['kind'] == kind)
+
+
+def _write_companies(path, rows):
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows([['"Last update: Sept 2, 2020"', '', '', '', ''],
+                                    ['Company', 'City', 'Region', 'Industry', 'Product(s) /Keywords']] + rows)
+
+
+def test_triggers_index_rows_written_straight_to_applications(index):
+    conn = index.conn
+    # What the web frontend does: plain SQL against the shared applications table.
+    app_id = conn.execute("INSERT INTO applications (company_name, job_title, status, notes) "
+                          "VALUES ('Acme', 'Data Scientist', 'Applied', 'Referred by Dana')").lastrowid
+    conn.commit()
+    assert _keys(index.search("scientist")) == [app_id]
+    assert _keys(index.search("dana")) == [app_id]
+
+    conn.execute("UPDATE applications SET job_title = 'Robotics Engineer' WHERE id = ?", (app_id,))
+    conn.commit()
+    assert index.search("scientist") == []
+    assert _keys(index.search("robotics")) == [app_id]
+
+    conn.execute("DELETE FROM applications WHERE id = ?", (app_id,))
+    conn.commit()
+    assert index.search("robotics") == []
+
+
+def test_first_run_on_an_existing_database_indexes_the_rows_already_there(tmp_path):
+    path = str(tmp_path / 'job_tracker.db')
+    store = ApplicationStore(path)
+    app = JobApplication("Globex", "Machine Learning Engineer", "2024-01-02", location="Lisbon")
+    store.add(app)
+    store.close()
+
+    index = SearchIndex(path=path)
+    try:
+        assert _keys(index.search("lisbon")) == [app.app_id]
+        results = index.search("machine learning", kinds=[APPLICATION])
+        assert results[0]['title'] == "Machine Learning Engineer at Globex (Wishlist/To Apply)"
+        assert '[Machine]' in results[0]['snippet']
+    finally:
+        index.store.close()
+    # Reopening doesn't rebuild again, and the index still matches the table.
+    index = SearchIndex(path=path)
+    try:
+        assert _keys(index.search("globex")) == [app.app_id]
+    finally:
+        index.store.close()
+
+
+def test_prefix_queries(index):
+    app = JobApplication("Initech", "Machine Learning Engineer", "2024-01-02", location="Zürich")
+    index.store.add(app)
+    index.upsert_document(POSTING, 'https://initech.example.com/jobs/1', 'Ingénieur Apprentissage', 'Initech')
+    index.conn.commit()
+
+    assert build_match_query("Mach lear") == '"mach"* "lear"*'
+    assert build_match_query("mach", prefix=False) == '"mach"'
+    assert build_match_query(" -- ") is None
+    assert _keys(index.search("mach lear")) == [app.app_id]
+    assert index.search("mach lear", prefix=False) == []
+    assert _keys(index.search("zur")) == [app.app_id] # Diacritics are folded
+    assert _keys(index.search("ingen", kinds=[POSTING]), POSTING) == ['https://initech.example.com/jobs/1']
+    assert index.search("ingen", kinds=[APPLICATION]) == []
+    assert index.search("!!") == []
+
+
+def test_index_companies_skips_an_unchanged_csv(index, tmp_path):
+    path = str(tmp_path / 'TheList.csv')
+    _write_companies(path, [['Acme Robotics', 'Austin', 'TX', 'Robotics', 'Warehouse arms'],
+                            ['Scale AI', 'San Francisco', 'CA', 'Machine Learning', 'Data labeling'],
+                            ['', 'Nowhere', '', '', '']])
+    assert index.index_companies(path) == 2
+    assert _keys(index.search("warehouse"), COMPANY) == ['Acme Robotics']
+    assert index.index_companies(path) == 0
+    assert index.index_companies(path, force=True) == 2
+
+    _write_companies(path, [['Acme Robotics', 'Austin', 'TX', 'Robotics', 'Forklifts'],
+                            ['Scale AI', 'San Francisco', 'CA', 'Machine Learning', 'Data labeling']])
+    assert index.index_companies(path) == 2
+    assert index.search("warehouse") == []
+    assert _keys(index.search("forklift"), COMPANY) == ['Acme Robotics']
+    assert index.conn.execute("SELECT COUNT(*) FROM search_documents").fetchone()[0] == 2
@@ -0,0 +1,77 @@
+import pytest
+
+import sitemaps
+
+CAREERS = "https://example.com/careers"
+FEED = "https://example.com/careers/sitemap.xml"
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, fail_after=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+        self.fail_after = fail_after
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, size):
+        for i in range(0, len(self.body), size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.body[i:i + size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeFetcher:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def get(self, url, timeout=15, headers=None, stream=False):
+        if url in self.responses:
+            return self.responses[url]
+        return FakeResponse(b'', status_code=404)
+
+
+def urlset(postings):
+    urls = "".join(f"<url><loc>{CAREERS}/jobs/{n}</loc><lastmod>{lastmod}</lastmod></url>"
+                   for n, lastmod in postings)
+    return (f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}'
+            '</urlset>').encode('utf-8')
+
+
+@pytest.fixture
+def state(monkeypatch):
+    monkeypatch.setattr(sitemaps, 'WRITE_BATCH', 3) # Several batches per file
+    state = sitemaps.SitemapState(':memory:')
+    yield state
+    state.close()
+
+
+def test_streamed_read_diffs_against_previous_read(state):
+    first = [(n, '2026-01-01') for n in range(10)]
+    found = sitemaps.enumerate_postings(FakeFetcher({FEED: FakeResponse(urlset(first))}), state, CAREERS, "")
+    assert found['feed_url'] == FEED
+    assert len(found['changed_links']) == 10 and found['unchanged'] == 0
+
+    second = [(n, '2026-01-02' if n == 4 else '2026-01-01') for n in range(1, 12)]
+    found = sitemaps.enumerate_postings(FakeFetcher({FEED: FakeResponse(urlset(second))}), state, CAREERS, "")
+    assert found['changed_links'] == [f"{CAREERS}/jobs/{n}" for n in (4, 10, 11)]
+    assert found['unchanged'] == 8
+    assert [entry.url for entry in state.entries(FEED)] == [f"{CAREERS}/jobs/{n}" for n in range(1, 12)]
+
+
+def test_failed_read_drops_partial_state(state):
+    postings = [(n, '2026-01-01') for n in range(2000)] # Several chunks, so the failure comes mid-file
+    sitemaps.enumerate_postings(FakeFetcher({FEED: FakeResponse(urlset(postings))}), state, CAREERS, "")
+    response = FakeResponse(urlset(postings), fail_after=sitemaps.CHUNK_SIZE)
+    with pytest.raises(ConnectionError):
+        sitemaps.enumerate_postings(FakeFetcher({FEED: response}), state, CAREERS, "")
+    assert response.closed
+    assert state.file_headers(FEED) is None
+    assert list(state.entries(FEED)) == []
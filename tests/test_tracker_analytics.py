@@ -0,0 +1,30 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tracker_analytics import ApplicationFrame
+from tracker_models import ApplicationColumns, JobApplication
+
+
+def _columns():
+    return ApplicationColumns.from_applications([
+        JobApplication("Acme", "ML Engineer", "2024-01-02", source_of_listing="LinkedIn", status="Applied"),
+        JobApplication("Globex", "Data Scientist", "2024-01-05", source_of_listing="Referral", status="Applied"),
+    ])
+
+
+def test_frame_is_a_snapshot_of_columns():
+    columns = _columns()
+    frame = ApplicationFrame.from_columns(columns)
+    status_before = frame.status.copy()
+    last_day_before = frame.last_activity_day.copy()
+
+    columns.append(JobApplication("Initech", "Analyst", "2024-02-01", status="Applied"))
+    columns.bulk_update_status([0, 1], "Rejected", on_date=datetime.date(2024, 3, 1))
+
+    assert len(frame) == 2
+    assert np.array_equal(frame.status, status_before)
+    assert np.array_equal(frame.last_activity_day, last_day_before)
+    assert len(ApplicationFrame.from_columns(columns)) == 3
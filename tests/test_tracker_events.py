@@ -0,0 +1,50 @@
+import datetime
+
+import pytest
+
+from tracker_events import EventLog
+from tracker_models import JobApplication
+from tracker_store import ApplicationStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ApplicationStore(str(tmp_path / 'job_tracker.db'))
+    yield store
+    store.close()
+
+
+def _add(store, events, company_name, status="Applied"):
+    app = JobApplication(company_name, "ML Engineer", "2024-01-02", status=status)
+    with store.batch():
+        store.add(app)
+        events.record_created(app)
+    return app
+
+
+def test_sync_catches_up_with_changes_made_outside_the_log(store):
+    events = EventLog(store)
+    acme = _add(store, events, "Acme")
+    globex = _add(store, events, "Globex")
+    # What the web frontend does: plain SQL against the shared applications table.
+    store.conn.execute("INSERT INTO applications (company_name, job_title, status) VALUES ('Initech', 'Analyst', "
+                       "'Applied')")
+    store.conn.execute("UPDATE applications SET status = 'Rejected' WHERE id = ?", (acme.app_id,))
+    store.conn.execute("DELETE FROM applications WHERE id = ?", (globex.app_id,))
+    store.conn.commit()
+
+    assert events.sync_with_store() == 3
+    counts = events.status_counts()
+    assert counts["Applied"] == 1 and counts["Rejected"] == 1
+    assert [row[:5] for row in events.company_summary()] == [("Acme", 1, 0, 0, 1), ("Initech", 1, 1, 0, 0)]
+    assert events.sync_with_store() == 0
+
+
+def test_event_times_are_utc(store):
+    events = EventLog(store)
+    app = _add(store, events, "Acme")
+    occurred_at = events.history(app.app_id)[0][5]
+    created_at = store.conn.execute("SELECT created_at FROM applications WHERE id = ?", (app.app_id,)).fetchone()[0]
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    for value in (occurred_at, created_at.replace(' ', 'T')):
+        assert abs(datetime.datetime.fromisoformat(value) - now) < datetime.timedelta(minutes=1)
@@ -0,0 +1,101 @@
+import csv
+import datetime
+import os
+
+import pytest
+
+import tracker_import
+from tracker_models import NO_DATE, JobApplication
+from tracker_store import ApplicationStore
+
+SHEET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Companies - Sheet1.csv')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ApplicationStore(str(tmp_path / 'job_tracker.db'))
+    yield store
+    store.close()
+
+
+def _write_sheet(path, rows, header=("Company", "URL", "Role", "Status", "Resume", "Notes", "Date Applied")):
+    with open(path, mode='w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows([list(header)] + rows)
+
+
+def _status(text):
+    code, leftover = tracker_import.map_status(text)
+    return JobApplication.PREDEFINED_STATUSES[code], leftover
+
+
+def test_map_status_aliases():
+    assert _status("Resume") == ("Applied", None)
+    assert _status("  No roles ") == ("Wishlist/To Apply", None)
+    assert _status("OA") == ("Online Assessment", None)
+    assert _status("phone-screen") == ("HR Screening", None)
+    assert _status("On site") == ("On-site/Final Interview", None)
+    assert _status("Technical Interview (Round 1)") == ("Technical Interview (Round 1)", None)
+    assert _status("REJECTED") == ("Rejected", None)
+    assert _status("") == ("Wishlist/To Apply", None)
+    assert _status(None) == ("Wishlist/To Apply", None)
+    assert _status(" Ghosted after call ") == ("Wishlist/To Apply", "Ghosted after call")
+
+
+def test_unmapped_status_is_kept_in_the_notes(tmp_path):
+    path = str(tmp_path / 'sheet.csv')
+    _write_sheet(path, [["Acme", "", "SDE", "Ghosted", "v2.pdf", "Met at meetup", ""],
+                        ["Globex", "", "", "Coffee chat", "", "", ""],
+                        ["", "https://nobody.example.com", "", "", "", "", ""]])
+    acme, globex = tracker_import.applications_from_sheet(path)
+    assert (acme.status, acme.notes, acme.resume_version) == ("Wishlist/To Apply",
+                                                              "Status in sheet: Ghosted\nMet at meetup", "v2.pdf")
+    assert (globex.job_title, globex.notes) == (tracker_import.DEFAULT_ROLE, "Status in sheet: Coffee chat")
+
+
+def test_parse_dates_formats():
+    values = ["2024-03-05", "03/05/2024", "3/5/24", "Mar 5, 2024", "March 5, 2024", "5 Mar 2024",
+              "Sept 5, 2024", "", None, "next week", "2024-03-05"]
+    march_5 = datetime.date(2024, 3, 5).toordinal()
+    assert tracker_import.parse_dates(values) == [march_5] * 6 + [
+        datetime.date(2024, 9, 5).toordinal(), NO_DATE, NO_DATE, NO_DATE, march_5]
+
+
+def test_dedupe_key_within_a_batch_and_against_the_store(store):
+    assert tracker_import.dedupe_key("Stripe, Inc.", "https://stripe.com/jobs/1/") == \
+        tracker_import.dedupe_key("stripe", " https://stripe.com/jobs/1")
+    assert tracker_import.dedupe_key("Acme", "", " SDE ") == tracker_import.dedupe_key("ACME", None, "sde")
+    assert tracker_import.dedupe_key("Acme", "", "SDE") != tracker_import.dedupe_key("Acme", "", "PM")
+
+    store.add(JobApplication("Stripe", "Backend Engineer", None, job_description_link="https://stripe.com/jobs/1"))
+    apps = [JobApplication("Stripe, Inc.", "Backend Engineer", None, job_description_link="https://stripe.com/jobs/1/"),
+            JobApplication("Acme", "SDE", None),
+            JobApplication("ACME", "sde", None),
+            JobApplication("Acme", "PM", None)]
+    assert tracker_import.import_applications(store, apps) == {'read': 4, 'added': 2, 'duplicates': 2}
+    assert sorted((app.company_name, app.job_title) for app in store.iter_all()) == [
+        ("Acme", "PM"), ("Acme", "SDE"), ("Stripe", "Backend Engineer")]
+
+
+def test_export_then_reimport_round_trips(store, tmp_path):
+    sheet = str(tmp_path / 'sheet.csv')
+    _write_sheet(sheet, [["Acme", "https://acme.example.com/jobs/7", "ML Engineer", "OA", "", "", "Mar 5, 2024"],
+                         ["Globex", "", "Analyst", "Ghosted", "", "Follow up", "03/06/2024"]])
+    tracker_import.import_applications(store, tracker_import.applications_from_sheet(sheet))
+    exported = str(tmp_path / 'export.csv')
+    assert tracker_import.export_applications(store, exported) == 2
+
+    def fields(app):
+        return (app.company_name, app.job_title, app.job_description_link, app.status, app.application_date,
+                app.notes)
+
+    reimported = tracker_import.applications_from_sheet(exported)
+    assert [fields(app) for app in reimported] == [fields(app) for app in store.iter_all()]
+    assert reimported[0].application_date == datetime.date(2024, 3, 5)
+    assert tracker_import.import_applications(store, reimported) == {'read': 2, 'added': 0, 'duplicates': 2}
+
+
+def test_importing_the_companies_sheet_twice(store):
+    apps = tracker_import.applications_from_sheet(SHEET)
+    assert tracker_import.import_applications(store, apps) == {'read': 148, 'added': 147, 'duplicates': 1}
+    again = tracker_import.applications_from_sheet(SHEET)
+    assert tracker_import.import_applications(store, again) == {'read': 148, 'added': 0, 'duplicates': 148}
@@ -0,0 +1,96 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from tracker_models import JobApplication
+from tracker_store import CREATE_APPLICATIONS_TABLE, CREATE_UPDATED_AT_TRIGGER, ApplicationStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ApplicationStore(str(tmp_path / 'job_tracker.db'))
+    yield store
+    store.close()
+
+
+def _app(company_name, job_title="ML Engineer", status="Applied", last_activity=None):
+    app = JobApplication(company_name, job_title, "2024-01-02", status=status, location="Remote")
+    if last_activity:
+        app.last_activity_date = datetime.date.fromisoformat(last_activity)
+    return app
+
+
+def test_round_trip_through_a_database_the_frontend_created(tmp_path):
+    path = str(tmp_path / 'job_tracker.db')
+    # What src/lib/db.js and POST /api/applications do before the Python side ever opens the file.
+    conn = sqlite3.connect(path)
+    conn.execute(CREATE_APPLICATIONS_TABLE)
+    conn.execute(CREATE_UPDATED_AT_TRIGGER)
+    conn.execute("INSERT INTO applications (company_name, job_title, application_date, status, job_link, notes) "
+                 "VALUES ('Acme', 'Data Scientist', '2024-03-01', 'Applied', 'https://acme.com/jobs/1', NULL)")
+    conn.execute("INSERT INTO applications (company_name, job_title, status) VALUES ('Globex', 'Analyst', "
+                 "'Coffee Chat')")
+    conn.commit()
+    conn.close()
+
+    store = ApplicationStore(path)
+    try:
+        acme, globex = store.iter_all()
+        assert (acme.company_name, acme.job_title, acme.status) == ("Acme", "Data Scientist", "Applied")
+        assert acme.application_date == datetime.date(2024, 3, 1)
+        assert acme.job_description_link == "https://acme.com/jobs/1" and acme.notes == ""
+        # A status typed in the frontend isn't predefined; it must survive a save from this side.
+        assert globex.status == "Coffee Chat"
+        globex.location = "Remote"
+        store.update(globex)
+        assert store.conn.execute("SELECT status, location FROM applications WHERE id = ?",
+                                  (globex.app_id,)).fetchone() == ("Coffee Chat", "Remote")
+        globex.update_status("Rejected")
+        store.update(globex)
+        assert store.get(globex.app_id).status == "Rejected"
+
+        app = _app("Initech", status="HR Screening")
+        app.add_note("Recruiter call booked")
+        store.add(app)
+        loaded = store.get(app.app_id)
+        assert (loaded.company_name, loaded.status, loaded.location, loaded.notes) == (
+            "Initech", "HR Screening", "Remote", app.notes)
+        assert loaded.last_activity_date == app.last_activity_date
+    finally:
+        store.close()
+
+
+def test_batch_rolls_back_every_write_on_error(store):
+    kept = _app("Acme")
+    store.add(kept)
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.add(_app("Globex"))
+            kept.update_status("Rejected")
+            store.update(kept)
+            raise RuntimeError("boom")
+    assert store.count() == 1
+    assert store.get(kept.app_id).status == "Applied"
+
+    with store.batch():
+        with store.batch():
+            store.add(_app("Initech"))
+        store.add(_app("Umbrella"))
+    assert store.count() == 3
+
+
+def test_search_and_filter_queries(store):
+    store.add_many([
+        _app("Acme", "Data Scientist", "Applied", "2024-01-05"),
+        _app("ACME", "ML Engineer", "Rejected", "2024-02-01"),
+        _app("Globex", "Data Engineer", "Applied", "2024-01-20"),
+        _app("Initech", "Analyst", "HR Screening", "2024-01-01"),
+    ])
+    assert [(app.company_name, app.job_title) for app in store.search("data")] == [
+        ("Acme", "Data Scientist"), ("Globex", "Data Engineer")]
+    assert [app.job_title for app in store.search("acme", limit=1)] == ["Data Scientist"]
+    assert [app.job_title for app in store.by_company("acme")] == ["Data Scientist", "ML Engineer"]
+    assert [app.company_name for app in store.by_status("Applied")] == ["Acme", "Globex"]
+    assert [app.company_name for app in store.recently_active(limit=3)] == ["ACME", "Globex", "Acme"]
+    assert store.get(999) is None
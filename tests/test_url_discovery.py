@@ -0,0 +1,96 @@
+import http.server
+import threading
+import time
+
+import pytest
+
+import url_discovery
+
+BOARDS = {f"board{i}" for i in range(40)}
+LISTING = (b'<html><body><nav><a href="/about">About</a><a href="/careers">Careers</a></nav><ul>'
+           b'<li><a href="/careers/ml-engineer">ML Engineer</a></li>'
+           b'<li><a href="/careers/data-scientist">Data Scientist</a></li></ul></body></html>')
+MARKETING = (b'<html><body><nav><a href="/about">About</a><a href="/careers">Careers</a></nav>'
+             b'<p>We are always looking for great people. Check back soon!</p></body></html>')
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        parts = self.path.strip('/').split('/')
+        if parts[0] == 'board' and len(parts) == 2:
+            if parts[1] in BOARDS:
+                self._send(200, b'<html>Board</html>')
+            else: # Unknown boards bounce to the vendor's homepage, like Greenhouse and Lever
+                self.send_response(302)
+                self.send_header('Location', '/')
+                self.end_headers()
+        elif self.path == '/':
+            self._send(200, b'<html>Job board vendor</html>')
+        elif parts[0] == 'site' and len(parts) == 3 and parts[2] == 'careers':
+            self._send(200, LISTING if parts[1] == 'listing' else MARKETING)
+        else:
+            self._send(404, b'Not found')
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _discoverer(server):
+    port = server.server_port
+    # Job boards on "localhost", company sites on "127.0.0.1": two hosts with separate rate budgets.
+    return url_discovery.CareerUrlDiscoverer(
+        ats_templates=(f'http://localhost:{port}/board/{{slug}}',),
+        site_templates=(f'http://127.0.0.1:{port}/site/{{slug}}',), career_paths=('/careers', '/jobs'))
+
+
+def test_ats_tier_uses_the_job_board_budget(server):
+    discoverer = _discoverer(server)
+    names = sorted(BOARDS) + ["Unknown"]
+    started = time.monotonic()
+    found = discoverer.discover(names)
+    elapsed = time.monotonic() - started
+    port = server.server_port
+    assert found == {name: f"http://localhost:{port}/board/{name}" for name in BOARDS}
+    # 41 probes at the 2 requests/second company-site default would take over 18 seconds.
+    assert elapsed < 5
+    assert discoverer.stats['probes'] == 41 + 2
+
+
+def test_site_tier_requires_job_listings_in_the_page(server):
+    found = _discoverer(server).discover(["Listing", "Marketing"])
+    assert found == {"Listing": f"http://127.0.0.1:{server.server_port}/site/listing/careers"}
+    assert '/site/marketing/careers' in server.requests
+
+
+def test_shows_job_listings():
+    page = "https://example.com/careers"
+    assert url_discovery.shows_job_listings(LISTING, page)
+    assert not url_discovery.shows_job_listings(MARKETING, page)
+    assert url_discovery.shows_job_listings(b'<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme">',
+                                            page)
+    assert url_discovery.shows_job_listings(b'<script type="application/ld+json">{"@type": "JobPosting"}</script>',
+                                            page)
+    assert url_discovery.shows_job_listings(b'<a href="/jobs/1">A</a><a href="/jobs/2">B</a>', page)
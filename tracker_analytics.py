@@ -0,0 +1,211 @@
+import numpy as np
+
+from tracker_models import NO_DATE, JobApplication
+
+STATUSES = JobApplication.PREDEFINED_STATUSES
+STATUS_CODES = JobApplication.STATUS_CODES
+
+# Ordered pipeline stages used for the funnel.
+FUNNEL_STAGES = [
+    "Wishlist/To Apply",
+    "Applied",
+    "Online Assessment",
+    "HR Screening",
+    "Technical Interview (Round 1)",
+    "Technical Interview (Round 2+)",
+    "Hiring Manager Interview",
+    "On-site/Final Interview",
+    "Offer Extended",
+    "Offer Accepted",
+]
+
+
+def _build_stage_reached():
+    """Maps each status code to the furthest funnel stage index an application in it has reached."""
+    reached = np.zeros(len(STATUSES), dtype=np.int8)
+    for code, status in enumerate(STATUSES):
+        if status in FUNNEL_STAGES:
+            reached[code] = FUNNEL_STAGES.index(status)
+        elif status == "Offer Declined":
+            reached[code] = FUNNEL_STAGES.index("Offer Extended")
+        else:
+            # Rejected / withdrawn: without history we only know the application was sent.
+            reached[code] = FUNNEL_STAGES.index("Applied")
+    return reached
+
+
+STAGE_REACHED = _build_stage_reached()
+
+# Any status past "Applied" (including a rejection) means the company responded.
+_RESPONDED = np.array([status not in ("Wishlist/To Apply", "Applied", "Withdrew Application")
+                       for status in STATUSES])
+_APPLIED = np.array([status != "Wishlist/To Apply" for status in STATUSES])
+
+
+class ApplicationFrame:
+    """
+    Column arrays for the whole application set, built in one bulk pass. A frame is a
+    snapshot: it never shares memory with the objects or columns it was built from.
+
+    status: int8 status codes, application_day / last_activity_day: int32 date ordinals
+    (NO_DATE when missing), source / company: int32 codes into source_names / company_names.
+    """
+
+    def __init__(self, status, application_day, last_activity_day, source, source_names, company, company_names):
+        self.status = status
+        self.application_day = application_day
+        self.last_activity_day = last_activity_day
+        self.source = source
+        self.source_names = source_names
+        self.company = company
+        self.company_names = company_names
+
+    def __len__(self):
+        return len(self.status)
+
+    @staticmethod
+    def _encode(values):
+        """Dictionary-encodes strings in first-seen order (one hash per value, no object sort)."""
+        index = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32)
+        return codes, np.array(list(index), dtype=object)
+
+    @classmethod
+    def from_lists(cls, status_codes, application_days, last_activity_days, sources, companies):
+        source, source_names = cls._encode(sources)
+        company, company_names = cls._encode(companies)
+        return cls(
+            np.asarray(status_codes, dtype=np.int8),
+            np.asarray(application_days, dtype=np.int32),
+            np.asarray(last_activity_days, dtype=np.int32),
+            source, source_names, company, company_names,
+        )
+
+    @classmethod
+    def from_applications(cls, applications):
+        applications = list(applications)
+        return cls.from_lists(
+            [app.status_code for app in applications],
+            [app.application_ordinal for app in applications],
+            [app.last_activity_ordinal for app in applications],
+            [app.source_of_listing or "" for app in applications],
+            [app.company_name for app in applications],
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Builds the frame from an ApplicationColumns without per-object work. The array
+        columns are copied (one memcpy each), so the frame is a snapshot: later appends or
+        status updates on columns neither fail nor show up in it.
+        """
+        return cls.from_lists(
+            np.array(columns.status_code, dtype=np.int8),
+            np.array(columns.application_ordinal, dtype=np.int32),
+            np.array(columns.last_activity_ordinal, dtype=np.int32),
+            [source or "" for source in columns.source_of_listing],
+            columns.company_name,
+        )
+
+    @classmethod
+    def from_store(cls, store):
+        """Reads only the needed columns straight from an ApplicationStore's database."""
+        rows = store.conn.execute(
+            "SELECT status, application_date, last_activity_date, COALESCE(source_of_listing, ''), company_name "
+            "FROM applications"
+        ).fetchall()
+        if not rows:
+            return cls.from_lists([], [], [], [], [])
+        statuses, application_dates, last_dates, sources, companies = zip(*rows)
+        status_codes = [STATUS_CODES.get(status, JobApplication.DEFAULT_STATUS_CODE) for status in statuses]
+        return cls.from_lists(status_codes, _iso_dates_to_ordinals(application_dates),
+                              _iso_dates_to_ordinals(last_dates), sources, companies)
+
+
+def _iso_dates_to_ordinals(values):
+    """Vectorized YYYY-MM-DD -> date ordinal; missing or malformed dates become NO_DATE."""
+    dates = np.array([value or "NaT" for value in values], dtype=object)
+    try:
+        days = dates.astype('datetime64[D]')
+    except ValueError:
+        days = np.array([_safe_datetime64(value) for value in dates], dtype='datetime64[D]')
+    # Days since 1970-01-01 plus the ordinal of the epoch gives proleptic Gregorian ordinals.
+    ordinals = days.astype(np.int64) + 719163
+    return np.where(np.isnat(days), NO_DATE, ordinals).astype(np.int32)
+
+
+def _safe_datetime64(value):
+    try:
+        return np.datetime64(value, 'D')
+    except ValueError:
+        return np.datetime64('NaT')
+
+
+def funnel(frame):
+    """
+    Counts how many applications reached each funnel stage and the conversion rate
+    from the previous stage. Returns a list of (stage, reached_count, conversion).
+    """
+    reached = STAGE_REACHED[frame.status]
+    per_stage = np.bincount(reached, minlength=len(FUNNEL_STAGES))
+    reached_at_least = np.cumsum(per_stage[::-1])[::-1]
+    previous = np.concatenate(([reached_at_least[0]], reached_at_least[:-1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        conversion = np.where(previous > 0, reached_at_least / previous, 0.0)
+    return [(stage, int(count), float(rate))
+            for stage, count, rate in zip(FUNNEL_STAGES, reached_at_least, conversion)]
+
+
+def time_in_stage(frame, percentiles=(25, 50, 75, 90)):
+    """
+    Days from application_date to last_activity_date, grouped by current status.
+    Returns {status: {'count', 'mean', 'p25', 'p50', ...}} for statuses with dated records.
+    """
+    dated = (frame.application_day != NO_DATE) & (frame.last_activity_day != NO_DATE)
+    days = (frame.last_activity_day[dated] - frame.application_day[dated]).astype(np.int32)
+    status = frame.status[dated]
+    if not len(days):
+        return {}
+    order = np.argsort(status, kind='stable')
+    status_sorted = status[order]
+    days_sorted = days[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(status_sorted)) + 1))
+    result = {}
+    for group_status, group_days in zip(status_sorted[starts], np.split(days_sorted, starts[1:])):
+        stats = {'count': int(len(group_days)), 'mean': float(group_days.mean())}
+        for p, value in zip(percentiles, np.percentile(group_days, percentiles)):
+            stats[f'p{p}'] = float(value)
+        result[STATUSES[group_status]] = stats
+    return result
+
+
+def response_rates(frame, by='source', min_applied=1):
+    """
+    Share of sent applications that got any response (a stage past 'Applied', or a rejection),
+    grouped by 'source' or 'company'. Returns a list of (name, applied, responded, rate),
+    highest rate first.
+    """
+    codes, names = (frame.source, frame.source_names) if by == 'source' else (frame.company, frame.company_names)
+    applied = np.bincount(codes, weights=_APPLIED[frame.status], minlength=len(names))
+    responded = np.bincount(codes, weights=_RESPONDED[frame.status], minlength=len(names))
+    keep = np.flatnonzero(applied >= min_applied)
+    rates = responded[keep] / applied[keep]
+    order = keep[np.lexsort((-applied[keep], -rates))]
+    return [(str(names[i]), int(applied[i]), int(responded[i]), float(responded[i] / applied[i])) for i in order]
+
+
+def print_pipeline_report(frame, top=10):
+    """Prints the funnel, time-in-stage and response-rate summaries."""
+    print(f"\n--- Pipeline Analytics ({len(frame)} applications) ---")
+    print("\nFunnel (reached stage / conversion from previous stage):")
+    for stage, count, rate in funnel(frame):
+        print(f"  {stage:<32} {count:>7}  {rate:6.1%}")
+
+    print("\nDays from application to last activity, by current status:")
+    for status, stats in time_in_stage(frame).items():
+        print(f"  {status:<32} n={stats['count']:<6} median={stats['p50']:.0f}d  p90={stats['p90']:.0f}d")
+
+    for by in ('source', 'company'):
+        print(f"\nResponse rate by {by} (top {top}):")
+        for name, applied, responded, rate in response_rates(frame, by)[:top]:
+            print(f"  {name or 'N/A':<32} {responded:>5}/{applied:<5} {rate:6.1%}")
@@ -0,0 +1,275 @@
+import collections
+import datetime
+
+from tracker_models import JobApplication
+
+CREATED = 'created'
+STATUS_CHANGED = 'status_changed'
+NOTE_ADDED = 'note_added'
+DELETED = 'deleted'
+
+OFFER_STATUSES = {"Offer Extended", "Offer Accepted", "Offer Declined"}
+CLOSED_STATUSES = {"Offer Accepted", "Offer Declined", "Rejected", "Withdrew Application"}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS application_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        app_id INTEGER NOT NULL,
+        event_type TEXT NOT NULL,
+        company_name TEXT,
+        from_status TEXT,
+        to_status TEXT,
+        note TEXT,
+        occurred_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_application_events_app ON application_events (app_id, seq);
+
+    -- Materialized views, kept up to date by EventLog on every append.
+    CREATE TABLE IF NOT EXISTS app_state (
+        app_id INTEGER PRIMARY KEY,
+        company_name TEXT,
+        status TEXT,
+        last_event_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS status_counts (
+        status TEXT PRIMARY KEY,
+        count INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS company_summary (
+        company_name TEXT PRIMARY KEY,
+        applications INTEGER NOT NULL,
+        active INTEGER NOT NULL,
+        offers INTEGER NOT NULL,
+        rejections INTEGER NOT NULL,
+        last_event_at TEXT
+    );
+"""
+
+UPSERT_COMPANY = """
+    INSERT INTO company_summary (company_name, applications, active, offers, rejections, last_event_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(company_name) DO UPDATE SET
+        applications = applications + excluded.applications,
+        active = active + excluded.active,
+        offers = offers + excluded.offers,
+        rejections = rejections + excluded.rejections,
+        last_event_at = MAX(COALESCE(last_event_at, ''), excluded.last_event_at)
+"""
+
+UPSERT_STATUS_COUNT = """
+    INSERT INTO status_counts (status, count) VALUES (?, ?)
+    ON CONFLICT(status) DO UPDATE SET count = count + excluded.count
+"""
+
+
+def _now():
+    """The current time in UTC, formatted like the applications table's CURRENT_TIMESTAMP dates (with a 'T')."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None).isoformat(timespec='seconds')
+
+
+def _company_deltas(status, sign):
+    """(applications, active, offers, rejections) contribution of one application in `status`."""
+    return (
+        sign,
+        sign if status not in CLOSED_STATUSES else 0,
+        sign if status in OFFER_STATUSES else 0,
+        sign if status == "Rejected" else 0,
+    )
+
+
+class EventLog:
+    """
+    Append-only log of application events (creation, status changes, notes, deletion)
+    stored next to the applications table, with materialized views updated incrementally:
+    app_state (current status per application), status_counts and company_summary.
+
+    Each append and its view updates share one transaction (via ApplicationStore.batch()),
+    so the views never drift from the log; replay() rebuilds them from the log if needed.
+    Changes made to the applications table without going through the log (e.g. by the web
+    frontend) are caught up by sync_with_store(). Event times are UTC, like the table's dates.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.conn = store.conn
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # --- Appending events -------------------------------------------------
+
+    def _append(self, app_id, event_type, company_name=None, from_status=None, to_status=None, note=None,
+                occurred_at=None):
+        occurred_at = occurred_at or _now()
+        self.conn.execute(
+            "INSERT INTO application_events (app_id, event_type, company_name, from_status, to_status, note, "
+            "occurred_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (app_id, event_type, company_name, from_status, to_status, note, occurred_at)
+        )
+        return occurred_at
+
+    def _apply_company(self, company_name, status, sign, occurred_at):
+        self.conn.execute(UPSERT_COMPANY, (company_name,) + _company_deltas(status, sign) + (occurred_at,))
+
+    def record_created(self, app, occurred_at=None):
+        """Logs a newly stored application (app.app_id must be set)."""
+        with self.store.batch():
+            occurred_at = self._append(app.app_id, CREATED, app.company_name, to_status=app.status,
+                                       occurred_at=occurred_at)
+            self.conn.execute("INSERT OR REPLACE INTO app_state (app_id, company_name, status, last_event_at) "
+                              "VALUES (?, ?, ?, ?)", (app.app_id, app.company_name, app.status, occurred_at))
+            self.conn.execute(UPSERT_STATUS_COUNT, (app.status, 1))
+            self._apply_company(app.company_name, app.status, 1, occurred_at)
+
+    def record_status_change(self, app, old_status, occurred_at=None):
+        """Logs a status change from old_status to app.status."""
+        if old_status == app.status:
+            return
+        with self.store.batch():
+            occurred_at = self._append(app.app_id, STATUS_CHANGED, app.company_name, old_status, app.status,
+                                       occurred_at=occurred_at)
+            self.conn.execute("UPDATE app_state SET status = ?, last_event_at = ? WHERE app_id = ?",
+                              (app.status, occurred_at, app.app_id))
+            self.conn.execute(UPSERT_STATUS_COUNT, (old_status, -1))
+            self.conn.execute(UPSERT_STATUS_COUNT, (app.status, 1))
+            self._apply_company(app.company_name, old_status, -1, occurred_at)
+            self._apply_company(app.company_name, app.status, 1, occurred_at)
+
+    def record_note(self, app, note, occurred_at=None):
+        with self.store.batch():
+            occurred_at = self._append(app.app_id, NOTE_ADDED, app.company_name, note=note, occurred_at=occurred_at)
+            self.conn.execute("UPDATE app_state SET last_event_at = ? WHERE app_id = ?", (occurred_at, app.app_id))
+            self.conn.execute("UPDATE company_summary SET last_event_at = ? WHERE company_name = ?",
+                              (occurred_at, app.company_name))
+
+    def record_deleted(self, app_id, occurred_at=None):
+        row = self.conn.execute("SELECT company_name, status FROM app_state WHERE app_id = ?", (app_id,)).fetchone()
+        if row is None:
+            return
+        company_name, status = row
+        with self.store.batch():
+            occurred_at = self._append(app_id, DELETED, company_name, from_status=status, occurred_at=occurred_at)
+            self.conn.execute("DELETE FROM app_state WHERE app_id = ?", (app_id,))
+            self.conn.execute(UPSERT_STATUS_COUNT, (status, -1))
+            self._apply_company(company_name, status, -1, occurred_at)
+
+    # --- Reading the views --------------------------------------------------
+
+    def status_counts(self):
+        """{status: count} for every predefined status, read from the materialized view."""
+        counts = dict.fromkeys(JobApplication.PREDEFINED_STATUSES, 0)
+        counts.update(self.conn.execute("SELECT status, count FROM status_counts WHERE count != 0"))
+        return counts
+
+    def company_summary(self, company_name=None):
+        """Rows of (company, applications, active, offers, rejections, last_event_at)."""
+        if company_name is not None:
+            return self.conn.execute("SELECT * FROM company_summary WHERE company_name = ?",
+                                     (company_name,)).fetchall()
+        return self.conn.execute("SELECT * FROM company_summary WHERE applications > 0 "
+                                 "ORDER BY applications DESC, company_name").fetchall()
+
+    def history(self, app_id):
+        return self.conn.execute(
+            "SELECT seq, event_type, from_status, to_status, note, occurred_at FROM application_events "
+            "WHERE app_id = ? ORDER BY seq", (app_id,)
+        ).fetchall()
+
+    def stage_durations(self, status):
+        """
+        Days each application spent in `status`, from the event that moved it in to the
+        next status change (applications still in the stage are measured up to now).
+        """
+        rows = self.conn.execute("""
+            SELECT julianday(COALESCE(next_at, ?)) - julianday(occurred_at)
+            FROM (
+                SELECT to_status, occurred_at, event_type,
+                       LEAD(occurred_at) OVER (PARTITION BY app_id ORDER BY seq) AS next_at
+                FROM application_events
+                WHERE event_type IN (?, ?, ?)
+            )
+            WHERE to_status = ?
+        """, (_now(), CREATED, STATUS_CHANGED, DELETED, status))
+        return [days for (days,) in rows]
+
+    # --- Replay and compaction ----------------------------------------------
+
+    def replay(self):
+        """
+        Rebuilds app_state, status_counts and company_summary from the event log in a
+        single ordered pass, replacing whatever the views currently hold.
+        """
+        state = {}
+        for app_id, event_type, company_name, to_status, occurred_at in self.conn.execute(
+                "SELECT app_id, event_type, company_name, to_status, occurred_at FROM application_events ORDER BY seq"):
+            if event_type == DELETED:
+                state.pop(app_id, None)
+            elif event_type in (CREATED, STATUS_CHANGED):
+                state[app_id] = [company_name, to_status, occurred_at]
+            elif app_id in state:
+                state[app_id][2] = occurred_at
+
+        status_counts = collections.Counter()
+        companies = {}
+        for company_name, status, occurred_at in state.values():
+            status_counts[status] += 1
+            summary = companies.setdefault(company_name, [0, 0, 0, 0, ''])
+            for i, delta in enumerate(_company_deltas(status, 1)):
+                summary[i] += delta
+            summary[4] = max(summary[4], occurred_at)
+
+        with self.store.batch():
+            self.conn.execute("DELETE FROM app_state")
+            self.conn.execute("DELETE FROM status_counts")
+            self.conn.execute("DELETE FROM company_summary")
+            self.conn.executemany("INSERT INTO app_state (app_id, company_name, status, last_event_at) "
+                                  "VALUES (?, ?, ?, ?)", [(app_id,) + tuple(v) for app_id, v in state.items()])
+            self.conn.executemany("INSERT INTO status_counts (status, count) VALUES (?, ?)", status_counts.items())
+            self.conn.executemany("INSERT INTO company_summary VALUES (?, ?, ?, ?, ?, ?)",
+                                  [(name,) + tuple(v) for name, v in companies.items()])
+        return len(state)
+
+    def compact(self):
+        """
+        Drops the history of deleted applications (nothing reads it any more), rebuilds the
+        views and reclaims the space. Status and note history of live applications is kept.
+        """
+        with self.store.batch():
+            removed = self.conn.execute("""
+                DELETE FROM application_events
+                WHERE app_id IN (SELECT app_id FROM application_events WHERE event_type = ?)
+            """, (DELETED,)).rowcount
+        self.replay()
+        self.conn.execute("VACUUM")
+        return removed
+
+    def sync_with_store(self):
+        """
+        Logs the changes made to the applications table without going through the log
+        (rows added before the log existed, or added, edited or deleted by the web
+        frontend): 'created' for applications missing from app_state, 'status_changed'
+        where the stored status or company differs from it and 'deleted' for applications
+        no longer stored, then rebuilds the views. Returns the number of events logged.
+        """
+        now = _now()
+        with self.store.batch():
+            logged = self.conn.execute("""
+                INSERT INTO application_events (app_id, event_type, company_name, to_status, occurred_at)
+                SELECT a.id, ?, a.company_name, a.status, COALESCE(REPLACE(a.created_at, ' ', 'T'), ?)
+                FROM applications a
+                WHERE NOT EXISTS (SELECT 1 FROM app_state s WHERE s.app_id = a.id)
+            """, (CREATED, now)).rowcount
+            logged += self.conn.execute("""
+                INSERT INTO application_events (app_id, event_type, company_name, from_status, to_status, occurred_at)
+                SELECT a.id, ?, a.company_name, s.status, a.status, COALESCE(REPLACE(a.updated_at, ' ', 'T'), ?)
+                FROM applications a JOIN app_state s ON s.app_id = a.id
+                WHERE s.status IS NOT a.status OR s.company_name IS NOT a.company_name
+            """, (STATUS_CHANGED, now)).rowcount
+            logged += self.conn.execute("""
+                INSERT INTO application_events (app_id, event_type, company_name, from_status, occurred_at)
+                SELECT s.app_id, ?, s.company_name, s.status, ?
+                FROM app_state s
+                WHERE NOT EXISTS (SELECT 1 FROM applications a WHERE a.id = s.app_id)
+            """, (DELETED, now)).rowcount
+        if logged:
+            self.replay()
+        return logged
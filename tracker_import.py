@@ -0,0 +1,252 @@
+import csv
+import datetime
+import json
+import re
+
+import csv_merge
+from tracker_models import NO_DATE, JobApplication
+
+DEFAULT_STATUS = "Wishlist/To Apply"
+DEFAULT_ROLE = "Unspecified role"
+
+# Free-text statuses seen in hand-kept sheets, keyed by normalize_status_text(). Anything
+# not listed falls back to DEFAULT_STATUS and the original text is kept in the notes.
+STATUS_ALIASES = {
+    "no roles": DEFAULT_STATUS, # Nothing open yet: keep the company on the wishlist
+    "no openings": DEFAULT_STATUS,
+    "to apply": DEFAULT_STATUS,
+    "wishlist": DEFAULT_STATUS,
+    "resume": "Applied",
+    "resume sent": "Applied",
+    "applied": "Applied",
+    "submitted": "Applied",
+    "oa": "Online Assessment",
+    "assessment": "Online Assessment",
+    "coding test": "Online Assessment",
+    "hr": "HR Screening",
+    "recruiter": "HR Screening",
+    "phone screen": "HR Screening",
+    "screen": "HR Screening",
+    "interview": "Technical Interview (Round 1)",
+    "tech interview": "Technical Interview (Round 1)",
+    "technical interview": "Technical Interview (Round 1)",
+    "hiring manager": "Hiring Manager Interview",
+    "onsite": "On-site/Final Interview",
+    "on site": "On-site/Final Interview",
+    "final": "On-site/Final Interview",
+    "offer": "Offer Extended",
+    "accepted": "Offer Accepted",
+    "declined": "Offer Declined",
+    "rejected": "Rejected",
+    "reject": "Rejected",
+    "withdrew": "Withdrew Application",
+    "withdrawn": "Withdrew Application",
+}
+
+# Date formats accepted in import files, tried in order.
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%b %d, %Y", "%B %d, %Y", "%d %b %Y"]
+
+SHEET_DATE_COLUMNS = ["Application Date", "Date Applied", "Date"]
+
+EXPORT_FIELDNAMES = ["Company", "URL", "Role", "Status", "Resume", "Notes", "Application Date",
+                     "Last Activity", "Source", "Location", "Job ID"]
+
+_NON_WORD = re.compile(r"[^a-z0-9+]+")
+
+
+def normalize_status_text(text):
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def build_status_lookup():
+    """normalized text -> status code, covering every predefined status and STATUS_ALIASES."""
+    lookup = {normalize_status_text(status): code for status, code in JobApplication.STATUS_CODES.items()}
+    for alias, status in STATUS_ALIASES.items():
+        lookup[normalize_status_text(alias)] = JobApplication.STATUS_CODES[status]
+    return lookup
+
+
+STATUS_LOOKUP = build_status_lookup()
+
+
+def map_status(text):
+    """
+    Maps a free-text status onto a status code. Returns (code, leftover): leftover is
+    the original text when it had no mapping (so it can be kept as a note), else None.
+    """
+    key = normalize_status_text(text or "")
+    if not key:
+        return JobApplication.DEFAULT_STATUS_CODE, None
+    code = STATUS_LOOKUP.get(key)
+    if code is None:
+        return JobApplication.DEFAULT_STATUS_CODE, text.strip()
+    return code, None
+
+
+def parse_dates(values):
+    """
+    Parses many date strings to ordinals, each distinct string once (imports repeat the
+    same few dates). Blank or unparseable values become NO_DATE.
+    """
+    parsed = {}
+    ordinals = []
+    for value in values:
+        value = (value or "").strip()
+        ordinal = parsed.get(value)
+        if ordinal is None:
+            ordinal = NO_DATE
+            text = value.replace('Sept ', 'Sep ') # %b only knows three-letter month names
+            for date_format in DATE_FORMATS if value else ():
+                try:
+                    ordinal = datetime.datetime.strptime(text, date_format).toordinal()
+                    break
+                except ValueError:
+                    continue
+            parsed[value] = ordinal
+        ordinals.append(ordinal)
+    return ordinals
+
+
+def dedupe_key(company_name, link, job_title=""):
+    """Company (canonical, as in the career URL merge) plus the posting link, or the title when there is no link."""
+    link = (link or "").strip().rstrip('/')
+    return csv_merge.company_key(company_name), link or f"title:{job_title.strip().lower()}"
+
+
+def _new_application(company_name, job_title, link, status_code, application_ordinal=NO_DATE,
+                     source_of_listing="", location="", notes=""):
+    # Dates and statuses are already resolved in bulk, so bypass the per-record parsing in __init__.
+    app = JobApplication(company_name, job_title, None, source_of_listing=source_of_listing,
+                         job_description_link=link, location=location, notes=notes)
+    app.status_code = status_code
+    app.application_ordinal = application_ordinal
+    return app
+
+
+def applications_from_sheet(filepath):
+    """
+    Reads Companies - Sheet1.csv (Company, URL, Role, Status, Resume, Notes, and optionally
+    an application date column) into JobApplication objects.
+    """
+    with open(filepath, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        if not reader.fieldnames or 'Company' not in reader.fieldnames:
+            print(f"Error: 'Company' column not found in header of '{filepath}': {reader.fieldnames}")
+            return []
+        date_column = next((column for column in SHEET_DATE_COLUMNS if column in reader.fieldnames), None)
+        rows = [row for row in reader if (row.get('Company') or '').strip()]
+
+    ordinals = parse_dates(row.get(date_column) for row in rows) if date_column else [NO_DATE] * len(rows)
+    apps = []
+    for row, ordinal in zip(rows, ordinals):
+        status_code, leftover = map_status(row.get('Status'))
+        notes = (row.get('Notes') or '').strip()
+        if leftover:
+            notes = f"Status in sheet: {leftover}" + (f"\n{notes}" if notes else "")
+        app = _new_application(row['Company'].strip(), (row.get('Role') or '').strip() or DEFAULT_ROLE,
+                               (row.get('URL') or '').strip(), status_code, ordinal, "Companies sheet",
+                               notes=notes)
+        resume = (row.get('Resume') or '').strip()
+        if resume:
+            app.resume_version = resume
+        apps.append(app)
+    return apps
+
+
+def applications_from_crawl_results(results):
+    """
+    Turns crawl results (dicts from crawl_career_pages or lines of the scrape pipeline's
+    JSON lines output) into Wishlist applications, one per posting or job link.
+    """
+    apps = []
+    wishlist = JobApplication.DEFAULT_STATUS_CODE
+    for result in results:
+        if result.get('error'):
+            continue
+        source = "Scraper" if result.get('source', 'html') == 'html' else f"Scraper ({result['source']})"
+        if result.get('postings'):
+            for posting in result['postings']:
+                apps.append(_new_application(result['Company'], posting['title'] or DEFAULT_ROLE, posting['url'],
+                                             wishlist, source_of_listing=source, location=posting['location'] or ""))
+        else:
+            for link in result.get('links', []):
+                apps.append(_new_application(result['Company'], DEFAULT_ROLE, link, wishlist,
+                                             source_of_listing=source))
+    return apps
+
+
+def read_crawl_results(jsonl_path):
+    """Streams result dicts from a scrape pipeline JSON lines file."""
+    with open(jsonl_path, mode='r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_applications(store, apps, events=None):
+    """
+    Adds the applications that aren't tracked yet (see dedupe_key; also de-duplicated
+    within apps) in a single transaction, logging a 'created' event for each if an
+    EventLog is given. Returns {'read', 'added', 'duplicates'}.
+    """
+    seen = {dedupe_key(company_name, link, job_title) for company_name, link, job_title in
+            store.conn.execute("SELECT company_name, job_link, job_title FROM applications")}
+    stats = {'read': 0, 'added': 0, 'duplicates': 0}
+    with store.batch():
+        for app in apps:
+            stats['read'] += 1
+            key = dedupe_key(app.company_name, app.job_description_link, app.job_title)
+            if key in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(key)
+            store.add(app)
+            if events is not None:
+                events.record_created(app)
+            stats['added'] += 1
+    return stats
+
+
+def export_applications(store, filepath):
+    """
+    Writes every tracked application to a CSV in the Companies - Sheet1.csv layout (plus
+    dates, source, location and job id), straight from the database. Returns the row count.
+    """
+    count = 0
+
+    def rows():
+        nonlocal count
+        for row in store.conn.execute(
+                "SELECT company_name, job_link, job_title, status, resume_version, notes, application_date, "
+                "last_activity_date, source_of_listing, location, job_id FROM applications ORDER BY id"):
+            count += 1
+            yield ["" if value is None else value for value in row]
+
+    csv_merge.write_csv_atomically(filepath, EXPORT_FIELDNAMES, rows())
+    return count
+
+
+if __name__ == '__main__':
+    import sys
+
+    from tracker_events import EventLog
+    from tracker_store import ApplicationStore
+
+    usage = ("Usage: python tracker_import.py sheet <Companies - Sheet1.csv> | crawl <results.jsonl> "
+             "| export <out.csv>")
+    if len(sys.argv) != 3 or sys.argv[1] not in ('sheet', 'crawl', 'export'):
+        print(usage)
+        sys.exit(1)
+    command, path = sys.argv[1], sys.argv[2]
+    store = ApplicationStore()
+    if command == 'export':
+        print(f"Exported {export_applications(store, path)} applications to '{path}'.")
+    else:
+        apps = applications_from_sheet(path) if command == 'sheet' else applications_from_crawl_results(
+            read_crawl_results(path))
+        events = EventLog(store)
+        events.sync_with_store()
+        stats = import_applications(store, apps, events)
+        print(f"Imported {stats['added']} of {stats['read']} applications from '{path}' "
+              f"({stats['duplicates']} already tracked).")
+    store.close()
@@ -1,8 +1,40 @@
+import array
 import datetime
 
+# Ordinal 0 is never a real date (date.min is ordinal 1), so it stands for "no date".
+NO_DATE = 0
+
+
+def parse_date_ordinal(date_str):
+    """Parses YYYY-MM-DD into a date ordinal. Returns NO_DATE for None; raises ValueError on bad input."""
+    if date_str is None:
+        return NO_DATE
+    if len(date_str) == 10:
+        try:
+            return datetime.date.fromisoformat(date_str).toordinal()
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(date_str, "%Y-%m-%d").date().toordinal()
+
+
+def ordinal_to_date(ordinal):
+    return datetime.date.fromordinal(ordinal) if ordinal else None
+
+
+def date_to_ordinal(value):
+    return value.toordinal() if value else NO_DATE
+
+
 class JobApplication:
     """
     Represents a single job application.
+
+    Stored compactly for large trackers: __slots__ instead of a per-instance __dict__,
+    the status as an index into PREDEFINED_STATUSES, dates as ordinals and notes as an
+    append-only list of (date ordinal, text) entries. The status, date and notes
+    attributes are exposed as properties with the same values as before. A status outside
+    PREDEFINED_STATUSES read back from the shared store (the frontend accepts any text) is
+    kept verbatim in custom_status, so saving the application again doesn't overwrite it.
     """
 
     PREDEFINED_STATUSES = [
@@ -20,6 +52,14 @@ class JobApplication:
         "Rejected",
         "Withdrew Application"
     ]
+    STATUS_CODES = {status: code for code, status in enumerate(PREDEFINED_STATUSES)}
+    DEFAULT_STATUS_CODE = 0 # "Wishlist/To Apply"
+
+    __slots__ = (
+        'company_name', 'job_title', 'job_id', 'source_of_listing', 'job_description_link',
+        'location', 'salary_expectation', 'resume_version', 'cover_letter_version', 'app_id',
+        'status_code', 'custom_status', 'application_ordinal', 'last_activity_ordinal', 'note_entries',
+    )
 
     def __init__(self, company_name, job_title, application_date_str,
                  source_of_listing="", job_id="", job_description_link="",
@@ -29,29 +69,73 @@ class JobApplication:
         self.job_title = job_title
         self.job_id = job_id # Optional
         
+        self.app_id = None # Assigned by ApplicationStore once saved
         try:
-            self.application_date = datetime.datetime.strptime(application_date_str, "%Y-%m-%d").date()
+            self.application_ordinal = parse_date_ordinal(application_date_str)
         except ValueError:
             print(f"Warning: Invalid application_date format for {job_title} at {company_name}. Please use YYYY-MM-DD. Setting to None.")
-            self.application_date = None
+            self.application_ordinal = NO_DATE
             
         self.source_of_listing = source_of_listing
         self.job_description_link = job_description_link # Link, or could be text
         self.location = location # Could be a string like "City, State, Country" or "Remote"
         self.salary_expectation = salary_expectation # Optional, string for now
         
-        if status not in self.PREDEFINED_STATUSES:
+        status_code = self.STATUS_CODES.get(status)
+        if status_code is None:
             print(f"Warning: Status '{status}' is not a predefined status. Defaulting to 'Wishlist/To Apply'.")
-            self.status = "Wishlist/To Apply"
-        else:
-            self.status = status
+            status_code = self.DEFAULT_STATUS_CODE
+        self.status_code = status_code
+        self.custom_status = None # Set only for statuses loaded from the store that aren't predefined
             
-        self.last_activity_date = datetime.date.today() # Initialize with creation date
-        self.notes = notes # General notes area
+        self.last_activity_ordinal = datetime.date.today().toordinal() # Initialize with creation date
+        # General notes area. Initial notes are kept verbatim (no date); add_note() entries are dated.
+        # The list is only allocated once there is a note, which most scraped entries never get.
+        self.note_entries = [(NO_DATE, notes)] if notes else None
         self.resume_version = None # To be linked later
         self.cover_letter_version = None # To be linked later
 
+    @property
+    def status(self):
+        return self.custom_status or self.PREDEFINED_STATUSES[self.status_code]
+
+    @status.setter
+    def status(self, value):
+        self.status_code = self.STATUS_CODES[value]
+        self.custom_status = None
+
+    @property
+    def application_date(self):
+        return ordinal_to_date(self.application_ordinal)
+
+    @application_date.setter
+    def application_date(self, value):
+        self.application_ordinal = date_to_ordinal(value)
+
+    @property
+    def last_activity_date(self):
+        return ordinal_to_date(self.last_activity_ordinal)
+
+    @last_activity_date.setter
+    def last_activity_date(self, value):
+        self.last_activity_ordinal = date_to_ordinal(value)
+
+    @property
+    def notes(self):
+        """All notes rendered as one string, in the same format add_note() always produced."""
+        if not self.note_entries:
+            return ""
+        return "\n".join(
+            f"[{datetime.date.fromordinal(ordinal)}] {text}" if ordinal else text
+            for ordinal, text in self.note_entries
+        )
+
+    @notes.setter
+    def notes(self, value):
+        self.note_entries = [(NO_DATE, value)] if value else None
+
     def __str__(self):
+        notes = self.notes
         return (f"Company: {self.company_name}\n"
                 f"Title: {self.job_title}\n"
                 f"Job ID: {self.job_id or 'N/A'}\n"
@@ -62,23 +146,107 @@ class JobApplication:
                 f"Description Link: {self.job_description_link or 'N/A'}\n"
                 f"Salary Expectation: {self.salary_expectation or 'N/A'}\n"
                 f"Last Activity: {self.last_activity_date}\n"
-                f"Notes: {self.notes[:50] + '...' if self.notes and len(self.notes) > 50 else self.notes or 'N/A'}\n"
+                f"Notes: {notes[:50] + '...' if notes and len(notes) > 50 else notes or 'N/A'}\n"
                 f"--------------------")
 
     def update_status(self, new_status):
-        if new_status in self.PREDEFINED_STATUSES:
-            self.status = new_status
-            self.last_activity_date = datetime.date.today()
+        status_code = self.STATUS_CODES.get(new_status)
+        if status_code is not None:
+            self.status_code = status_code
+            self.custom_status = None
+            self.last_activity_ordinal = datetime.date.today().toordinal()
             print(f"Status for '{self.job_title}' at '{self.company_name}' updated to '{new_status}'.")
         else:
             print(f"Error: '{new_status}' is not a valid predefined status.")
 
     def add_note(self, note):
-        if self.notes:
-            self.notes += f"\n[{datetime.date.today()}] {note}"
-        else:
-            self.notes = f"[{datetime.date.today()}] {note}"
-        self.last_activity_date = datetime.date.today()
+        today = datetime.date.today().toordinal()
+        if self.note_entries is None:
+            self.note_entries = []
+        self.note_entries.append((today, note)) # O(1); the old string concatenation was quadratic
+        self.last_activity_ordinal = today
+
+
+class ApplicationColumns:
+    """
+    Optional column-oriented collection of applications for bulk operations.
+
+    Each field is its own list (or array.array for the small integer fields), so counting
+    or filtering by status or date touches one compact column instead of every object.
+    Rows can be materialized back into JobApplication objects with row().
+    """
+
+    STRING_FIELDS = ('company_name', 'job_title', 'job_id', 'source_of_listing', 'job_description_link',
+                     'location', 'salary_expectation')
+
+    def __init__(self):
+        self.app_id = []
+        for field in self.STRING_FIELDS:
+            setattr(self, field, [])
+        self.status_code = array.array('b')
+        self.custom_status = []
+        self.application_ordinal = array.array('i')
+        self.last_activity_ordinal = array.array('i')
+        self.note_entries = []
+
+    @classmethod
+    def from_applications(cls, applications):
+        columns = cls()
+        columns.extend(applications)
+        return columns
+
+    def __len__(self):
+        return len(self.status_code)
+
+    def append(self, app):
+        self.app_id.append(app.app_id)
+        for field in self.STRING_FIELDS:
+            getattr(self, field).append(getattr(app, field))
+        self.status_code.append(app.status_code)
+        self.custom_status.append(app.custom_status)
+        self.application_ordinal.append(app.application_ordinal)
+        self.last_activity_ordinal.append(app.last_activity_ordinal)
+        self.note_entries.append(list(app.note_entries) if app.note_entries else None)
+
+    def extend(self, applications):
+        for app in applications:
+            self.append(app)
+
+    def count_by_status(self):
+        """Returns {status: count} for every predefined status."""
+        counts = [0] * len(JobApplication.PREDEFINED_STATUSES)
+        for code in self.status_code:
+            counts[code] += 1
+        return dict(zip(JobApplication.PREDEFINED_STATUSES, counts))
+
+    def indices_with_status(self, status):
+        code = JobApplication.STATUS_CODES[status]
+        return [i for i, value in enumerate(self.status_code) if value == code]
+
+    def bulk_update_status(self, indices, new_status, on_date=None):
+        """Sets the status (and last activity date) of many rows at once."""
+        code = JobApplication.STATUS_CODES[new_status]
+        ordinal = (on_date or datetime.date.today()).toordinal()
+        for i in indices:
+            self.status_code[i] = code
+            self.custom_status[i] = None
+            self.last_activity_ordinal[i] = ordinal
+
+    def row(self, i):
+        """Materializes row i as a JobApplication."""
+        app = JobApplication.__new__(JobApplication)
+        app.app_id = self.app_id[i]
+        for field in self.STRING_FIELDS:
+            setattr(app, field, getattr(self, field)[i])
+        app.status_code = self.status_code[i]
+        app.custom_status = self.custom_status[i]
+        app.application_ordinal = self.application_ordinal[i]
+        app.last_activity_ordinal = self.last_activity_ordinal[i]
+        entries = self.note_entries[i]
+        app.note_entries = list(entries) if entries else None
+        app.resume_version = None
+        app.cover_letter_version = None
+        return app
 
 if __name__ == '__main__':
     # Example Usage:
@@ -0,0 +1,225 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+
+from tracker_models import JobApplication
+
+# Same database file the Astro frontend opens in src/lib/db.js, so both sides share one store.
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               'job-tracker-astro-frontend', '.astro', 'job_tracker.db')
+
+# Mirrors the table created by the Astro frontend (src/lib/db.js).
+CREATE_APPLICATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS applications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_name TEXT NOT NULL,
+        job_title TEXT NOT NULL,
+        application_date TEXT,
+        status TEXT,
+        job_link TEXT,
+        notes TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+CREATE_UPDATED_AT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS update_applications_updated_at
+    AFTER UPDATE ON applications
+    FOR EACH ROW
+    BEGIN
+        UPDATE applications SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    END
+"""
+
+# Fields the Python tracker has that the frontend's table doesn't; added as nullable columns.
+EXTRA_COLUMNS = {
+    'source_of_listing': 'TEXT',
+    'job_id': 'TEXT',
+    'location': 'TEXT',
+    'salary_expectation': 'TEXT',
+    'last_activity_date': 'TEXT',
+    'resume_version': 'TEXT',
+    'cover_letter_version': 'TEXT',
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_last_activity ON applications (last_activity_date)",
+]
+
+SELECT_COLUMNS = ("id, company_name, job_title, application_date, status, job_link, notes, "
+                  "source_of_listing, job_id, location, salary_expectation, last_activity_date, "
+                  "resume_version, cover_letter_version")
+
+INSERT_SQL = """
+    INSERT INTO applications (company_name, job_title, application_date, status, job_link, notes,
+                              source_of_listing, job_id, location, salary_expectation, last_activity_date,
+                              resume_version, cover_letter_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_SQL = """
+    UPDATE applications SET company_name = ?, job_title = ?, application_date = ?, status = ?, job_link = ?,
+                            notes = ?, source_of_listing = ?, job_id = ?, location = ?, salary_expectation = ?,
+                            last_activity_date = ?, resume_version = ?, cover_letter_version = ?
+    WHERE id = ?
+"""
+
+
+def _date_to_text(value):
+    return value.isoformat() if value else None
+
+
+def _application_params(app):
+    return (
+        app.company_name, app.job_title, _date_to_text(app.application_date), app.status,
+        app.job_description_link, app.notes, app.source_of_listing, app.job_id, app.location,
+        app.salary_expectation, _date_to_text(app.last_activity_date), app.resume_version,
+        app.cover_letter_version,
+    )
+
+
+def _row_to_application(row):
+    (app_id, company_name, job_title, application_date, status, job_link, notes, source_of_listing,
+     job_id, location, salary_expectation, last_activity_date, resume_version, cover_letter_version) = row
+    app = JobApplication(
+        company_name=company_name,
+        job_title=job_title,
+        application_date_str=application_date,
+        source_of_listing=source_of_listing or "",
+        job_id=job_id or "",
+        job_description_link=job_link or "",
+        location=location or "",
+        salary_expectation=salary_expectation or "",
+        status=status if status in JobApplication.STATUS_CODES else "Wishlist/To Apply",
+        notes=notes or "",
+    )
+    if status and status not in JobApplication.STATUS_CODES:
+        app.custom_status = status # e.g. typed in the frontend; kept so update() writes it back unchanged
+    app.app_id = app_id
+    if last_activity_date:
+        app.last_activity_date = datetime.date.fromisoformat(last_activity_date)
+    app.resume_version = resume_version
+    app.cover_letter_version = cover_letter_version
+    return app
+
+
+class ApplicationStore:
+    """
+    SQLite-backed storage for JobApplication objects, sharing the `applications` table
+    with the Astro frontend. Uses WAL, parameterized (cached) statements and indexes on
+    company, status and last activity. Writes commit immediately unless wrapped in batch().
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, cached_statements=256)
+        self._batch_depth = 0
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        self.conn.execute(CREATE_APPLICATIONS_TABLE)
+        self.conn.execute(CREATE_UPDATED_AT_TRIGGER)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(applications)")}
+        for column, column_type in EXTRA_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE applications ADD COLUMN {column} {column_type}")
+        for statement in INDEXES:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def _maybe_commit(self):
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Groups many writes into one transaction; rolls back everything on error."""
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.conn.commit()
+
+    def add(self, app):
+        """Inserts an application, sets app.app_id and returns it."""
+        cursor = self.conn.execute(INSERT_SQL, _application_params(app))
+        app.app_id = cursor.lastrowid
+        self._maybe_commit()
+        return app.app_id
+
+    def add_many(self, apps):
+        """Inserts many applications in a single transaction."""
+        with self.batch():
+            for app in apps:
+                self.add(app)
+
+    def update(self, app):
+        """Writes every field of an already-stored application back to the database."""
+        if app.app_id is None:
+            raise ValueError("Application has not been stored yet; use add() first.")
+        self.conn.execute(UPDATE_SQL, _application_params(app) + (app.app_id,))
+        self._maybe_commit()
+
+    def delete(self, app_id):
+        self.conn.execute("DELETE FROM applications WHERE id = ?", (app_id,))
+        self._maybe_commit()
+
+    def get(self, app_id):
+        """Returns the application with this id, or None."""
+        row = self.conn.execute(f"SELECT {SELECT_COLUMNS} FROM applications WHERE id = ?", (app_id,)).fetchone()
+        return _row_to_application(row) if row else None
+
+    def search(self, text, limit=20):
+        """Case-insensitive substring search over company name and job title."""
+        pattern = f"%{text}%"
+        rows = self.conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM applications "
+            "WHERE company_name LIKE ? OR job_title LIKE ? ORDER BY id LIMIT ?",
+            (pattern, pattern, limit)
+        )
+        return [_row_to_application(row) for row in rows]
+
+    def by_company(self, company_name):
+        rows = self.conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM applications WHERE company_name = ? COLLATE NOCASE ORDER BY id",
+            (company_name,)
+        )
+        return [_row_to_application(row) for row in rows]
+
+    def by_status(self, status):
+        rows = self.conn.execute(f"SELECT {SELECT_COLUMNS} FROM applications WHERE status = ? ORDER BY id",
+                                 (status,))
+        return [_row_to_application(row) for row in rows]
+
+    def recently_active(self, limit=20):
+        rows = self.conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM applications ORDER BY last_activity_date DESC, id DESC LIMIT ?",
+            (limit,)
+        )
+        return [_row_to_application(row) for row in rows]
+
+    def iter_all(self):
+        """Streams every application in id order."""
+        for row in self.conn.execute(f"SELECT {SELECT_COLUMNS} FROM applications ORDER BY id"):
+            yield _row_to_application(row)
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
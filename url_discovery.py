@@ -0,0 +1,307 @@
+import re
+import sqlite3
+import time
+import urllib.parse
+
+import csv_merge
+from ats_adapters import detect_ats
+from company_names import canonical_company_name
+from crawl_state import DAY, state_path_for
+import job_scraper
+from link_extractor import JOB_HREF_PATTERN
+from scraper_http import HttpFetcher
+
+# Hosted job boards, probed first: a hit there also lets the crawler use the ATS JSON API.
+ATS_TEMPLATES = (
+    'https://boards.greenhouse.io/{slug}',
+    'https://jobs.lever.co/{slug}',
+)
+SITE_TEMPLATES = (
+    'https://{slug}.com',
+    'https://{slug}.io',
+    'https://{slug}.ai',
+)
+CAREER_PATHS = ('/careers', '/jobs')
+
+# Every company's board lives on the same few job board hosts, so probes to them get a budget
+# of their own (requests per second, burst; concurrent probes) instead of the per-host
+# default meant for company sites, which would stretch a backfill over hours.
+ATS_PROBE_RATE = (20.0, 20)
+ATS_MAX_PER_HOST = 16
+
+MAX_PROBE_BYTES = 512 * 1024 # Of a company-site candidate, read to look for job listings
+MIN_POSTING_LINKS = 2
+
+_SLUG_CHARS = re.compile(r"[^a-z0-9 ]")
+_CAREERS_URL = re.compile(r"career|jobs?\b|join|openings|positions", re.IGNORECASE)
+_LINKED_URL = re.compile(rb"""(?:href|src)\s*=\s*["']([^"'<>\s]+)""", re.IGNORECASE)
+_JOB_POSTING_DATA = re.compile(rb'"@type"\s*:\s*"JobPosting"')
+
+
+def company_slugs(company_name):
+    """URL slugs a company is likely to use: 'Scale AI' -> ['scaleai', 'scale-ai']."""
+    words = _SLUG_CHARS.sub('', canonical_company_name(company_name)).split()
+    if not words:
+        return []
+    slugs = [''.join(words)]
+    if len(words) > 1:
+        slugs.append('-'.join(words))
+    return slugs
+
+
+def candidate_urls(company_name, ats_templates=ATS_TEMPLATES, site_templates=SITE_TEMPLATES,
+                   career_paths=CAREER_PATHS):
+    """
+    Returns (ats_candidates, site_candidates) for a company, each a list of
+    (url, slug) pairs in order of preference.
+    """
+    slugs = company_slugs(company_name)
+    ats = [(template.format(slug=slug), slug) for slug in slugs for template in ats_templates]
+    sites = [(template.format(slug=slug) + path, slug)
+             for slug in slugs for template in site_templates for path in career_paths]
+    return ats, sites
+
+
+class ProbeCache:
+    """
+    Remembers candidate URLs that did not lead to a careers page, so repeated backfills
+    don't re-probe them until ttl seconds have passed. Stored in the crawl state database.
+    """
+
+    def __init__(self, path, ttl=7 * DAY):
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS failed_probes (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def recently_failed(self, urls, now=None):
+        """The subset of urls with a failed probe younger than the TTL."""
+        cutoff = (time.time() if now is None else now) - self.ttl
+        failed = set()
+        urls = list(urls)
+        for i in range(0, len(urls), 500): # Stay under SQLite's bound-parameter limit
+            chunk = urls[i:i + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            failed.update(url for (url,) in self.conn.execute(
+                f"SELECT url FROM failed_probes WHERE checked_at > ? AND url IN ({placeholders})", (cutoff, *chunk)))
+        return failed
+
+    def record_failures(self, failures, now=None):
+        """Stores (url, status) pairs; status is None when the request itself failed."""
+        now = time.time() if now is None else now
+        self.conn.executemany("INSERT OR REPLACE INTO failed_probes (url, status, checked_at) VALUES (?, ?, ?)",
+                              [(url, status, now) for url, status in failures])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def probe_url(url, fetcher, timeout=5):
+    """
+    Checks one candidate with a HEAD request (falling back to GET where HEAD isn't
+    allowed), following redirects. Returns (status, final_url); status is None if the
+    request failed outright.
+    """
+    try:
+        response = fetcher.request('HEAD', url, timeout=timeout)
+        if response.status_code in (403, 405, 501):
+            response = fetcher.request('GET', url, timeout=timeout)
+        response.close()
+        return response.status_code, response.url
+    except Exception:
+        return None, url
+
+
+def fetch_probe_page(url, fetcher, timeout=5, max_bytes=MAX_PROBE_BYTES):
+    """
+    GETs one company-site candidate, following redirects, and reads up to max_bytes of a
+    successful response. Returns (status, final_url, content); status is None (and
+    content empty) if the request failed outright.
+    """
+    try:
+        response = fetcher.get(url, timeout=timeout, stream=True)
+        try:
+            chunks = []
+            size = 0
+            if 200 <= response.status_code < 300:
+                for chunk in response.iter_content(64 * 1024):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= max_bytes:
+                        break
+        finally:
+            response.close()
+        return response.status_code, response.url, b"".join(chunks)[:max_bytes]
+    except Exception:
+        return None, url, b""
+
+
+def shows_job_listings(content, page_url):
+    """
+    Whether a page actually lists jobs: schema.org JobPosting data, a link to or embed of
+    a known job board, or at least MIN_POSTING_LINKS distinct links to postings (pages
+    below this one, or job-like paths at least two levels deep such as /jobs/1234).
+    """
+    if _JOB_POSTING_DATA.search(content):
+        return True
+    page_path = urllib.parse.urlparse(page_url).path.rstrip('/')
+    postings = set()
+    for match in _LINKED_URL.finditer(content):
+        url = urllib.parse.urljoin(page_url, match.group(1).decode('utf-8', errors='replace'))
+        if detect_ats(url) is not None:
+            return True
+        path = urllib.parse.urlparse(url).path.rstrip('/')
+        if path.startswith(page_path + '/') or (path.count('/') > 1 and JOB_HREF_PATTERN.search(path.lower())):
+            postings.add(path)
+        if len(postings) >= MIN_POSTING_LINKS:
+            return True
+    return False
+
+
+def confirms_careers_page(slug, status, final_url, ats_candidate, content=b""):
+    """
+    Decides whether a probe found a careers page. Job boards must still be on the
+    company's board after redirects (unknown boards bounce to the vendor's homepage);
+    company sites must end up on a job board, or on a URL that looks like a careers page
+    whose content (see shows_job_listings) lists jobs: many sites answer 200 with a
+    marketing or "page not found" page for any path.
+    """
+    if status is None or not 200 <= status < 300:
+        return False
+    final_path = urllib.parse.urlparse(final_url).path.lower()
+    if ats_candidate:
+        return slug in final_path
+    if detect_ats(final_url) is not None:
+        return True
+    return bool(_CAREERS_URL.search(final_path)) and shows_job_listings(content, final_url)
+
+
+class CareerUrlDiscoverer:
+    """
+    Finds careers pages for companies without a URL by probing likely job board and
+    company-site URLs. Probes run on the per-host-limited thread pool used by the crawler,
+    job boards first (with HEAD requests, ats_max_per_host at a time and, unless a fetcher
+    is given, at ats_rate per board host); company sites are only probed for companies
+    still unresolved, and their pages are read to check they list jobs.
+    Candidates that failed recently (see ProbeCache) are skipped.
+    """
+
+    def __init__(self, fetcher=None, cache=None, max_workers=32, max_per_host=4, timeout=5,
+                 ats_templates=ATS_TEMPLATES, site_templates=SITE_TEMPLATES, career_paths=CAREER_PATHS,
+                 ats_max_per_host=ATS_MAX_PER_HOST, ats_rate=ATS_PROBE_RATE):
+        if fetcher is None:
+            ats_hosts = {urllib.parse.urlparse(template.format(slug='x')).netloc.lower() for template in ats_templates}
+            # No retries: a candidate that doesn't answer promptly is just a miss.
+            fetcher = HttpFetcher(pool_size=max_workers, max_retries=0,
+                                  host_rates={host: ats_rate for host in ats_hosts})
+        self.fetcher = fetcher
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.ats_max_per_host = ats_max_per_host
+        self.timeout = timeout
+        self.ats_templates = ats_templates
+        self.site_templates = site_templates
+        self.career_paths = career_paths
+        self.stats = {'companies': 0, 'probes': 0, 'cached_misses': 0, 'found': 0}
+
+    def _probe_tier(self, candidates_by_company, ats_tier):
+        """Probes one tier of candidates; returns {company: url} for the best hit per company."""
+        probes = {}
+        for company_name, candidates in candidates_by_company.items():
+            for priority, (url, slug) in enumerate(candidates):
+                probes.setdefault(url, []).append((company_name, priority, slug))
+        if self.cache is not None:
+            skipped = self.cache.recently_failed(probes)
+            self.stats['cached_misses'] += len(skipped)
+            for url in skipped:
+                del probes[url]
+
+        def work(_, url):
+            if ats_tier:
+                return url, probe_url(url, self.fetcher, self.timeout) + (b"",)
+            return url, fetch_probe_page(url, self.fetcher, self.timeout)
+
+        best = {}
+        failures = []
+        self.stats['probes'] += len(probes)
+        max_per_host = self.ats_max_per_host if ats_tier else self.max_per_host
+        for url, (status, final_url, content) in job_scraper.run_per_host(((url, url) for url in probes), work,
+                                                                         self.max_workers, max_per_host):
+            found = False
+            for company_name, priority, slug in probes[url]:
+                if confirms_careers_page(slug, status, final_url, ats_tier, content):
+                    found = True
+                    if company_name not in best or priority < best[company_name][0]:
+                        best[company_name] = (priority, final_url)
+            if not found:
+                failures.append((url, status))
+        if self.cache is not None and failures:
+            self.cache.record_failures(failures)
+        return {company_name: url for company_name, (_, url) in best.items()}
+
+    def discover(self, company_names):
+        """Returns {company_name: careers_url} for the companies a careers page was found for."""
+        ats_candidates = {}
+        site_candidates = {}
+        for company_name in company_names:
+            ats, sites = candidate_urls(company_name, self.ats_templates, self.site_templates, self.career_paths)
+            ats_candidates[company_name] = ats
+            site_candidates[company_name] = sites
+        self.stats['companies'] += len(ats_candidates)
+
+        found = self._probe_tier(ats_candidates, ats_tier=True)
+        remaining = {name: sites for name, sites in site_candidates.items() if name not in found}
+        found.update(self._probe_tier(remaining, ats_tier=False))
+        self.stats['found'] += len(found)
+        return found
+
+
+def write_discovered_urls(output_filepath, discovered):
+    """Fills in blank URLs in company_career_urls_output.csv; returns how many were written."""
+    written = 0
+
+    def rows():
+        nonlocal written
+        for company_name, url in csv_merge.iter_existing_career_urls(output_filepath):
+            if not url and company_name in discovered:
+                url = discovered[company_name]
+                written += 1
+            yield company_name, url
+
+    csv_merge.write_csv_atomically(output_filepath, csv_merge.OUTPUT_FIELDNAMES, rows())
+    return written
+
+
+def discover_career_urls(output_filepath, limit=None, negative_ttl=7 * DAY, discoverer=None):
+    """
+    Looks up careers pages for the companies in output_filepath that have no URL yet and
+    writes the confirmed URLs back to the file. Returns {company_name: url} of what was found.
+    """
+    needing = [company_name for company_name, url in csv_merge.iter_existing_career_urls(output_filepath) if not url]
+    if limit is not None:
+        needing = needing[:limit]
+    cache = ProbeCache(state_path_for(output_filepath), ttl=negative_ttl)
+    discoverer = discoverer or CareerUrlDiscoverer()
+    discoverer.cache = cache
+    print(f"Probing careers pages for {len(needing)} companies without a URL...")
+    started = time.monotonic()
+    try:
+        discovered = discoverer.discover(needing)
+    finally:
+        cache.close()
+    for company_name, url in sorted(discovered.items()):
+        print(f"  {company_name}: {url}")
+    written = write_discovered_urls(output_filepath, discovered) if discovered else 0
+    stats = discoverer.stats
+    print(f"Found {written} careers pages with {stats['probes']} probes "
+          f"({stats['cached_misses']} recent misses skipped) in {time.monotonic() - started:.1f}s.")
+    return discovered